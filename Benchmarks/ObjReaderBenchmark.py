@@ -0,0 +1,52 @@
+# Times the NumPy OBJ reader against pywavefront on the bundled meshes (and any OBJ files given)
+# Run from the repository's root: python Benchmarks/ObjReaderBenchmark.py [--repeat N] [files...]
+
+# Hackey Fix for relative path problem
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from PI.Core.ObjReader import OBJReader
+
+import argparse
+import glob
+import time
+import numpy as np
+
+def Best(function, path: str, repeat: int) -> float:
+    '''Fastest of `repeat` runs, in milliseconds'''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times the NumPy OBJ reader against pywavefront")
+    parser.add_argument("files", nargs="*", help="OBJ files to time besides the bundled ones")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files  = sorted(glob.glob("InternalAssets/Meshes/**/*.obj", recursive=True))
+    files += sorted(glob.glob("DefaultProject/Assets/Meshes/**/*.obj", recursive=True))
+    files += args.files
+
+    print(f"{'File':<40} {'Triangles':>10} {'NumPy (ms)':>11} {'pywavefront (ms)':>17} {'Speedup':>8}")
+
+    for path in files:
+        meshes = OBJReader.Parse(path)
+
+        # Both readers must produce the same vertices
+        reference = { mesh.Material.Name: mesh.Vertices for mesh in OBJReader.ReadWavefront(path) }
+        for mesh in meshes:
+            expected = reference.get(mesh.Material.Name, None)
+            if expected is None or expected.shape != mesh.Vertices.shape or not np.allclose(expected, mesh.Vertices, atol=1e-5):
+                print(f"{path}: the readers disagree on material {mesh.Material.Name}")
+
+        triangles = sum(len(mesh.Vertices) for mesh in meshes) // 3
+        numpy = Best(OBJReader.Parse, path, args.repeat)
+        wavefront = Best(OBJReader.ReadWavefront, path, args.repeat)
+
+        print(f"{os.path.relpath(path):<40} {triangles:>10} {numpy:>11.2f} {wavefront:>17.2f} {wavefront / numpy:>7.1f}x")
+
+if __name__ == "__main__": main()
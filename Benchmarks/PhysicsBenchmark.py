@@ -0,0 +1,146 @@
+# Times PySics from 100 to 20k bodies, spawned in scripted patterns, with either broadphase
+# Run from the repository's root: python Benchmarks/PhysicsBenchmark.py [--bodies N ...] [--patterns NAME ...] [--frames N]
+#
+# Step is the time of a frame's `Update` (one tick, waited for when threaded), sync the time to copy the moved bodies'
+# interpolated states to their transforms, the way the scene does. Memory is what the world's Python side allocated
+# (the registry, the state arrays), the peak resident size of the process is also shown where `resource` exists.
+
+# Hackey Fix for relative path problem
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from PI.Physics.PySics import *
+
+import argparse
+import tracemalloc
+import time
+import math
+import pyrr
+import numpy as np
+
+try:
+    import resource     # Not on Windows
+except ImportError:
+    resource = None
+
+class Transform:
+    '''Stands in for the scene's transforms, the bodies' `UserData`'''
+    __slots__ = "Translation", "Rotation"
+
+    def __init__(self) -> None:
+        self.Translation, self.Rotation = pyrr.Vector3(), pyrr.Vector3()
+
+    def SetTranslation(self, translation: pyrr.Vector3) -> None: self.Translation = translation
+    def SetRotation(self, rotation: pyrr.Vector3) -> None: self.Rotation = rotation
+
+def Body(position: list, collider: Collider) -> PySicsMaterial:
+    return PySicsMaterial(position=pyrr.Vector3(position), collider=collider, ccd=False)
+
+def Stacks(count: int, rng: np.random.Generator) -> list:
+    '''Towers of 10 boxes on a grid, they stay up and fall asleep'''
+    towers = math.ceil(count / 10)
+    side = math.ceil(math.sqrt(towers))
+
+    return [
+        Body([ (index // 10 % side) * 4.0, 1.0 + (index % 10) * 2.01, (index // 10 // side) * 4.0 ], BoxCollider())
+        for index in range(count)
+    ]
+
+def Rain(count: int, rng: np.random.Generator) -> list:
+    '''Spheres falling from random heights over an area, most of them are moving'''
+    side = math.sqrt(count) * 2.0
+    positions = np.column_stack(( rng.uniform(0, side, count), rng.uniform(5, 100, count), rng.uniform(0, side, count) ))
+
+    collider = SphereCollider(bounds=pyrr.Vector3([ 0.5, 0.5, 0.5 ]))
+    return [ Body(position, collider) for position in positions.tolist() ]
+
+def Piles(count: int, rng: np.random.Generator) -> list:
+    '''Columns of boxes, spheres and capsules that collapse into piles of 500, a lot of contacts'''
+    colliders = ( BoxCollider(bounds=pyrr.Vector3([ 0.5, 0.5, 0.5 ])), SphereCollider(bounds=pyrr.Vector3([ 0.5, 0.5, 0.5 ])),
+        CapsuleCollider(bounds=pyrr.Vector3([ 0.25, 0.5, 0.25 ])) )
+    side = math.ceil(math.sqrt(math.ceil(count / 500)))
+
+    bodies = []
+    for index in range(count):
+        pile, slot = divmod(index, 500)
+        x = (pile % side) * 30.0 + (slot % 5) * 1.2 + rng.uniform(-0.1, 0.1)
+        z = (pile // side) * 30.0 + (slot // 5 % 5) * 1.2 + rng.uniform(-0.1, 0.1)
+        bodies.append(Body([ x, 1.0 + (slot // 25) * 1.5, z ], colliders[index % 3]))
+
+    return bodies
+
+Patterns = { "stacks": Stacks, "rain": Rain, "piles": Piles }
+Broadphases = { "DBVT": PySics.BroadphaseType.DBVT, "SAP": PySics.BroadphaseType.SAP }
+
+def Run(pattern: str, count: int, frames: int) -> tuple:
+    '''Returns the times to add the bodies, to step and to sync (the mean and worst frames), and the memory'''
+    tracemalloc.start()
+    world = PySics()
+    world.AddRigidBody(RigidBody(PySicsMaterial(mass=0.0, collider=PlaneCollider(), isStatic=True)))
+
+    bodies = [ RigidBody(material) for material in Patterns[pattern](count, np.random.default_rng(0)) ]
+    for body in bodies:
+        body.UserData = Transform()
+        world.AddRigidBody(body)
+
+    # The first tick adds the bodies
+    start = time.perf_counter()
+    world.Update(PySics.FixedTimestep)
+    world.Wait()
+    add = time.perf_counter() - start
+
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    steps, syncs, moved = [], [], 0
+    for _ in range(frames):
+        start = time.perf_counter()
+        world.Update(PySics.FixedTimestep)
+        world.Wait()
+        steps.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        positions, rotations = world.MovedStates
+        for body, position, rotation in zip(world.MovedBodies, positions.tolist(), rotations.tolist()):
+            body.UserData.SetTranslation(pyrr.Vector3(position))
+            body.UserData.SetRotation(pyrr.Vector3(rotation))
+        syncs.append(time.perf_counter() - start)
+        moved += len(world.MovedBodies)
+
+    world.OnSimulationEnd()
+    return add, np.mean(steps), np.max(steps), np.mean(syncs), moved / frames, memory
+
+def PeakResident() -> str:
+    if resource is None: return "-"
+
+    # Kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return f"{peak / (1024 * 1024 if sys.platform == 'darwin' else 1024):.1f}"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times PySics with many bodies")
+    parser.add_argument("--bodies", type=int, nargs="+", default=[ 100, 1000, 5000, 20000 ])
+    parser.add_argument("--patterns", nargs="+", choices=list(Patterns), default=list(Patterns))
+    parser.add_argument("--broadphases", nargs="+", choices=list(Broadphases), default=list(Broadphases))
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--extent", type=float, default=PySics.WorldExtent, help="World's bounds for SAP")
+    parser.add_argument("--iterations", type=int, default=PySics.SolverIterations)
+    parser.add_argument("--inline", action="store_true", help="Step on the calling thread")
+    args = parser.parse_args()
+
+    PySics.WorldExtent, PySics.SolverIterations, PySics.Threaded = args.extent, args.iterations, not args.inline
+
+    print(f"{args.frames} frames, {args.iterations} solver iterations, {'inline' if args.inline else 'threaded'}")
+    print(f"{'Pattern':<8} {'Bodies':>7} {'Broadphase':>10} {'Add (ms)':>10} {'Step (ms)':>10} {'Worst (ms)':>10} "
+        f"{'Sync (ms)':>10} {'Moved':>8} {'Memory (MB)':>12} {'Peak RSS (MB)':>14}")
+
+    for pattern in args.patterns:
+        for count in sorted(args.bodies):
+            for name in args.broadphases:
+                PySics.Broadphase = Broadphases[name]
+                add, step, worst, sync, moved, memory = Run(pattern, count, args.frames)
+
+                print(f"{pattern:<8} {count:>7} {name:>10} {add * 1000:>10.2f} {step * 1000:>10.2f} {worst * 1000:>10.2f} "
+                    f"{sync * 1000:>10.2f} {moved:>8.0f} {memory / (1024 * 1024):>12.2f} {PeakResident():>14}")
+
+if __name__ == "__main__": main()
@@ -0,0 +1,91 @@
+# Times saving and opening a generated scene in the YAML (.PI) and binary (.PIB) scene formats
+# Run from the repository's root: python Benchmarks/SceneFormatBenchmark.py [--entities N] [--repeat N]
+
+# Hackey Fix for relative path problem
+import sys, os
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from PI.Scene.Scene import Scene, PI_YAML
+from PI.Scene.SceneFile import SceneFile
+
+import argparse
+import tempfile
+import time
+import uuid
+import pyrr
+import numpy as np
+
+def Generate(count: int) -> list:
+    '''A scene of `count` entities in the `.PI` layout: meshes, with a light and a scripted entity every so often'''
+    rng = np.random.default_rng(0)
+    entities = []
+
+    for index in range(count):
+        entity = {
+            "Entity": str(uuid.UUID(int=int(rng.integers(1 << 62)))),
+            "TagComponent": { "Tag": f"Entity #{index}" },
+            "TransformComponent": {
+                "Translation" : pyrr.Vector3(rng.uniform(-100, 100, 3).tolist()),
+                "Rotation"    : pyrr.Vector3(rng.uniform(0, 360, 3).tolist()),
+                "Scale"       : pyrr.Vector3([ 1.0, 1.0, 1.0 ])
+            },
+            "MeshComponent": { "Path": "Meshes\\Cube.obj", "Submesh": 0 }
+        }
+
+        if index % 50 == 0:
+            entity["LightComponent"] = {
+                "LightType": 1, "Intensity": 10.0,
+                "Diffuse": pyrr.Vector3([ 0.8, 0.8, 0.8 ]), "Specular": pyrr.Vector3([ 0.5, 0.5, 0.5 ])
+            }
+
+        if index % 100 == 0:
+            entity["ScriptComponent"] = { "Namespace": "FallDown.FallDown", "Variables": { "Speed": pyrr.Vector3([ 0, -0.5, 0 ]) } }
+
+        entities.append(entity)
+
+    return entities
+
+def Best(function, repeat: int) -> float:
+    '''Fastest of `repeat` runs, in milliseconds'''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times the YAML and binary scene formats")
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    tables = SceneFile.FromEntities(Generate(args.entities))
+    expected = SceneFile.ToEntities(tables)
+
+    print(f"{args.entities} entities, YAML loader: {PI_YAML.Loader.__name__}")
+    print(f"{'Format':<24} {'Save (ms)':>10} {'Open (ms)':>10} {'Size (KB)':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        formats = (
+            ( "YAML (.PI)"            , os.path.join(directory, "Scene.PI") , None  ),
+            ( "Binary (.PIB)"         , os.path.join(directory, "Scene.PIB"), False ),
+            ( "Binary, zlib (.PIB)"   , os.path.join(directory, "Scene.PIB"), True  ),
+        )
+
+        for name, path, compress in formats:
+            SceneFile.Compress = bool(compress)
+
+            save = Best(lambda: Scene.WriteFile(path, tables), args.repeat)
+            load = Best(lambda: Scene.ReadFile(path), args.repeat)
+
+            # Every format must give back the same scene
+            entities = SceneFile.ToEntities(Scene.ReadFile(path))
+            same = len(entities) == len(expected) and all(
+                np.allclose(entity["TransformComponent"][field], reference["TransformComponent"][field])
+                for entity, reference in zip(entities, expected) for field in ( "Translation", "Rotation", "Scale" )
+            ) and [ entity["TagComponent"] for entity in entities ] == [ entity["TagComponent"] for entity in expected ]
+
+            print(f"{name:<24} {save:>10.2f} {load:>10.2f} {os.path.getsize(path) / 1024:>10.1f}" + ("" if same else "  (round trip differs!)"))
+
+if __name__ == "__main__": main()
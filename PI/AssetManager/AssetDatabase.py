@@ -0,0 +1,254 @@
+from ..Logging.logger import PI_CORE_INFO, PI_CORE_TRACE
+from ..Renderer.MeshData import MeshData
+from .ImportService import ImportHandle
+
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+import sqlite3
+import json
+import os
+
+class AssetDatabase:
+    '''
+    Project level record of every asset in the project's Assets folder, stored in `<Project>\\AssetDatabase.db` (SQLite):
+    a stable GUID, the source's hash, modification time and size, its import settings and the paths of the
+    artifacts imported from it (e.g. the `.pimesh` file of a model).
+
+    `Refresh` (on project open) only hashes files whose modification time or size changed and only reimports
+    the ones whose contents changed. A file that was moved keeps its GUID, it is matched by its hash.
+    '''
+    __slots__ = ()
+
+    Filename  : str = "AssetDatabase.db"
+    Version   : int = 1
+
+    # Files that are not assets themselves, but are part of one (`Refresh` picks up changes through the assets)
+    Dependency: int = -1
+
+    __Connection : sqlite3.Connection = None
+    __AssetsDir  : str = ""
+
+    @staticmethod
+    def __Types() -> Dict[str, int]:
+        from .AssetManager import AssetManager
+        return {
+            ".obj"  : AssetManager.AssetType.MeshAsset,
+            ".glsl" : AssetManager.AssetType.ShaderAsset,
+            ".png"  : AssetManager.AssetType.Texture2DAsset,
+            ".jpg"  : AssetManager.AssetType.Texture2DAsset,
+            ".jpeg" : AssetManager.AssetType.Texture2DAsset,
+            ".bmp"  : AssetManager.AssetType.Texture2DAsset,
+            ".tga"  : AssetManager.AssetType.Texture2DAsset,
+            ".mtl"  : AssetDatabase.Dependency,
+        }
+
+    @staticmethod
+    def Open(projectLocation: str, assetsLocation: str) -> None:
+        AssetDatabase.Close()
+
+        AssetDatabase.__AssetsDir = os.path.abspath(assetsLocation)
+        AssetDatabase.__Connection = sqlite3.connect(os.path.join(projectLocation, AssetDatabase.Filename))
+
+        connection = AssetDatabase.__Connection
+        if connection.execute("PRAGMA user_version").fetchone()[0] != AssetDatabase.Version:
+            connection.execute("DROP TABLE IF EXISTS Assets")
+            connection.execute(f"PRAGMA user_version = {AssetDatabase.Version}")
+
+        connection.execute('''
+            CREATE TABLE IF NOT EXISTS Assets (
+                GUID      TEXT    PRIMARY KEY,
+                Path      TEXT    UNIQUE NOT NULL,
+                Type      INTEGER NOT NULL,
+                Hash      TEXT    NOT NULL,
+                MTime     INTEGER NOT NULL,
+                Size      INTEGER NOT NULL,
+                Settings  TEXT    NOT NULL DEFAULT '{}',
+                Artifacts TEXT    NOT NULL DEFAULT '{}'
+            )
+        ''')
+        connection.commit()
+
+    @staticmethod
+    def Close() -> None:
+        if AssetDatabase.__Connection is None: return
+        AssetDatabase.__Connection.close()
+        AssetDatabase.__Connection = None
+
+    @staticmethod
+    def __Key(path: str) -> Optional[str]:
+        '''Path of the asset as stored in the database (relative to the Assets folder), None if outside of it'''
+        try: relativePath = os.path.relpath(os.path.abspath(path), AssetDatabase.__AssetsDir)
+        except ValueError: return None      # On another drive
+
+        if relativePath.split(os.sep)[0] == os.pardir: return None
+        return os.path.normcase(relativePath)
+
+    @staticmethod
+    def __Scan() -> Dict[str, Tuple[str, int]]:
+        '''Every file in the Assets folder with a known type: key -> (absolute path, type)'''
+        types, files = AssetDatabase.__Types(), {}
+
+        for directory, _, filenames in os.walk(AssetDatabase.__AssetsDir):
+            for filename in filenames:
+                assetType = types.get(os.path.splitext(filename)[1].lower(), None)
+                if assetType is None: continue
+
+                path = os.path.join(directory, filename)
+                files[AssetDatabase.__Key(path)] = (path, assetType)
+
+        return files
+
+    @staticmethod
+    def __Stat(path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def __IsUpToDate(assetType: int, artifacts: Dict[str, Any]) -> bool:
+        '''Whether the artifacts exist and were imported from the current versions of the asset's dependencies'''
+        from .AssetManager import AssetManager
+        if assetType != AssetManager.AssetType.MeshAsset: return True
+
+        if not os.path.isfile(artifacts.get("Mesh", "")): return False
+        for path, stat in artifacts.get("Dependencies", {}).items():
+            if not os.path.isfile(path) or list(AssetDatabase.__Stat(path)) != stat: return False
+
+        return True
+
+    @staticmethod
+    def Refresh(reimport: bool=True) -> int:
+        '''
+        Brings the database up to date with the Assets folder. Returns the number of new or changed assets.
+        Without `reimport`, the caller reimports them (changed assets have no artifacts till then).
+        '''
+        from .AssetManager import AssetManager
+        connection = AssetDatabase.__Connection
+        if connection is None: return 0
+
+        rows = { row[1]: row for row in connection.execute("SELECT GUID, Path, Type, Hash, MTime, Size, Artifacts FROM Assets") }
+        files = AssetDatabase.__Scan()
+
+        changed: List[str] = []
+        moved = 0
+        added: List[Tuple[str, str, int, str, int, int]] = []
+
+        for key, (path, assetType) in files.items():
+            mtime, size = AssetDatabase.__Stat(path)
+            row = rows.get(key, None)
+
+            if row is not None and (row[4], row[5]) == (mtime, size):
+                if not AssetDatabase.__IsUpToDate(assetType, json.loads(row[6])): changed.append(row[0])
+                continue
+
+            fileHash = AssetManager.HashFile(path)
+            if row is None:
+                added.append((key, path, assetType, fileHash, mtime, size))
+                continue
+
+            # The artifacts of the old contents must not be mistaken for the new ones' if the reimport never finishes
+            if fileHash != row[3]:
+                connection.execute("UPDATE Assets SET Hash = ?, MTime = ?, Size = ?, Artifacts = '{}' WHERE GUID = ?", (fileHash, mtime, size, row[0]))
+                changed.append(row[0])
+                continue
+
+            connection.execute("UPDATE Assets SET MTime = ?, Size = ? WHERE GUID = ?", (mtime, size, row[0]))
+            if not AssetDatabase.__IsUpToDate(assetType, json.loads(row[6])): changed.append(row[0])
+
+        # Files that are gone were either deleted or moved to one of the new paths
+        missing: Dict[str, List[tuple]] = {}
+        for key, row in rows.items():
+            if key not in files: missing.setdefault(row[3], []).append(row)
+
+        for key, path, assetType, fileHash, mtime, size in added:
+            candidates = missing.get(fileHash, None)
+            row = candidates.pop() if candidates else None
+
+            if row is not None:
+                PI_CORE_TRACE("Asset moved: {} -> {}", row[1], key)
+                moved += 1
+                connection.execute("UPDATE Assets SET Path = ?, MTime = ?, Size = ? WHERE GUID = ?", (key, mtime, size, row[0]))
+                if not AssetDatabase.__IsUpToDate(assetType, json.loads(row[6])): changed.append(row[0])
+                continue
+
+            guid = str(uuid4())
+            connection.execute("INSERT INTO Assets (GUID, Path, Type, Hash, MTime, Size) VALUES (?, ?, ?, ?, ?, ?)",
+                (guid, key, assetType, fileHash, mtime, size))
+            changed.append(guid)
+
+        removed = [ row for candidates in missing.values() for row in candidates ]
+        for row in removed: connection.execute("DELETE FROM Assets WHERE GUID = ?", (row[0],))
+        connection.commit()
+
+        if reimport:
+            for guid in changed: AssetDatabase.Reimport(UUID(guid))
+
+        PI_CORE_INFO("Asset database: {} assets, {} added, {} moved, {} removed, {} changed",
+            len(files), len(added) - moved, moved, len(removed), len(changed))
+        return len(changed)
+
+    @staticmethod
+    def Reimport(guid: UUID) -> Optional[ImportHandle]:
+        '''Imports the asset again in the background, its artifacts are recorded once that is done. None if it has none.'''
+        from .AssetManager import AssetManager
+        from .ImportService import ImportService
+
+        row = AssetDatabase.__Connection.execute("SELECT Path, Type FROM Assets WHERE GUID = ?", (str(guid),)).fetchone()
+        if row is None: return None
+
+        path, assetType = os.path.join(AssetDatabase.__AssetsDir, row[0]), row[1]
+
+        # Textures and shaders are loaded straight from their sources, they have no artifacts
+        if assetType != AssetManager.AssetType.MeshAsset: return None
+
+        dependencies = { dependency: list(AssetDatabase.__Stat(dependency)) for dependency in MeshData.Dependencies(path) }
+        handle = ImportService.ImportMeshData(path)
+        handle.AddCallback(lambda cachePath: AssetDatabase.SetArtifacts(guid, { "Mesh": cachePath, "Dependencies": dependencies }))
+        return handle
+
+    @staticmethod
+    def GetGUID(path: str) -> Optional[UUID]:
+        if AssetDatabase.__Connection is None or (key := AssetDatabase.__Key(path)) is None: return None
+
+        row = AssetDatabase.__Connection.execute("SELECT GUID FROM Assets WHERE Path = ?", (key,)).fetchone()
+        return UUID(row[0]) if row is not None else None
+
+    @staticmethod
+    def GetPath(guid: UUID) -> Optional[str]:
+        if AssetDatabase.__Connection is None: return None
+
+        row = AssetDatabase.__Connection.execute("SELECT Path FROM Assets WHERE GUID = ?", (str(guid),)).fetchone()
+        return os.path.join(AssetDatabase.__AssetsDir, row[0]) if row is not None else None
+
+    @staticmethod
+    def GetArtifact(path: str, name: str) -> Optional[str]:
+        '''The artifact `name` of the asset at `path`, if it was imported from the file's current version'''
+        if AssetDatabase.__Connection is None or (key := AssetDatabase.__Key(path)) is None: return None
+
+        row = AssetDatabase.__Connection.execute("SELECT Type, MTime, Size, Artifacts FROM Assets WHERE Path = ?", (key,)).fetchone()
+        if row is None or not os.path.isfile(path) or (row[1], row[2]) != AssetDatabase.__Stat(path): return None
+
+        artifacts = json.loads(row[3])
+        if not AssetDatabase.__IsUpToDate(row[0], artifacts): return None
+        return artifacts.get(name, None)
+
+    @staticmethod
+    def SetArtifacts(guid: UUID, artifacts: Dict[str, Any]) -> None:
+        if AssetDatabase.__Connection is None: return
+        AssetDatabase.__Connection.execute("UPDATE Assets SET Artifacts = ? WHERE GUID = ?", (json.dumps(artifacts), str(guid)))
+        AssetDatabase.__Connection.commit()
+
+    @staticmethod
+    def GetSettings(guid: UUID) -> Dict[str, Any]:
+        if AssetDatabase.__Connection is None: return {}
+
+        row = AssetDatabase.__Connection.execute("SELECT Settings FROM Assets WHERE GUID = ?", (str(guid),)).fetchone()
+        return json.loads(row[0]) if row is not None else {}
+
+    @staticmethod
+    def SetSettings(guid: UUID, settings: Dict[str, Any]) -> None:
+        '''Changing the import settings of an asset reimports it'''
+        if AssetDatabase.__Connection is None or settings == AssetDatabase.GetSettings(guid): return
+
+        AssetDatabase.__Connection.execute("UPDATE Assets SET Settings = ? WHERE GUID = ?", (json.dumps(settings), str(guid)))
+        AssetDatabase.__Connection.commit()
+        AssetDatabase.Reimport(guid)
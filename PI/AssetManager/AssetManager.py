@@ -1,13 +1,19 @@
 from ..Renderer.Shader  import Shader
-from ..Renderer.Texture import Texture2D
-from ..Renderer.Mesh    import Mesh
+from ..Renderer.Texture import Texture2D, TextureSpecification
+from ..Renderer.Model   import Model
+from ..Renderer.MeshData import MeshData
+from .ImportService     import ImportService, ImportHandle
+from .AssetDatabase     import AssetDatabase
 
-from ..Logging.logger import PI_CORE_ASSERT
+from ..Logging.logger import PI_CORE_ASSERT, PI_CLIENT_ERROR
 
 from dataclasses import dataclass as Struct
+from dataclasses import field
 from multipledispatch import dispatch
+from hashlib import sha1
 import pathlib
-from typing import Any, Dict, List, Callable
+import os
+from typing import Any, Dict, List, Callable, Tuple
 from uuid import UUID, NAMESPACE_URL
 from uuid import uuid3 as _UUIDGenerator
 
@@ -20,21 +26,38 @@ class Asset:
     UUID: UUID = UUIDGenerator("")
     Asset: Any = None
 
+    # Users of the asset (components, or cached assets for their textures), unreferenced assets can be evicted
+    RefCount: int = 0
+    LastUsed: int = 0
+    Textures: List[tuple] = field(default_factory=list)   # Keys of the cached textures the asset uses
+
 class AssetManager:
     class AssetType:
         ShaderAsset, Texture2DAsset, MeshAsset \
             = range(0, 3)
 
-    __slots__ = ("__AssetMap", "__CurrentProjectLocation")
+    __slots__ = ("__AssetMap", "__CurrentProjectLocation", "__Loading")
 
     __Instance = None
 
+    # Unreferenced assets are evicted, least recently used first, while the cache is over either budget
+    CPUBudget: int = 512  * 1024 * 1024     # Bytes
+    GPUBudget: int = 1024 * 1024 * 1024     # Bytes
+
+    __Clock: int = 0
+
+    # Content addressed texture cache, shared by everything that loads images from disk
+    __FileHashes  : Dict[str, Tuple[int, int, str]] = {}    # Normalized path -> (mtime, size, sha1)
+    __Textures    : Dict[Tuple[str, tuple], Asset] = {}     # (sha1, specification) -> texture
+    __TextureKeys : Dict[int, Tuple[str, tuple]] = {}       # id(texture) -> key in `__Textures`
+
     def __init__(self) -> None:
         self.__AssetMap: Dict[UUID, Asset] = {}
         self.__CurrentProjectLocation: str = ""
+        self.__Loading: Dict[str, ImportHandle] = {}     # Path -> running `LoadAsync`
         AssetManager.__Instance = self
 
-    def _GetUUID(self, asset: Any) -> UUID: return UUIDGenerator(asset.Path)
+    def _GetUUID(self, asset: Any) -> UUID: return AssetManager.GetUUID(asset.Path)
     def SetCurrentProjectLocation(self, loc: str) -> None: self.__CurrentProjectLocation = loc
 
     @property
@@ -57,19 +80,210 @@ class AssetManager:
     @staticmethod
     def GetInstance(): return AssetManager.__Instance
 
+    @staticmethod
+    def NormalizePath(path: str) -> str: return os.path.normcase(os.path.abspath(path))
+
+    @staticmethod
+    def GetUUID(path: str) -> UUID:
+        '''The asset's GUID from the project's AssetDatabase, assets outside of the project are identified by their path'''
+        guid = AssetDatabase.GetGUID(path)
+        return guid if guid is not None else UUIDGenerator(path)
+
+    @staticmethod
+    def HashFile(path: str) -> str:
+        '''SHA-1 of the file's contents, only recomputed when its modification time or size change'''
+        path = AssetManager.NormalizePath(path)
+        stat = os.stat(path)
+
+        cached = AssetManager.__FileHashes.get(path, None)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size): return cached[2]
+
+        digest = sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""): digest.update(chunk)
+
+        AssetManager.__FileHashes[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        return digest.hexdigest()
+
+    @staticmethod
+    def LoadTexture(path: str, spec: TextureSpecification=None) -> Texture2D:
+        '''
+        Returns the texture of the image at `path`. Images with the same contents (and specification)
+        are decoded and uploaded once, no matter which path they are loaded from.
+        '''
+        if spec is None: spec = TextureSpecification(asyncLoad=True)
+
+        try: fileHash = AssetManager.HashFile(path)
+        except FileNotFoundError as e:
+            PI_CLIENT_ERROR("File: {} Not Found!!", path)
+            raise e
+
+        key = (fileHash, tuple(sorted(vars(spec).items())))
+        record = AssetManager.__Textures.get(key, None)
+
+        if record is None:
+            texture = Texture2D.Create(path, spec)
+            record = Asset(AssetManager.AssetType.Texture2DAsset, path, UUIDGenerator(fileHash), texture)
+
+            AssetManager.__Textures[key] = record
+            AssetManager.__TextureKeys[id(texture)] = key
+
+        record.LastUsed = AssetManager.__Tick()
+        return record.Asset
+
+    @staticmethod
+    def ReloadTexture(path: str) -> int:
+        '''
+        Reloads the cached textures loaded from `path` in place (after the file changed), so that every holder
+        of them sees the new image. Returns the number of textures reloaded.
+        '''
+        path = AssetManager.NormalizePath(path)
+        if not os.path.isfile(path): return 0
+
+        fileHash = AssetManager.HashFile(path)
+        reloaded = 0
+
+        for key, record in list(AssetManager.__Textures.items()):
+            if AssetManager.NormalizePath(record.Path) != path or key[0] == fileHash: continue
+
+            # The cache is content addressed, the record moves to the new contents' key (unless those are cached already)
+            newKey = (fileHash, key[1])
+            if newKey not in AssetManager.__Textures:
+                del AssetManager.__Textures[key]
+                AssetManager.__Textures[newKey] = record
+                AssetManager.__TextureKeys[id(record.Asset)] = newKey
+
+                for user, _ in AssetManager.__Records():
+                    user.Textures = [ newKey if textureKey == key else textureKey for textureKey in user.Textures ]
+
+            record.Asset.Reload()
+            reloaded += 1
+
+        return reloaded
+
+    @staticmethod
+    def GetTextureCount() -> int: return len(AssetManager.__Textures)
+
+    @staticmethod
+    def __Tick() -> int:
+        AssetManager.__Clock += 1
+        return AssetManager.__Clock
+
+    @staticmethod
+    def __TexturesOf(assetType: int, asset: Any) -> List[tuple]:
+        textures = [ asset ] if assetType == AssetManager.AssetType.Texture2DAsset else []
+        if assetType == AssetManager.AssetType.MeshAsset:
+            materials = [ mesh.Material for mesh in asset.Meshes ]
+            textures = [ material.AlbedoMap for material in materials ] + [ material.SpecularMap for material in materials ]
+
+        keys = [ AssetManager.__TextureKeys.get(id(texture), None) for texture in textures if texture is not None ]
+        return [ key for key in keys if key is not None ]
+
+    def __Register(self, assetType: int, path: str, uuid: UUID, asset: Any) -> None:
+        record = Asset(assetType, path, uuid, asset, LastUsed=AssetManager.__Tick())
+
+        # The cached textures stay around as long as an asset using them does
+        record.Textures = AssetManager.__TexturesOf(assetType, asset)
+        for key in record.Textures: AssetManager.__Textures[key].RefCount += 1
+
+        # Replacing an asset gives up the textures of the old one
+        if (old := self.__AssetMap.get(uuid, None)) is not None:
+            for key in old.Textures: AssetManager.__Textures[key].RefCount -= 1
+
+        self.__AssetMap[uuid] = record
+
     def Add(self, assetType: int, asset: Any) -> None:
         if assetType >= 3: PI_CORE_ASSERT(False, "Invalid AssetType: {}", assetType)
+        self.__Register(assetType, asset.Path, self._GetUUID(asset), asset)
+
+    def Acquire(self, uuid: UUID) -> None:
+        '''Adds a user to the asset, it is not evicted till every user called `Release`'''
+        record = self.__AssetMap.get(uuid, None)
+        if record is None: return
+
+        record.RefCount += 1
+        record.LastUsed = AssetManager.__Tick()
+
+    def Release(self, uuid: UUID) -> None:
+        record = self.__AssetMap.get(uuid, None)
+        if record is None: return
+
+        record.RefCount = max(record.RefCount - 1, 0)
+        record.LastUsed = AssetManager.__Tick()
+
+    @staticmethod
+    def __Bytes(record: Asset, cached: bool=False) -> Tuple[int, int]:
+        '''(CPU, GPU) bytes of the asset, textures are only counted in the texture cache'''
+        if record.Type == AssetManager.AssetType.MeshAsset: return 0, record.Asset.GPUBytes
+        if record.Type == AssetManager.AssetType.Texture2DAsset and cached:
+            return record.Asset.CPUBytes, record.Asset.GPUBytes
+        return 0, 0
+
+    @staticmethod
+    def __Records() -> List[Tuple[Asset, bool]]:
+        '''Every asset of the current instance and of the texture cache, with whether it is in the texture cache'''
+        records = [ (record, True) for record in AssetManager.__Textures.values() ]
+        if AssetManager.__Instance is not None:
+            records += [ (record, False) for record in AssetManager.__Instance.__AssetMap.values() ]
+        return records
+
+    @staticmethod
+    def Update() -> None:
+        '''Evicts unreferenced assets, least recently used first, till the cache fits in `CPUBudget` and `GPUBudget`'''
+        records = AssetManager.__Records()
+        sizes = { id(record): AssetManager.__Bytes(record, cached) for record, cached in records }
+        cpu = sum(size[0] for size in sizes.values())
+        gpu = sum(size[1] for size in sizes.values())
+
+        if cpu <= AssetManager.CPUBudget and gpu <= AssetManager.GPUBudget: return
+
+        candidates = sorted(( item for item in records if item[0].RefCount == 0 ), key=lambda item: item[0].LastUsed)
+
+        # The list grows while it is walked: evicting an asset can leave its textures unreferenced
+        for record, cached in candidates:
+            if cpu <= AssetManager.CPUBudget and gpu <= AssetManager.GPUBudget: break
+
+            recordCPU, recordGPU = sizes[id(record)]
+            cpu, gpu = cpu - recordCPU, gpu - recordGPU
+
+            if cached:
+                key = AssetManager.__TextureKeys.pop(id(record.Asset))
+                del AssetManager.__Textures[key]
+                continue
+
+            del AssetManager.__Instance.__AssetMap[record.UUID]
+            for key in record.Textures:
+                texture = AssetManager.__Textures[key]
+                texture.RefCount -= 1
+                if texture.RefCount == 0:
+                    texture.LastUsed = AssetManager.__Tick()
+                    candidates.append((texture, True))
 
-        uuid = self._GetUUID(asset)
-        self.__AssetMap[uuid] = Asset(
-            assetType, asset.Path, uuid, asset
-        )
+    @staticmethod
+    def GetStats() -> Dict[str, Tuple[int, int, int]]:
+        '''(count, CPU bytes, GPU bytes) of the cached assets, per type'''
+        names = { AssetManager.AssetType.ShaderAsset: "Shaders", AssetManager.AssetType.MeshAsset: "Models" }
+        stats = { "Shaders": [ 0, 0, 0 ], "Textures": [ 0, 0, 0 ], "Models": [ 0, 0, 0 ] }
+
+        for record, cached in AssetManager.__Records():
+            # Textures registered by path are aliases of the cached ones
+            if record.Type == AssetManager.AssetType.Texture2DAsset and not cached: continue
+
+            stat = stats[names.get(record.Type, "Textures")]
+            recordCPU, recordGPU = AssetManager.__Bytes(record, cached)
+            stat[0], stat[1], stat[2] = stat[0] + 1, stat[1] + recordCPU, stat[2] + recordGPU
 
-    def Load(self, assetType: int, path: str, _index: int=0) -> UUID:
+        return { name: tuple(stat) for name, stat in stats.items() }
+
+    def Load(self, assetType: int, path: str) -> UUID:
+        '''Loads the asset at `path` once, meshes are loaded as a Model holding every submesh of the file'''
         if assetType >= 3: PI_CORE_ASSERT(False, "Invalid AssetType: {}", assetType)
         path = self.GetAbsolutePath(path)
 
-        if (mesh := self.Get(path)) is not None: return self._GetUUID(mesh)
+        if (asset := self.Get(path)) is not None:
+            # A texture can be shared with another file with the same contents, its `Path` is that file's
+            if assetType == AssetManager.AssetType.Texture2DAsset: return AssetManager.GetUUID(path)
+            return self._GetUUID(asset)
 
         asset = None
         if assetType == AssetManager.AssetType.ShaderAsset:
@@ -77,19 +291,73 @@ class AssetManager:
             self.Add(assetType, asset)
 
         elif assetType == AssetManager.AssetType.Texture2DAsset:
-            asset: Texture2D = Texture2D.Create(path)
-            self.Add(assetType, asset)
+            asset: Texture2D = AssetManager.LoadTexture(path)
+
+            # The texture might have been loaded from another file with the same contents
+            uuid = AssetManager.GetUUID(path)
+            self.__Register(assetType, path, uuid, asset)
+            return uuid
 
         elif assetType == AssetManager.AssetType.MeshAsset:
-            assets: List[Mesh] = Mesh.Load(path)
-            asset = assets[_index]
+            # Imported on project open already, unless the file changed since
+            cachePath = AssetDatabase.GetArtifact(path, "Mesh")
+            if cachePath is not None:
+                asset: Model = Model.FromData(MeshData.Read(cachePath, os.path.dirname(os.path.abspath(path))), path)
+            else: asset: Model = Model.Load(path)
+
             self.Add(assetType, asset)
 
         return self._GetUUID(asset)
 
+    def LoadAsync(self, assetType: int, path: str) -> ImportHandle:
+        '''
+        Same as `Load`, but the mesh is imported by the ImportService's worker processes.
+        It can be fetched with `Get` once the handle is done (textures are already loaded asynchronously).
+        Loading a model that is loaded (or loading) already gives a handle to it instead of importing it again.
+        '''
+        if assetType != AssetManager.AssetType.MeshAsset: PI_CORE_ASSERT(False, "Only meshes can be loaded asynchronously, not: {}", assetType)
+        path = self.GetAbsolutePath(path)
+
+        if (model := self.Get(path)) is not None: return ImportService.Completed(path, model)
+
+        key = AssetManager.NormalizePath(path)
+        if (handle := self.__Loading.get(key, None)) is not None and not handle.IsDone: return handle
+
+        def add(model: Model) -> None:
+            if self.Get(path) is None: self.Add(assetType, model)
+            self.__Loading.pop(key, None)
+
+        handle = ImportService.ImportMesh(path, AssetDatabase.GetArtifact(path, "Mesh"))
+        handle.AddCallback(add)
+        self.__Loading[key] = handle
+        return handle
+
+    def ReloadModel(self, path: str, cachePath: str) -> bool:
+        '''
+        Swaps the `.pimesh` file `cachePath` (a reimport of `path`) into the loaded model in place,
+        so that every component using it stays valid. Returns False if the model is not loaded.
+        '''
+        record = self.__AssetMap.get(AssetManager.GetUUID(self.GetAbsolutePath(path)), None)
+        if record is None or record.Type != AssetManager.AssetType.MeshAsset: return False
+
+        model: Model = record.Asset
+        model._Replace(Model.FromData(MeshData.Read(cachePath, os.path.dirname(os.path.abspath(path))), model.Path))
+
+        # The new materials might use other textures
+        textures = AssetManager.__TexturesOf(record.Type, model)
+        for key in textures: AssetManager.__Textures[key].RefCount += 1
+        for key in record.Textures: AssetManager.__Textures[key].RefCount -= 1
+        record.Textures = textures
+
+        return True
+
+    def GetAssets(self, assetType: int) -> List[Asset]:
+        '''Records of every loaded asset of `assetType`'''
+        return [ record for record in self.__AssetMap.values() if record.Type == assetType ]
+
     @dispatch(str)
     def Get(self, path: str) -> Any:
-        return self.__AssetMap.get(UUIDGenerator(self.GetAbsolutePath(path)), Asset()).Asset
+        return self.__AssetMap.get(AssetManager.GetUUID(self.GetAbsolutePath(path)), Asset()).Asset
 
     @dispatch(UUID)
     def Get(self, uuid: UUID) -> Any: return self.__AssetMap.get(uuid, Asset()).Asset
\ No newline at end of file
@@ -0,0 +1,137 @@
+from ..Renderer.Shader   import Shader
+from ..Renderer.MeshData import MeshData
+from ..Logging.logger import PI_CORE_INFO
+from .AssetManager   import AssetManager
+from .AssetDatabase  import AssetDatabase
+from .ImportService  import ImportService
+
+from threading import Lock
+from typing import Any, Dict, List
+import pathlib
+import time
+import os
+
+class AssetWatcher:
+    '''
+    Hot reloads the project's assets and the engine's shaders when their files change.
+
+    The watchers' threads only record which files changed. `Update` (once per frame, on the main thread)
+    reloads the files that stopped changing: shaders are recompiled and textures decoded again in place,
+    models are reimported by the ImportService and swapped into the loaded ones once that is done.
+    Only the objects loaded from the changed file are touched, and every handle to them stays valid.
+    '''
+    __slots__ = ()
+
+    ShadersLocation: str = ".\\InternalAssets\\Shaders"
+
+    # Editors write files in several steps, a file is reloaded once it did not change for this long
+    Delay: float = 0.25     # Seconds
+
+    __Watchers : Dict[str, Any] = {}      # Directory -> DirectoryWatcher
+    __Lock     : Lock = Lock()
+    __Changes  : Dict[str, float] = {}      # Normalized path -> time of the last event
+
+    __Textures : tuple = ( ".png", ".jpg", ".jpeg", ".bmp", ".tga" )
+
+    class EventHandler:
+        # A Scripting.FileWatcher.FileSystemEventHandler (not derived from it, importing PI.Scripting here is circular)
+        # Called from the watchers' threads
+        @staticmethod
+        def OnCreated  (event) -> None: AssetWatcher._Changed(event, event.src_path)
+        @staticmethod
+        def OnModified (event) -> None: AssetWatcher._Changed(event, event.src_path)
+        @staticmethod
+        def OnDeleted  (event) -> None: AssetWatcher._Changed(event, event.src_path)
+        @staticmethod
+        def OnMoved    (event) -> None:
+            AssetWatcher._Changed(event, event.src_path)
+            AssetWatcher._Changed(event, event.dest_path)
+
+    @staticmethod
+    def Init() -> None: AssetWatcher.Watch(AssetWatcher.ShadersLocation)
+
+    @staticmethod
+    def Watch(directory: str) -> None:
+        from ..Scripting.FileWatcher import DirectoryWatcher
+
+        directory = AssetManager.NormalizePath(directory)
+        if directory in AssetWatcher.__Watchers or not os.path.isdir(directory): return
+
+        watcher = DirectoryWatcher(pathlib.Path(directory), AssetWatcher.EventHandler)
+        watcher.Start()
+        AssetWatcher.__Watchers[directory] = watcher
+
+    @staticmethod
+    def Unwatch(directory: str) -> None:
+        watcher = AssetWatcher.__Watchers.pop(AssetManager.NormalizePath(directory), None)
+        if watcher is not None: watcher.Stop()
+
+    @staticmethod
+    def SetProjectLocation(assetsLocation: str) -> None:
+        '''Watches the Assets folder of the opened project instead of the previous one's'''
+        shaders = AssetManager.NormalizePath(AssetWatcher.ShadersLocation)
+        for directory in list(AssetWatcher.__Watchers.keys()):
+            if directory != shaders: AssetWatcher.Unwatch(directory)
+
+        AssetWatcher.Watch(assetsLocation)
+
+    @staticmethod
+    def _Changed(event, path: str) -> None:
+        if event.is_directory: return
+
+        with AssetWatcher.__Lock: AssetWatcher.__Changes[AssetManager.NormalizePath(path)] = time.monotonic()
+
+    @staticmethod
+    def Update() -> int:
+        '''Reloads the files that stopped changing. Returns the number of files reloaded.'''
+        if not AssetWatcher.__Changes: return 0
+
+        now = time.monotonic()
+        with AssetWatcher.__Lock:
+            paths = [ path for path, changed in AssetWatcher.__Changes.items() if now - changed >= AssetWatcher.Delay ]
+            for path in paths: del AssetWatcher.__Changes[path]
+
+        if not paths: return 0
+
+        # Keeps the GUIDs of moved files and drops the artifacts of changed ones, the models are reimported below
+        AssetDatabase.Refresh(reimport=False)
+
+        reloaded = 0
+        for path in paths:
+            if not os.path.isfile(path): continue
+            extension = os.path.splitext(path)[1].lower()
+
+            if   extension == ".glsl": reloaded += Shader.ReloadFile(path)
+            elif extension in AssetWatcher.__Textures: reloaded += AssetManager.ReloadTexture(path)
+            elif extension in ( ".obj", ".mtl" ):
+                models = AssetWatcher.__ModelsOf(path, extension)
+                for model in models: AssetWatcher.__ReloadModel(model)
+                reloaded += len(models)
+
+        PI_CORE_INFO("Hot reloaded {} of {} changed files", reloaded, len(paths))
+        return reloaded
+
+    @staticmethod
+    def __ModelsOf(path: str, extension: str) -> List[str]:
+        '''The loaded models that are, or use (their MTL files), the file at `path`'''
+        assetManager = AssetManager.GetInstance()
+        if assetManager is None: return []
+
+        if extension == ".obj": return [ path ] if assetManager.Get(path) is not None else []
+
+        models = [ record.Path for record in assetManager.GetAssets(AssetManager.AssetType.MeshAsset) ]
+        return [ model for model in models if path in map(AssetManager.NormalizePath, MeshData.Dependencies(model)) ]
+
+    @staticmethod
+    def __ReloadModel(path: str) -> None:
+        guid = AssetDatabase.GetGUID(path)
+        handle = AssetDatabase.Reimport(guid) if guid is not None else None
+        if handle is None: handle = ImportService.ImportMeshData(path)
+
+        # Resolved at a frame boundary by `ImportService.Update`, the model keeps rendering its old data till then
+        handle.AddCallback(lambda cachePath: AssetManager.GetInstance().ReloadModel(path, cachePath))
+
+    @staticmethod
+    def Shutdown() -> None:
+        for directory in list(AssetWatcher.__Watchers.keys()): AssetWatcher.Unwatch(directory)
+        with AssetWatcher.__Lock: AssetWatcher.__Changes.clear()
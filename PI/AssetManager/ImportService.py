@@ -0,0 +1,226 @@
+from ..Renderer.Model         import Model
+from ..Renderer.MeshData      import MeshData
+from ..Renderer.TextureLoader import TextureLoader
+from ..Logging.logger         import PI_CORE_ERROR, PI_CORE_TRACE
+
+from concurrent.futures import ProcessPoolExecutor, Future, wait
+from multiprocessing import get_context, shared_memory
+from typing import Any, Callable, List
+import numpy as np
+import weakref
+import os
+
+def _ImportMesh(path: str) -> str:
+    '''Worker process: parses and optimizes `path` into the `.pimesh` cache and returns the cache file'''
+    MeshData.Load(path)
+    return MeshData.CachePath(path)
+
+def _ImportTexture(path: str, spec, memoryName: str):
+    '''
+    Worker process: decodes the image at `path` into the shared memory block `memoryName`.
+    Mipmapped textures are written to the MipChain cache instead and their (preloaded) chain is returned.
+    '''
+    from PIL import Image
+    image = Image.open(path)
+
+    if memoryName is None: return TextureLoader.Load(path, image, spec)
+
+    memory = shared_memory.SharedMemory(name=memoryName)
+    try:
+        pixels = np.ndarray((image.height, image.width, 4), dtype=np.uint8, buffer=memory.buf)
+        TextureLoader.DecodeInto(image, pixels)
+        del pixels
+    finally:
+        memory.close()
+
+class ImportHandle:
+    '''
+    An import running in the ImportService's worker processes.
+    It is resolved on the main thread (where the GPU resources are created) by `ImportService.Update`.
+    '''
+    __slots__ = "__Path", "__Future", "__Resolve", "__Release", "__Callbacks", "__Result", "__Error", "__Done"
+
+    def __init__(self, path: str, future: Future, resolve: Callable[[Any], Any], release: Callable[[], None]=None) -> None:
+        self.__Path, self.__Future = path, future
+
+        # `resolve` turns the worker's result into the final asset, `release` frees what was shared with the worker
+        self.__Resolve, self.__Release = resolve, release
+        self.__Callbacks: List[Callable[[Any], None]] = []
+
+        self.__Result = None
+        self.__Error: Exception = None
+        self.__Done = False
+
+    @property
+    def Path(self) -> str: return self.__Path
+    @property
+    def Future(self) -> Future: return self.__Future
+    @property
+    def IsDone(self) -> bool: return self.__Done
+    @property
+    def Result(self) -> Any: return self.__Result
+    @property
+    def Error(self) -> Exception: return self.__Error
+
+    def AddCallback(self, callback: Callable[[Any], None]) -> None:
+        '''`callback(result)` is called on the main thread once the import is resolved (never if it fails)'''
+        if not self.__Done: self.__Callbacks.append(callback)
+        elif self.__Error is None: callback(self.__Result)
+
+    def _Resolve(self) -> None:
+        try:
+            self.__Result = self.__Resolve(self.__Future.result())
+        except Exception as e:
+            self.__Error = e
+            PI_CORE_ERROR("Failed to import: {} ({})", self.__Path, e)
+        finally:
+            if self.__Release is not None: self.__Release()
+            self.__Done = True
+
+        if self.__Error is not None: return
+        for callback in self.__Callbacks: callback(self.__Result)
+        self.__Callbacks.clear()
+
+    def _Cancel(self) -> None:
+        '''Drops the import, the worker must not be using the shared resources anymore'''
+        self.__Future.cancel()
+        if self.__Release is not None and not self.__Done: self.__Release()
+        self.__Done = True
+        self.__Callbacks.clear()
+
+class ImportService:
+    '''
+    Parses meshes and decodes textures on a pool of worker processes, so that imports are not serialized by the GIL.
+
+    Meshes are written to the `.pimesh` cache by the workers and memory mapped by the main thread,
+    decoded pixels are written straight into shared memory blocks the main thread allocated.
+    The GL context can only be used from the main thread, so the GPU resources are created in `Update`,
+    which is called once per frame.
+    '''
+    __slots__ = ()
+
+    # The main thread keeps a core for itself
+    MaxWorkers: int = max(1, (os.cpu_count() or 2) - 1)
+
+    __Pool    : ProcessPoolExecutor = None
+    __Pending : List[ImportHandle] = []
+
+    @staticmethod
+    def Init() -> None:
+        # Asynchronous texture loads go through the worker processes instead of the TextureLoader's threads
+        TextureLoader.Importer = ImportService.ImportTexture
+
+    @staticmethod
+    def __GetPool() -> ProcessPoolExecutor:
+        if ImportService.__Pool is None:
+            # Spawned, not forked: the workers must not inherit the window, the GL context or any threads
+            ImportService.__Pool = ProcessPoolExecutor(ImportService.MaxWorkers, mp_context=get_context("spawn"))
+            PI_CORE_TRACE("Started {} import processes", ImportService.MaxWorkers)
+
+        return ImportService.__Pool
+
+    @staticmethod
+    def Submit(path: str, job: Callable, args: tuple, resolve: Callable[[Any], Any], release: Callable[[], None]=None) -> ImportHandle:
+        '''Runs `job(*args)` (a module level function) in a worker process, see `ImportHandle`'''
+        handle = ImportHandle(path, ImportService.__GetPool().submit(job, *args), resolve, release)
+        ImportService.__Pending.append(handle)
+        return handle
+
+    @staticmethod
+    def ImportMesh(path: str, cachePath: str=None) -> ImportHandle:
+        '''
+        Imports every submesh of `path`, the handle's result is the Model.
+        When the `.pimesh` file is already known (`cachePath`), no worker is needed and it is only read on the main thread.
+        '''
+        directory = os.path.dirname(os.path.abspath(path))
+        resolve = lambda cachePath: Model.FromData(MeshData.Read(cachePath, directory), path)
+
+        if cachePath is None: return ImportService.Submit(path, _ImportMesh, (path,), resolve)
+
+        future = Future()
+        future.set_result(cachePath)
+
+        handle = ImportHandle(path, future, resolve)
+        ImportService.__Pending.append(handle)
+        return handle
+
+    @staticmethod
+    def Completed(path: str, result: Any) -> ImportHandle:
+        '''An already resolved handle, for results that needed no import'''
+        future = Future()
+        future.set_result(result)
+
+        handle = ImportHandle(path, future, lambda result: result)
+        handle._Resolve()
+        return handle
+
+    @staticmethod
+    def ImportMeshData(path: str) -> ImportHandle:
+        '''Only writes the `.pimesh` cache of `path`, the handle's result is the cache file'''
+        return ImportService.Submit(path, _ImportMesh, (path,), lambda cachePath: cachePath)
+
+    @staticmethod
+    def ImportTexture(texture, path: str, image, spec) -> ImportHandle:
+        '''Decodes the already opened `image` and calls `texture._OnDecoded(result)` on the main thread'''
+        textureRef = weakref.ref(texture)
+
+        # The main thread owns the block, so it outlives the worker's view of it on every platform
+        memory = None
+        if not spec.Mipmaps: memory = shared_memory.SharedMemory(create=True, size=max(image.width * image.height * 4, 1))
+        shape = (image.height, image.width, 4)
+
+        def resolve(result) -> None:
+            # The texture was deleted while it was decoding
+            texture = textureRef()
+            if texture is None: return
+
+            if memory is None: return texture._OnDecoded(result)
+
+            pixels = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+            texture._OnDecoded(pixels)
+            del pixels
+
+        def release() -> None:
+            if memory is None: return
+            memory.close()
+            memory.unlink()
+
+        return ImportService.Submit(path, _ImportTexture, (path, spec, memory.name if memory else None), resolve, release)
+
+    @staticmethod
+    def Update() -> int:
+        '''Resolves every finished import. Returns the number of imports still running.'''
+        pending = []
+
+        for handle in ImportService.__Pending:
+            if handle.Future.done(): handle._Resolve()
+            else: pending.append(handle)
+
+        ImportService.__Pending = pending
+        return len(pending)
+
+    @staticmethod
+    def Wait(handles: List[ImportHandle]) -> None:
+        '''Blocks till `handles` are finished (they still run in parallel) and resolves them'''
+        wait([ handle.Future for handle in handles ])
+
+        for handle in handles:
+            if not handle.IsDone: handle._Resolve()
+
+        ImportService.__Pending = [ handle for handle in ImportService.__Pending if not handle.IsDone ]
+
+    @staticmethod
+    def PendingCount() -> int: return len(ImportService.__Pending)
+
+    @staticmethod
+    def Shutdown() -> None:
+        TextureLoader.Importer = None
+        if ImportService.__Pool is None: return
+
+        for handle in ImportService.__Pending: handle.Future.cancel()
+        ImportService.__Pool.shutdown(wait=True)
+        ImportService.__Pool = None
+
+        # Frees the shared memory of the imports that never got resolved
+        for handle in ImportService.__Pending: handle._Cancel()
+        ImportService.__Pending = []
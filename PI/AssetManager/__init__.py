@@ -1 +1,4 @@
 from .AssetManager import *
+from .ImportService import *
+from .AssetDatabase import *
+from .AssetWatcher import *
@@ -5,6 +5,9 @@ from ..ImGui    import ImGuiLayer
 from ..Layers   import *
 from ..Platform import *
 from ..Renderer import RenderCommand, Renderer, Renderer2D, Shader
+from ..AssetManager.ImportService import ImportService
+from ..AssetManager.AssetManager  import AssetManager
+from ..AssetManager.AssetWatcher  import AssetWatcher
 from .Timestep  import Timestep
 from .Window   import Window, WindowProperties
 from .StateManager import StateManager
@@ -12,6 +15,7 @@ from .StateManager import StateManager
 from ..Logging import logger
 
 from abc import ABC
+from multiprocessing import current_process
 import glfw
 
 class PI_Application(ABC):
@@ -48,6 +52,8 @@ class PI_Application(ABC):
         self._Running = True
 
         Renderer.Init()
+        ImportService.Init()
+        AssetWatcher.Init()
         Input.Init()
 
         self._Window = Window.Create(props)
@@ -133,11 +139,16 @@ class PI_Application(ABC):
 
         if not self._IsMinimised:
             StateManager.SetContext(self)
+            Renderer.OnFrameBegin()
 
             RenderCommand.SetClearColor(0.1, 0.1, 0.1, 1)
             RenderCommand.Clear()
 
             self._LayerStack.OnUpdate(self.timestep)
+            AssetWatcher.Update()
+            ImportService.Update()
+            AssetManager.Update()
+            Renderer.OnFrameEnd()
 
         if PI_IMGUI:
             self.__ImGuiLayer.Begin()
@@ -154,10 +165,18 @@ class PI_Application(ABC):
         from ..Scripting.ScriptingEngine import ScriptingEngine
         ScriptingEngine.Shutdown()
 
+        # Lets a scene that is still being saved finish writing
+        from ..Scene.SceneWriter import SceneWriter
+        SceneWriter.Shutdown()
+
         from .CacheManager import LocalCache, ProjectCache
         ProjectCache.Shutdown()
         LocalCache.Shutdown()
 
+        AssetWatcher.Shutdown()
+        ImportService.Shutdown()
+        Renderer.Shutdown()
+
         self._Running = False
     
 CreateApplication = None
@@ -178,6 +197,9 @@ def _main():
     PI_INSTRUMENTATION_END_SESSION()
 
 def main():
+    # The ImportService's worker processes import the client's script again, they must not start another app
+    if current_process().name != "MainProcess": return
+
     if PI_INSTRUMENTATION:
         # Only for Detailed Profiling
         import cProfile
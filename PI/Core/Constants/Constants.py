@@ -5,7 +5,7 @@ from OpenGL.GL import \
     GL_DEPTH24_STENCIL8, GL_DEPTH_STENCIL, GL_UNSIGNED_INT_24_8, \
     GL_R32I, GL_UNSIGNED_BYTE, GL_RED_INTEGER, \
     GL_REPEAT, GL_CLAMP_TO_EDGE, \
-    GL_NEAREST, GL_LINEAR
+    GL_NEAREST, GL_LINEAR, GL_LINEAR_MIPMAP_LINEAR
 
 class PIConstants:
     @staticmethod
@@ -22,3 +22,4 @@ class PIConstants:
 
     REPEAT, CLAMP_TO_EDGE  = GL_REPEAT, GL_CLAMP_TO_EDGE
     NEAREST, LINEAR        = GL_NEAREST, GL_LINEAR
+    LINEAR_MIPMAP_LINEAR   = GL_LINEAR_MIPMAP_LINEAR
@@ -1,15 +1,328 @@
-import pywavefront
 from ..Logging import PI_CORE_WARN
 
+import numpy as np
+from typing import Dict, List, Tuple
+import warnings
+import re
+import os
+
+class OBJMaterial:
+    __slots__ = "Name", "Diffuse", "Specular", "Albedo", "SpecularMap", "TilingFactor"
+
+    def __init__(self, name: str) -> None:
+        self.Name = name
+
+        self.Diffuse  : List[float] = [ 0.8, 0.8, 0.8, 1.0 ]
+        self.Specular : List[float] = [ 0.0, 0.0, 0.0, 1.0 ]
+
+        # Absolute paths of the textures, None if there is none
+        self.Albedo      : str = None
+        self.SpecularMap : str = None
+        self.TilingFactor: float = 1.0      # `-s` option of the albedo map
+
+class OBJMesh:
+    '''Every triangle of an OBJ file using one material, as a flat (not indexed) T2F_N3F_V3F vertex list'''
+    __slots__ = "Name", "Material", "Vertices"
+
+    def __init__(self, name: str, material: OBJMaterial, vertices: np.ndarray) -> None:
+        self.Name, self.Material, self.Vertices = name, material, vertices
+
 class OBJReader:
-    class __CustomLoggerForPyWavefront:
-        @staticmethod
-        def warning(msg: str) -> None:
-            PI_CORE_WARN(msg)
+    '''
+    Reads OBJ files (and their MTL files) with bulk NumPy operations instead of line by line:
+    the lines are classified from their first bytes, the keywords blanked out and every run of `v`/`vt`/`vn`/`f`
+    lines parsed as one block of numbers. Polygons are triangulated and the vertices gathered with fancy indexing.
+
+    Files using what the fast path does not support (mixed face formats, line continuations, ...)
+    are read with pywavefront instead.
+    '''
+    __slots__ = ()
+
+    VertexStride: int = 8   # T2F_N3F_V3F
+
+    # Line kinds
+    __Other, __Position, __TexCoord, __Normal, __Face = range(5)
+
+    __Statement = re.compile(rb"(usemtl|mtllib|o|g)(?:[ \t]+([^\r\n]*?))?[ \t]*\r?")
+
+    # Number of arguments of the texture map options
+    __MapOptions = { "-blendu": 1, "-blendv": 1, "-bm": 1, "-boost": 1, "-cc": 1, "-clamp": 1,
+        "-imfchan": 1, "-mm": 2, "-texres": 1, "-type": 1, "-o": 3, "-s": 3, "-t": 3 }
+
+    @staticmethod
+    def Read(path: str) -> List[OBJMesh]:
+        '''One OBJMesh per material with faces, in the order the materials are defined in'''
+        try: return OBJReader.Parse(path)
+        except ValueError as e:
+            PI_CORE_WARN("Reading {} with pywavefront ({})", path, e)
+            return OBJReader.ReadWavefront(path)
+
+    @staticmethod
+    def Parse(path: str) -> List[OBJMesh]:
+        '''The NumPy reader, raises a ValueError for files it can not read'''
+        with open(path, "rb") as f: data = bytearray(f.read())
+        if b"\\\n" in data or b"\\\r\n" in data: raise ValueError("line continuations are not supported")
+        if not data.endswith(b"\n"): data += b"\n"
+
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        starts = np.concatenate(([ 0 ], np.flatnonzero(buffer == ord("\n"))[:-1] + 1))
+        ends = np.append(starts[1:], len(data))
+
+        # Every line's kind, from its first characters
+        padded = np.append(buffer, np.zeros(3, dtype=np.uint8))
+        first, second, third = padded[starts], padded[starts + 1], padded[starts + 2]
+        isSpace = lambda c: (c == ord(" ")) | (c == ord("\t"))
+
+        if (isSpace(first) & ~isSpace(second) & (second != ord("\n")) & (second != ord("\r"))).any():
+            raise ValueError("indented lines are not supported")
+
+        kinds = np.full(len(starts), OBJReader.__Other, dtype=np.int8)
+        kinds[(first == ord("v")) & isSpace(second)] = OBJReader.__Position
+        kinds[(first == ord("v")) & (second == ord("t")) & isSpace(third)] = OBJReader.__TexCoord
+        kinds[(first == ord("v")) & (second == ord("n")) & isSpace(third)] = OBJReader.__Normal
+        kinds[(first == ord("f")) & isSpace(second)] = OBJReader.__Face
+
+        # Blanking the keywords leaves runs of consecutive lines of a kind that are only numbers
+        keywords = kinds != OBJReader.__Other
+        buffer[starts[keywords]] = ord(" ")
+        buffer[starts[(kinds == OBJReader.__TexCoord) | (kinds == OBJReader.__Normal)] + 1] = ord(" ")
+
+        runStarts = np.flatnonzero(np.diff(kinds, prepend=-1))
+        runEnds = np.append(runStarts[1:], len(kinds))
+        runs = [ (kind, begin, end) for kind, begin, end in zip(kinds[runStarts], runStarts, runEnds) if kind != OBJReader.__Other ]
+        span = lambda begin, end: bytes(data[starts[begin]:ends[end - 1]])
+
+        positions = OBJReader.__Columns([ (span(b, e), e - b) for k, b, e in runs if k == OBJReader.__Position ], 3, "v")
+        texCoords = OBJReader.__Columns([ (span(b, e), e - b) for k, b, e in runs if k == OBJReader.__TexCoord ], 2, "vt")
+        normals   = OBJReader.__Columns([ (span(b, e), e - b) for k, b, e in runs if k == OBJReader.__Normal   ], 3, "vn")
+
+        # Negative indices are relative to the vertices read before the face
+        read = np.stack([ np.cumsum(kinds == kind) - (kinds == kind)
+            for kind in ( OBJReader.__Position, OBJReader.__TexCoord, OBJReader.__Normal ) ], axis=1)
+
+        # `usemtl`, `mtllib`, `o` and `g`, by line
+        directory = os.path.dirname(os.path.abspath(path))
+        materials: Dict[str, OBJMaterial] = {}
+        statementLines, statements = [], []
+
+        for line in np.flatnonzero(np.isin(first, np.frombuffer(b"umog", dtype=np.uint8)) & ~keywords):
+            statement = OBJReader.__Statement.fullmatch(data, starts[line], ends[line] - 1)
+            if statement is None: continue
+
+            kind, value = statement.group(1), (statement.group(2) or b"").decode(errors="replace")
+            if kind == b"mtllib": materials.update(OBJReader.ReadMaterials(os.path.join(directory, value)))
+            else: statementLines.append(line); statements.append((kind, value))
+
+        # The faces are grouped by material, a group is named after the first object that uses it
+        groups: Dict[str, List[np.ndarray]] = {}
+        names: Dict[str, str] = {}
+        material, name, statement = None, None, 0
+
+        for kind, begin, end in runs:
+            if kind != OBJReader.__Face: continue
+
+            while statement < len(statements) and statementLines[statement] < begin:
+                keyword, value = statements[statement]
+                if keyword == b"usemtl": material = value
+                else: name = value
+                statement += 1
+
+            key = material if material is not None else ""
+            groups.setdefault(key, []).append(OBJReader.__Gather(
+                OBJReader.__Triangulate(span(begin, end), end - begin), read[begin], positions, texCoords, normals
+            ))
+            names.setdefault(key, name if name is not None else (key or "Default"))
+
+        meshes = []
+        order = [ key for key in materials if key in groups ] + [ key for key in groups if key not in materials ]
+        for key in order:
+            meshes.append(OBJMesh(names[key], materials.get(key, None) or OBJMaterial(key or "Default"), np.concatenate(groups[key])))
+
+        return meshes
+
+    @staticmethod
+    def __Columns(runs: List[Tuple[bytes, int]], columns: int, kind: str) -> np.ndarray:
+        '''The first `columns` numbers of every line of the runs (text, line count), each run parsed as one block'''
+        if not runs: return np.zeros((0, columns), dtype=np.float32)
+
+        width = len(runs[0][0].split(b"\n", 1)[0].split())
+        blocks = []
+
+        for text, lines in runs:
+            # A block that fails to parse stops early, which the size check catches
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                values = np.fromstring(text, dtype=np.float32, sep=" ")
+
+            if width < columns or len(values) != width * lines:
+                raise ValueError(f"`{kind}` lines with varying or too few numbers")
+            blocks.append(values.reshape(-1, width)[:, :columns])
+
+        return np.concatenate(blocks)
+
+    @staticmethod
+    def __Triangulate(text: bytes, faces: int) -> np.ndarray:
+        '''(3 * triangles, 3) v/vt/vn indices (0 where missing) of the face lines `text`, fan triangulated'''
+        text = text.replace(b"//", b"/0/")
+        buffer = np.frombuffer(text, dtype=np.uint8)
+
+        # Corners per face: the starts of the whitespace separated tokens on every line
+        newline = buffer == ord("\n")
+        token = ~(newline | (buffer == ord(" ")) | (buffer == ord("\t")) | (buffer == ord("\r")))
+        tokenStarts = token & ~np.concatenate(([ False ], token[:-1]))
+        line = np.cumsum(newline) - newline
+        counts = np.bincount(line[tokenStarts], minlength=faces)
+        corners = int(counts.sum())
+
+        if len(counts) != faces or (counts < 3).any(): raise ValueError("faces with less than 3 corners")
+
+        components = text.split(None, 1)[0].count(b"/") + 1
+        if components > 3 or text.count(b"/") != (components - 1) * corners: raise ValueError("mixed face formats")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            values = np.fromstring(text.replace(b"/", b" "), dtype=np.int64, sep=" ")
+        if len(values) != components * corners: raise ValueError("invalid face indices")
+
+        indices = np.zeros((corners, 3), dtype=np.int64)
+        indices[:, :components] = values.reshape(-1, components)
+
+        # Face `i` with `n` corners starting at `first` becomes the triangles (first, first + k, first + k + 1), 0 < k < n - 1
+        triangles = counts - 2
+        first = np.cumsum(counts) - counts
+        face = np.repeat(np.arange(len(counts)), triangles)
+        fan = np.arange(int(triangles.sum())) - np.repeat(np.cumsum(triangles) - triangles, triangles) + 1
+        first = first[face]
+
+        return indices[np.stack([ first, first + fan, first + fan + 1 ], axis=1).ravel()]
+
+    @staticmethod
+    def __Gather(indices: np.ndarray, read: np.ndarray, positions: np.ndarray, texCoords: np.ndarray, normals: np.ndarray) -> np.ndarray:
+        '''Interleaved T2F_N3F_V3F vertices of the triangle corners `indices`'''
+        # 1 based, negative indices count back from the vertices read so far (`read`), 0 is missing (-1 once resolved)
+        resolved = np.where(indices < 0, indices + read, indices - 1)
+        if (resolved < -1).any() or (resolved >= np.array([ len(positions), len(texCoords), len(normals) ])).any():
+            raise ValueError("face indices out of range")
+        if (resolved[:, 0] < 0).any(): raise ValueError("faces without positions")
+
+        vertices = np.zeros((len(indices), OBJReader.VertexStride), dtype=np.float32)
+        vertices[:, 5:8] = positions[resolved[:, 0]]
+
+        hasTexCoords = resolved[:, 1] >= 0
+        vertices[hasTexCoords, 0:2] = texCoords[resolved[hasTexCoords, 1]]
+
+        hasNormals = resolved[:, 2] >= 0
+        vertices[hasNormals, 2:5] = normals[resolved[hasNormals, 2]]
+
+        # Corners without normals get their triangle's
+        if not hasNormals.all():
+            triangles = vertices[:, 5:8].reshape(-1, 3, 3)
+            faceNormals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+            faceNormals /= np.maximum(np.linalg.norm(faceNormals, axis=1, keepdims=True), 1e-12)
+            vertices[~hasNormals, 2:5] = np.repeat(faceNormals, 3, axis=0)[~hasNormals]
+
+        return vertices
+
+    @staticmethod
+    def ReadMaterials(path: str) -> Dict[str, OBJMaterial]:
+        '''The materials of the MTL file at `path` (none if it does not exist), texture paths are made absolute'''
+        if not os.path.isfile(path): return {}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        materials: Dict[str, OBJMaterial] = {}
+        material: OBJMaterial = None
+
+        with open(path, "r", errors="replace") as f:
+            for line in f:
+                keyword, _, value = line.strip().partition(" ")
+                value = value.strip()
+
+                if keyword == "newmtl":
+                    material = materials[value] = OBJMaterial(value)
+                    continue
+                if material is None: continue
+
+                if   keyword == "Kd": material.Diffuse [:3] = OBJReader.__Color(value)
+                elif keyword == "Ks": material.Specular[:3] = OBJReader.__Color(value)
+                elif keyword in ( "map_Kd", "map_Ks" ):
+                    texture, options = OBJReader.__TextureMap(value)
+                    texture = os.path.normpath(os.path.join(directory, texture))
+
+                    if keyword == "map_Kd":
+                        material.Albedo = texture
+                        material.TilingFactor = options.get("-s", [ 1.0 ])[0]
+                    else: material.SpecularMap = texture
+
+        return materials
+
+    @staticmethod
+    def __Color(value: str) -> List[float]:
+        color = [ float(channel) for channel in value.split()[:3] ]
+        return color + [ color[-1] ] * (3 - len(color))     # `Kd r` is grey
+
+    @staticmethod
+    def __TextureMap(value: str) -> Tuple[str, Dict[str, List[float]]]:
+        '''The path and the options (only the numeric ones are kept) of a texture map statement'''
+        tokens, options = value.split(), {}
+
+        while tokens and tokens[0] in OBJReader.__MapOptions:
+            option = tokens.pop(0)
+            count, arguments = OBJReader.__MapOptions[option], []
+
+            # `-o`, `-s` and `-t` take 1 to 3 numbers
+            while tokens[:-1] and len(arguments) < count:
+                try: arguments.append(float(tokens[0]))
+                except ValueError:
+                    if option in ( "-o", "-s", "-t" ) and arguments: break
+                    arguments.append(tokens[0])
+                tokens.pop(0)
+
+            options[option] = arguments
+
+        return " ".join(tokens), options
 
     @staticmethod
-    def Read(path: str):
-        pywavefront.parser.logger = OBJReader.__CustomLoggerForPyWavefront
-        pywavefront.logger        = OBJReader.__CustomLoggerForPyWavefront
+    def ReadWavefront(path: str) -> List[OBJMesh]:
+        '''The pywavefront reader, converted to the same OBJMeshes'''
+        import pywavefront
+
+        class Logger:
+            @staticmethod
+            def warning(msg: str) -> None: PI_CORE_WARN(msg)
+
+        pywavefront.parser.logger = Logger
+        pywavefront.logger        = Logger
         scene = pywavefront.Wavefront(path, strict=True, collect_faces=True, create_materials=True, cache=False)
-        return scene
+
+        # Named after the first object using them, as the NumPy reader does
+        names = {}
+        for mesh in scene.mesh_list:
+            for material in mesh.materials: names.setdefault(material.name, mesh.name or material.name)
+
+        meshes = []
+        for name, material in scene.materials.items():
+            if not material.vertices: continue
+
+            # Any of T2F, C3F and N3F may be missing, the vertices are brought to T2F_N3F_V3F
+            layout = { part[0]: int(part[1]) for part in material.vertex_format.split("_") }
+            source = np.array(material.vertices, dtype=np.float32).reshape(-1, sum(layout.values()))
+            vertices = np.zeros((len(source), OBJReader.VertexStride), dtype=np.float32)
+
+            offset = 0
+            for kind, size in layout.items():
+                if   kind == "T": vertices[:, 0:2] = source[:, offset:offset + 2]
+                elif kind == "N": vertices[:, 2:5] = source[:, offset:offset + 3]
+                elif kind == "V": vertices[:, 5:8] = source[:, offset:offset + 3]
+                offset += size
+
+            result = OBJMaterial(name)
+            result.Diffuse, result.Specular = [ float(value) for value in material.diffuse ], [ float(value) for value in material.specular ]
+            if material.texture is not None:
+                result.Albedo = os.path.abspath(material.texture.path)
+                result.TilingFactor = float(material.texture.options.s[0])
+            if material.texture_specular_color is not None:
+                result.SpecularMap = os.path.abspath(material.texture_specular_color.path)
+
+            meshes.append(OBJMesh(names.get(name, name), result, vertices))
+
+        return meshes
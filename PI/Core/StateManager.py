@@ -5,6 +5,7 @@ class PI:
 
         class Stats:
             DrawCalls: int = 0
+            RenderPasses: dict = {}     # Pass name -> milliseconds, filled by RenderGraph.Execute
 
             class Shaders:
                 ShadersBinded: int = 0
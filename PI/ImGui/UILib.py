@@ -5,6 +5,9 @@ import pyrr
 from typing import Callable, Iterable, List, Tuple, Any
 
 class UILib:
+    # Counts the controls that reported a change, compared before and after drawing to know if anything was edited
+    Edits: int = 0
+
     class _FILE_DIALOGUE_RESOURCES:
         IsLoaded: bool = False
         
@@ -30,6 +33,11 @@ class UILib:
 
             UILib._FILE_DIALOGUE_RESOURCES.IsLoaded = True
 
+    @staticmethod
+    def __Changed(changed: bool) -> bool:
+        if changed: UILib.Edits += 1
+        return changed
+
     @staticmethod
     def TooltipIfHovered(tooltip: str=None) -> None:
         if tooltip and imgui.is_item_hovered():
@@ -98,7 +106,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        if XHasChanged or YHasChanged or ZHasChanged: return True, pyrr.Vector3([ XChanged, YChanged, ZChanged ])
+        if UILib.__Changed(XHasChanged or YHasChanged or ZHasChanged): return True, pyrr.Vector3([ XChanged, YChanged, ZChanged ])
         else: return False, pyrr.Vector3([ values.x, values.y, values.z ])
 
     @staticmethod
@@ -134,6 +142,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
+        UILib.__Changed(changed)
         if not acceptDragDrop: return changed, newText
         return changed, newText, dragDrop
 
@@ -258,7 +267,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        return changed, index, values[index]
+        return UILib.__Changed(changed), index, values[index]
 
     @staticmethod
     def DrawFloatControls(
@@ -281,7 +290,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        return changed, value
+        return UILib.__Changed(changed), value
         
     @staticmethod
     def DrawIntControls(lable: str, value: int, speed: float=0.05,
@@ -296,7 +305,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        return changed, value
+        return UILib.__Changed(changed), value
 
     @staticmethod
     def DrawBoolControls(lable: str, state: bool, columnWidth: float=100) -> Tuple[bool, bool]:
@@ -309,7 +318,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        return changed, state
+        return UILib.__Changed(changed), state
 
     @staticmethod
     def DrawColor4Controls(lable: str, value: pyrr.Vector4, columnWidth: float=100) -> Tuple[bool, pyrr.Vector4]:
@@ -322,7 +331,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        return changed, value
+        return UILib.__Changed(changed), value
 
     @staticmethod
     def DrawColor3Controls(lable: str, value: pyrr.Vector3, columnWidth: float=100) -> Tuple[bool, pyrr.Vector3]:
@@ -335,7 +344,7 @@ class UILib:
         imgui.columns(1)
         imgui.pop_id()
 
-        return changed, value
+        return UILib.__Changed(changed), value
 
     @staticmethod
     def DrawFileLoadDialog(filetypes=Iterable[Tuple[str, str]]) -> Tuple[bool, str]:
@@ -1,15 +1,17 @@
 from ..Core import *
 import spdlog
+from multiprocessing import current_process
 
 class Log:
     __slots__ = "__CoreLogger", "__ClientLogger"
 
     @staticmethod
     def Init() -> None:
-        logSinks = [
-            spdlog.stdout_color_sink_mt(),
-            spdlog.basic_file_sink_mt("PI.log", True)
-        ]
+        logSinks = [ spdlog.stdout_color_sink_mt() ]
+
+        # The ImportService's worker processes only log to the console, PI.log belongs to the main process
+        if current_process().name == "MainProcess":
+            logSinks.append(spdlog.basic_file_sink_mt("PI.log", True))
         
 	    # TODO: Set File logger pattern to -> "[%T] [%l] %n: %v"
 
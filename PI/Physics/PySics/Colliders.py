@@ -6,6 +6,7 @@ class Collider(ABC):
     Bounds: pyrr.Vector3
 
     IsTrigger: bool = False
+    Scaled   : bool = True      # Whether the body is scaled by `Scale`, shapes with dimensions (e.g. a radius) are not
 
     def __init__(self,
         origin: pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]),
@@ -23,6 +24,11 @@ class Collider(ABC):
 
     def SetScale(self, scale: pyrr.Vector3) -> None: self.Bounds = scale
 
+    @property
+    def ShapeKey(self) -> Tuple:
+        '''Colliders with the same key have the same shape, the world shares it between their bodies'''
+        return ( type(self).__name__, *self.Bounds.tolist() )
+
     def __repr__(self) -> str:
         return "<{}>: Origin: {}, Bounds: {}, IsTrigger: {}" \
             .format(type(self).__name__, self.Origin, self.Bounds, self.IsTrigger)
@@ -32,7 +38,74 @@ class BoxCollider(Collider):
     def _MustOverride(self) -> None: ...
 
 class SphereCollider(Collider):
+    '''`Bounds.x` is the radius'''
     __SphereCollider: bool = True
+    Scaled: bool = False
+
+    @property
+    def Radius(self) -> float: return float(self.Bounds[0])
+
+    @property
+    def ShapeKey(self) -> Tuple: return ( "SphereCollider", self.Radius )
+
+    def _MustOverride(self) -> None: ...
+
+class CapsuleCollider(Collider):
+    '''`Bounds.x` is the radius and `Bounds.y` the height of the cylinder between the caps, along the Y axis'''
+    __CapsuleCollider: bool = True
+    Scaled: bool = False
+
+    def __init__(self,
+        origin: pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]),
+        bounds: pyrr.Vector3=pyrr.Vector3([ 0.5, 1, 0.5 ])
+    ) -> None:
+        super().__init__(origin, bounds)
+
+    @property
+    def Radius(self) -> float: return float(self.Bounds[0])
+    @property
+    def Height(self) -> float: return float(self.Bounds[1])
+
+    @property
+    def ShapeKey(self) -> Tuple: return ( "CapsuleCollider", self.Radius, self.Height )
+
+    def _MustOverride(self) -> None: ...
+
+class MeshCollider(Collider):
+    '''
+    Collides with the triangles of a mesh, scaled by `Bounds`. They are given by `Source`:
+        `Source.Key`        identifies the mesh (e.g. a model's path and submesh)
+        `Source.Load()`     returns its vertex positions, (V, 3), and the indices of its triangles, (T * 3)
+        `Source.CachePath`  where the built shape can be cached, or None
+    The world only loads it (on its simulation thread) when it has no shape for it yet.
+    '''
+    Source: Any
+
+    def __init__(self,
+        source: Any,
+        origin: pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]),
+        bounds: pyrr.Vector3=pyrr.Vector3([ 1, 1, 1 ])
+    ) -> None:
+        super().__init__(origin, bounds)
+        self.Source = source
+
+    @property
+    def ShapeKey(self) -> Tuple: return ( type(self).__name__, self.Source.Key )
+
+    def __repr__(self) -> str:
+        return "{}, Source: {}".format(super().__repr__(), self.Source.Key)
+
+class ConvexHullCollider(MeshCollider):
+    '''The smallest convex shape around the mesh's vertices, for dynamic bodies'''
+    __ConvexHullCollider: bool = True
+    def _MustOverride(self) -> None: ...
+
+class TriangleMeshCollider(MeshCollider):
+    '''
+    The mesh's triangles, for static bodies (e.g. a level). The built shape is cached at `Source.CachePath`,
+    a dynamic body with it collides with the mesh's convex hull instead.
+    '''
+    __TriangleMeshCollider: bool = True
     def _MustOverride(self) -> None: ...
 
 class PlaneCollider(Collider):
@@ -48,6 +121,9 @@ class PlaneCollider(Collider):
         super().__init__(origin, bounds)
         self.Up = up
 
+    @property
+    def ShapeKey(self) -> Tuple: return ( "PlaneCollider", *self.Up.tolist(), float(self.Bounds[0]) )
+
     def __repr__(self) -> str:
         return "{}, Up: {}".format(super().__repr__(), self.Up)
     
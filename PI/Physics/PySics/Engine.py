@@ -2,101 +2,725 @@ from .Utility   import *
 from .RigidBody import *
 from .Colliders import *
 
+from concurrent.futures import ThreadPoolExecutor, Future
+
+class PhysicsState:
+    '''
+    The state of every body after a batch of ticks, as published by the simulation. A published state is only read:
+    the simulation fills the other one of the world's two states, and a state is not filled again before the
+    `Update` after the one it was published for.
+    '''
+    __slots__ = (
+        "Sequence", "Bodies", "Positions", "Rotations", "Velocities", "PreviousPositions", "PreviousRotations",
+        "Moved", "MovedRows", "Moving", "MovingRows", "Contacts", "ContactBodies"
+    )
+
+    class ContactEvent:
+        Enter, Stay, Exit \
+            = range(3)
+
+    # A contact of a pair of bodies in a tick, `A` and `B` index `ContactBodies`. The normal points from B to A.
+    # An `Exit` has no point, normal nor impulse.
+    ContactType = np.dtype([
+        ("Event"   , "u1"       ),
+        ("Trigger" , "?"        ),      # Either collider is a trigger
+        ("A"       , "<i4"      ),
+        ("B"       , "<i4"      ),
+        ("Point"   , "<f4", (3,)),
+        ("Normal"  , "<f4", (3,)),
+        ("Impulse" , "<f4"      ),
+    ])
+
+    Sequence : int                  # Counts the published states
+    Bodies   : List[RigidBody]      # A body's row in the arrays
+
+    Positions  : np.ndarray
+    Rotations  : np.ndarray
+    Velocities : np.ndarray
+
+    PreviousPositions : np.ndarray  # The states before the last tick, to interpolate from
+    PreviousRotations : np.ndarray
+
+    Moved  : List[RigidBody]        # Bodies that moved in any of the batch's ticks
+    Moving : List[RigidBody]        # Bodies that moved in its last tick, they are still interpolated
+    MovedRows  : List[int]
+    MovingRows : List[int]
+
+    Contacts      : np.ndarray      # `ContactType`, the contacts of every tick of the batch, in order
+    ContactBodies : List[RigidBody]
+
+    def __init__(self) -> None:
+        self.Sequence, self.Bodies = 0, []
+        self.Positions, self.Rotations, self.Velocities = np.zeros(( 0, 3 )), np.zeros(( 0, 3 )), np.zeros(( 0, 3 ))
+        self.PreviousPositions, self.PreviousRotations = np.zeros(( 0, 3 )), np.zeros(( 0, 3 ))
+        self.Moved, self.Moving, self.MovedRows, self.MovingRows = [], [], [], []
+        self.Contacts, self.ContactBodies = np.zeros(0, dtype=PhysicsState.ContactType), []
+
+    def Row(self, body: RigidBody) -> int:
+        '''The body's row, -1 if it is not in this state (e.g. added after it was published)'''
+        row = body._Index
+        if row < 0: return -1
+        if row < len(self.Bodies) and self.Bodies[row] is body: return row
+
+        # The body changed rows since (the world moves the last body into a removed one's row)
+        for row, other in enumerate(self.Bodies):
+            if other is body: return row
+        return -1
+
+    def Interpolate(self, rows: List[int], alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+        previous, current = self.PreviousPositions[rows], self.Positions[rows]
+        positions = previous + (current - previous) * alpha
+
+        # Angles go the short way around (e.g. from 179 to -179 degrees)
+        previous, current = self.PreviousRotations[rows], self.Rotations[rows]
+        rotations = previous + ((current - previous + 180.0) % 360.0 - 180.0) * alpha
+
+        return positions, rotations
+
+class RayHit:
+    '''The closest hit of a ray or sweep, `Entity` is set by the owner of the world (e.g. the scene)'''
+    __slots__ = "Body", "Entity", "Point", "Normal", "Fraction"
+
+    def __init__(self, body: RigidBody, point: pyrr.Vector3, normal: pyrr.Vector3, fraction: float) -> None:
+        self.Body, self.Entity = body, None
+        self.Point, self.Normal, self.Fraction = point, normal, fraction
+
+class RayHits:
+    '''The closest hit of every ray of a batch, a row per ray. The rows of the rays that hit nothing are zeros.'''
+    __slots__ = "Hit", "Bodies", "Entities", "Points", "Normals", "Fractions"
+
+    Hit       : np.ndarray          # (N,) bool
+    Bodies    : List[RigidBody]     # None where nothing was hit
+    Entities  : List[Any]           # Set by the owner of the world (e.g. the scene)
+    Points    : np.ndarray          # (N, 3)
+    Normals   : np.ndarray          # (N, 3)
+    Fractions : np.ndarray          # (N,), how far along the ray the hit is
+
+    def __init__(self, count: int) -> None:
+        self.Hit, self.Bodies, self.Entities = np.zeros(count, dtype=bool), [ None ] * count, None
+        self.Points, self.Normals, self.Fractions = np.zeros(( count, 3 )), np.zeros(( count, 3 )), np.zeros(count)
+
+    def __len__(self) -> int: return len(self.Hit)
+
 class PySics:
+    '''
+    The simulation advances in ticks of `FixedTimestep`: `Update` adds the frame's time to an accumulator and
+    schedules as many ticks as it holds, at most `MaxStepsPerFrame` (the rest is dropped, the simulation then runs
+    slower than real time instead of taking ever longer frames).
+
+    When `Threaded`, the ticks run on a worker thread while the frame is rendered, Bullet releases the GIL while it
+    steps. The simulation thread owns the Bullet world and the registry: adding and removing bodies, forces and
+    teleports are commands, queued per tick and applied before the tick they were issued for. It publishes a
+    `PhysicsState` after every batch of ticks, which is all the main thread reads (e.g. `RigidBody.Position`).
+    The rendered state is therefore a frame behind the simulation. `Update` waits for the previous batch first.
+    The batch is only scheduled once its ticks' `onFixedUpdate` were called: they all see the state published by
+    the previous frame. Otherwise each tick is simulated (and published) right after its `onFixedUpdate`, the next
+    one sees its state.
+
+    Keeps its bodies in an indexed registry: a body's `_Index` is its row in `__Bodies`, `__BulletNodes` and the
+    state arrays. Removing a body moves the last one into its row. Bodies with the same collider shape (see
+    `Collider.ShapeKey`) share the Bullet shape. Each tick only reads back the bodies Bullet kept
+    active. What is left in the accumulator is used to interpolate between the last two ticks, `MovedStates` are
+    the interpolated states to render.
+
+    After each tick the contacts are read from Bullet's manifolds, a contact per pair of bodies, and compared to the
+    previous tick's to tell when they begin, stay and end. Only the pairs of layers `ContactMasks` allows are kept.
+    They are published with the state (see `PhysicsState.Contacts`) and given once by `Contacts`.
+
+    Queries (`RayCast`, `RayCastBatch`, `SweepTest`) run on the calling thread against the simulated state, they
+    wait for the ticks in flight first.
+
+    The broadphase and the solver's iterations are read when a world is made and the sleeping thresholds when a
+    body is added, they are set before the simulation starts (e.g. from the project's settings). The dynamic AABB
+    tree (DBVT) suits most scenes. Sweep and prune (SAP) can be faster with many bodies in a bounded world, but
+    nothing outside `WorldExtent` collides.
+    '''
+    class BroadphaseType:
+        DBVT, SAP \
+            = range(2)
+
+    AllLayers: int = 0xFFFFFFFF
+
+    FixedTimestep    : float = 1/60
+    MaxStepsPerFrame : int   = 5
+    Threaded         : bool  = True
+
+    Broadphase       : int   = BroadphaseType.DBVT
+    WorldExtent      : float = 1000.0   # SAP, the world's bounds go from -WorldExtent to WorldExtent on every axis
+    SolverIterations : int   = 10
+
+    # A body sleeps once it moved slower than both thresholds for `DeactivationTime`
+    LinearSleepThreshold  : float = 0.8     # Units per second
+    AngularSleepThreshold : float = 1.0     # Radians per second
+    DeactivationTime      : float = 2.0     # Seconds
+
+    __Config: Any = None    # Panda's config page with the world's settings
+
+    # Bit `j` of `ContactMasks[i]` tells whether the contacts between layers `i` and `j` are reported
+    ContactMasks : List[int]
+
+    # Main thread
+    __Commands : List[Tuple]            # Commands for the next tick, `( function, *arguments )`
+    __Batches  : List[List[Tuple]]      # The commands of the ticks scheduled by this `Update`
+    __Forced   : Dict[int, RigidBody]   # Bodies with a force or torque to apply before the next tick, by id
+    __Moved    : List[RigidBody]        # Bodies whose (interpolated) state changed in the last `Update`
+    __MovedStates : Tuple[np.ndarray, np.ndarray]
+    __Contacts    : Tuple[np.ndarray, List[RigidBody]]
+    __Accumulator : float
+    __Consumed    : int                 # Sequence of the last state `Update` read
+
+    __Pool : ThreadPoolExecutor
+    __Job  : Future
+
+    # Published
+    __States : Tuple[PhysicsState, PhysicsState]
+    __Front  : PhysicsState
+
+    # Simulation thread
     __Bodies: List[RigidBody]
 
     __BulletWorld : Any
     __BulletNodes : List
 
+    __Moving : Dict[int, RigidBody]     # Bodies that moved in the last tick, by id
+    __BatchMoved : Dict[int, RigidBody] # Bodies that moved in the ticks of the batch so far, by id
+    __Shapes : Dict[Tuple, Any]         # Bullet shapes, by shape key and scale
+
+    __Touching      : Dict[Tuple[int, int], Tuple]  # The pairs in contact in the last tick, by the ids of their bodies
+    __ContactRows    : List[Tuple]                  # The contacts of the batch's ticks so far
+    __ContactBodies  : List[RigidBody]              # The bodies they index
+    __ContactIndices : Dict[int, int]               # Index of the bodies in `__ContactBodies`, by id
+
+    __Positions  : np.ndarray   # (capacity, 3)
+    __Rotations  : np.ndarray   # (capacity, 3), heading, pitch and roll in degrees
+    __Velocities : np.ndarray   # (capacity, 3)
+    __PreviousPositions : np.ndarray
+    __PreviousRotations : np.ndarray
+
     Gravity: pyrr.Vector3
 
     def __init__(self) -> None:
-        self.__BulletWorld = BulletWorld()
+        self.__BulletWorld = PySics.__MakeWorld()
         self.__Bodies = []
         self.Gravity = pyrr.Vector3([ 0, -9.81, 0 ])
 
         g = self.Gravity
         self.__BulletWorld.setGravity(Vec3(g.x, g.y, g.z))
-        
+
         self.__BulletNodes = []
+        self.__Moving, self.__BatchMoved = {}, {}
+        self.__Shapes = {}
 
-    def AddRigidBody(self, body: RigidBody) -> Any:
-        self.__Bodies.append(body)
+        self.ContactMasks = [ 0xFFFFFFFF ] * 32
+        self.__Touching, self.__ContactRows, self.__ContactBodies, self.__ContactIndices = {}, [], [], {}
 
-        node = BulletRigidBodyNode("RB")
+        self.__Commands, self.__Batches = [], []
+        self.__Forced = {}
+        self.__Moved = []
+        self.__MovedStates = ( np.zeros(( 0, 3 )), np.zeros(( 0, 3 )) )
+        self.__Contacts = ( np.zeros(0, dtype=PhysicsState.ContactType), [] )
+        self.__Accumulator = 0.0
+        self.__Consumed = 0
+
+        self.__Pool, self.__Job = None, None
+
+        self.__States = ( PhysicsState(), PhysicsState() )
+        self.__Front = self.__States[0]
+
+        self.__Positions  = np.zeros(( 16, 3 ))
+        self.__Rotations  = np.zeros(( 16, 3 ))
+        self.__Velocities = np.zeros(( 16, 3 ))
+        self.__PreviousPositions = np.zeros(( 16, 3 ))
+        self.__PreviousRotations = np.zeros(( 16, 3 ))
+
+    @staticmethod
+    def __MakeWorld() -> Any:
+        # Bullet's world reads them from panda's config when it is made, the page is replaced for every world
+        if PySics.__Config is not None: unloadPrcFile(PySics.__Config)
+
+        algorithm = "sap" if PySics.Broadphase == PySics.BroadphaseType.SAP else "aabb"
+        PySics.__Config = loadPrcFileData("PySics",
+            f"bullet-broadphase-algorithm {algorithm}\n"
+            f"bullet-sap-extents {float(PySics.WorldExtent)}\n"
+            f"bullet-solver-iterations {int(PySics.SolverIterations)}\n"
+        )
+
+        return BulletWorld()
+
+    @property
+    def State(self) -> PhysicsState:
+        '''The last published state'''
+        return self.__Front
+
+    @property
+    def BodyCount(self) -> int: return len(self.__Front.Bodies)
+
+    @property
+    def MovedBodies(self) -> List[RigidBody]:
+        '''The bodies whose state changed in the last `Update`'''
+        return self.__Moved
+
+    @property
+    def MovedStates(self) -> Tuple[np.ndarray, np.ndarray]:
+        '''The interpolated positions and rotations of `MovedBodies`, a row per body'''
+        return self.__MovedStates
+
+    @property
+    def Contacts(self) -> Tuple[np.ndarray, List[RigidBody]]:
+        '''The contacts published since the previous `Update` (see `PhysicsState.Contacts`) and their bodies'''
+        return self.__Contacts
+
+    def SetContactFilter(self, layerA: int, layerB: int, report: bool) -> None:
+        '''Whether the contacts between bodies of `layerA` and `layerB` are reported'''
+        for layer, other in ( ( layerA, layerB ), ( layerB, layerA ) ):
+            if report: self.ContactMasks[layer] |= 1 << other
+            else: self.ContactMasks[layer] &= ~(1 << other)
+
+    @property
+    def Alpha(self) -> float:
+        '''How far (0 to 1) the rendered states are between the last two ticks'''
+        return self.__Accumulator / self.FixedTimestep
+
+    def _State(self, body: RigidBody) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        '''The body's position, rotation and velocity in the published state, None if it is not in it yet'''
+        state = self.__Front
+        row = state.Row(body)
+        if row < 0: return None
+
+        return state.Positions[row], state.Rotations[row], state.Velocities[row]
+
+    def AddRigidBody(self, body: RigidBody) -> None:
+        if body._World is self: return
+
+        self.__Commands.append(( self.__Attach, body, body.Position.tolist(), body.Rotation.tolist(), body.Velocity.tolist() ))
+        body._World = self
+        if body.CentralForce.any() or body.CentralTorque.any(): self._QueueForce(body)
+
+    def CreateRigidBody(self, mat: PySicsMaterial) -> RigidBody:
+        body = RigidBody(mat)
+        self.AddRigidBody(body)
+        return body
+
+    def DeleteRigidBody(self, rb: RigidBody) -> None:
+        if rb._World is not self: return
+
+        self.__Forced.pop(id(rb), None)
+        rb._Detach()
+        self.__Commands.append(( self.__Remove, rb ))
+
+    def _QueueForce(self, body: RigidBody) -> None: self.__Forced[id(body)] = body
+
+    def _Teleport(self, body: RigidBody, position: pyrr.Vector3, rotation: pyrr.Vector3) -> None:
+        position, rotation = [ float(value) for value in position ], [ float(value) for value in rotation ]
+        self.__Commands.append(( self.__Place, body, position, rotation ))
+
+    def OnSimulationStart(self) -> None: ...
+
+    def Update(self, dt: float, onFixedUpdate: Callable[[float], None]=None) -> List[RigidBody]:
+        '''
+        Schedules the ticks `dt` adds up to, calling `onFixedUpdate(FixedTimestep)` before each of them (when
+        `Threaded`, all of them are called before the ticks are simulated). Returns the bodies to move (also
+        `MovedBodies`), their interpolated states are `MovedStates`.
+        '''
+        self.Wait()
+        self.__Accumulator += dt
+        steps = 0
+
+        while self.__Accumulator >= self.FixedTimestep:
+            if steps == self.MaxStepsPerFrame:
+                self.__Accumulator %= self.FixedTimestep
+                break
+
+            if onFixedUpdate is not None: onFixedUpdate(self.FixedTimestep)
+            self.__EndTick()
+
+            # The next tick's `onFixedUpdate` sees this one's state
+            if not self.Threaded:
+                batches, self.__Batches = self.__Batches, []
+                self.__Simulate(batches, steps == 0)
+
+            self.__Accumulator -= self.FixedTimestep
+            steps += 1
+
+        # Read before the next job is submitted, it could publish (and flip `__Front`) before the last job's state is seen.
+        # A state is published once, after that the bodies that moved in its last tick are still interpolated
+        state = self.__Front
+        if state.Sequence != self.__Consumed:
+            self.__Moved, rows = state.Moved, state.MovedRows
+            self.__Contacts = ( state.Contacts, state.ContactBodies )
+        else:
+            self.__Moved, rows = state.Moving, state.MovingRows
+            self.__Contacts = ( state.Contacts[:0], [] )
+
+        self.__Consumed = state.Sequence
+        self.__MovedStates = state.Interpolate(rows, self.Alpha)
 
-        pos, rot, scale = body.Position, body.Rotation, body.Collider.Scale
+        if self.__Batches:
+            batches, self.__Batches = self.__Batches, []
+            if self.__Pool is None: self.__Pool = ThreadPoolExecutor(1, thread_name_prefix="PI-Physics")
+            self.__Job = self.__Pool.submit(self.__Simulate, batches)
+        return self.__Moved
 
+    def Wait(self) -> None:
+        '''Blocks until the scheduled ticks are simulated'''
+        if self.__Job is None: return
+
+        job, self.__Job = self.__Job, None
+        job.result()
+
+    def RayCast(self, origin: pyrr.Vector3, direction: pyrr.Vector3, distance: float=1000.0, layers: int=AllLayers) -> RayHit:
+        '''The closest body of `layers` (a bit per layer) along the ray, None if there is none'''
+        hits = self.RayCastBatch(np.array([ origin ]), np.array([ direction ]), distance, layers)
+        if not hits.Hit[0]: return None
+
+        return RayHit(hits.Bodies[0], pyrr.Vector3(hits.Points[0].tolist()), pyrr.Vector3(hits.Normals[0].tolist()), float(hits.Fractions[0]))
+
+    def RayCastBatch(self, origins: np.ndarray, directions: np.ndarray, distance: Any=1000.0, layers: int=AllLayers) -> RayHits:
+        '''
+        The closest hit of every ray, `origins` and `directions` are (N, 3) and `distance` a length or one per ray.
+        The rays' ends are computed at once, Bullet is then asked about each ray in a single loop, as Panda3D has
+        no batched ray test. Only rays filtered by `layers` ask Bullet for all of their hits.
+        '''
+        self.Wait()
+
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        lengths = np.linalg.norm(directions, axis=1, keepdims=True)
+        ends = origins + directions / np.where(lengths > 0, lengths, 1.0) * np.reshape(distance, ( -1, 1 ))
+
+        hits, world = RayHits(len(origins)), self.__BulletWorld
+        filtered = (layers & PySics.AllLayers) != PySics.AllLayers
+
+        for index, ( start, end ) in enumerate(zip(origins.tolist(), ends.tolist())):
+            if not filtered:
+                result = world.rayTestClosest(Point3(*start), Point3(*end))
+                if not result.hasHit(): continue
+            else:
+                # The closest hit of an allowed layer
+                result = next(( hit for hit in sorted(world.rayTestAll(Point3(*start), Point3(*end)).getHits(),
+                    key=lambda hit: hit.getHitFraction()) if PySics.__InLayers(hit.getNode(), layers) ), None)
+                if result is None: continue
+
+            point, normal = result.getHitPos(), result.getHitNormal()
+            hits.Hit[index], hits.Bodies[index] = True, result.getNode().getPythonTag("Body")
+            hits.Points[index], hits.Normals[index] = ( point.x, point.y, point.z ), ( normal.x, normal.y, normal.z )
+            hits.Fractions[index] = result.getHitFraction()
+
+        return hits
+
+    def SweepTest(self,
+        collider: Collider, start: pyrr.Vector3, end: pyrr.Vector3,
+        rotation: pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]), layers: int=AllLayers
+    ) -> RayHit:
+        '''
+        The first body `collider`'s shape (a convex one) touches, moved from `start` to `end`. None if there is none,
+        or if it is not in `layers`: Bullet only reports the closest body of a sweep.
+        '''
+        if isinstance(collider, PlaneCollider): raise TypeError("Only convex colliders can be swept")
+        self.Wait()
+
+        # The shape comes from the world's shapes, the simulation thread is not using them after `Wait`
+        scale = collider.Scale.tolist() if collider.Scaled else [ 1.0, 1.0, 1.0 ]
+        shape = self.__Shape(collider, scale, False)
+
+        rotation = Vec3(*[ float(value) for value in rotation ])
+        result = self.__BulletWorld.sweepTestClosest(shape,
+            TransformState.make_pos_hpr(Point3(*[ float(value) for value in start ]), rotation),
+            TransformState.make_pos_hpr(Point3(*[ float(value) for value in end ]), rotation)
+        )
+
+        if not result.hasHit() or not PySics.__InLayers(result.getNode(), layers): return None
+
+        point, normal = result.getHitPos(), result.getHitNormal()
+        return RayHit(result.getNode().getPythonTag("Body"),
+            pyrr.Vector3([ point.x, point.y, point.z ]), pyrr.Vector3([ normal.x, normal.y, normal.z ]), result.getHitFraction())
+
+    @staticmethod
+    def __InLayers(node: Any, layers: int) -> bool:
+        body = node.getPythonTag("Body")
+        return body is not None and (layers >> body.Layer) & 1 == 1
+
+    def __EndTick(self) -> None:
+        '''The commands issued until now are applied before the next tick'''
+        for body in self.__Forced.values():
+            self.__Commands.append(( self.__Push, body, body.CentralForce.tolist(), body.CentralTorque.tolist() ))
+            body._SetCentralForce()
+            body._SetCentralTorque()
+
+        self.__Forced = {}
+        self.__Batches.append(self.__Commands)
+        self.__Commands = []
+
+    # Simulation thread
+    def __Simulate(self, batches: List[List[Tuple]], first: bool=True) -> None:
+        '''
+        Simulates the ticks and publishes their state. The ticks of a frame can be simulated a few at a time (inline,
+        one at a time), each state then holds what moved and the contacts since the `first` of them.
+        '''
+        if first:
+            # Bodies that moved in the last tick were rendered in between two ticks, they have to be moved again
+            self.__BatchMoved = dict(self.__Moving)
+            self.__ContactRows, self.__ContactBodies, self.__ContactIndices = [], [], {}
+
+        for commands in batches:
+            self.__Step(commands)
+            self.__BatchMoved.update(self.__Moving)
+
+        self.__Publish(list(self.__BatchMoved.values()))
+
+    def __Step(self, commands: List[Tuple]) -> None:
+        count = len(self.__Bodies)
+        self.__PreviousPositions[:count] = self.__Positions[:count]
+        self.__PreviousRotations[:count] = self.__Rotations[:count]
+
+        for function, *arguments in commands: function(*arguments)
+
+        # Exactly one Bullet step, of the fixed timestep
+        self.__BulletWorld.doPhysics(self.FixedTimestep, 1, self.FixedTimestep)
+        self.__CollectContacts()
+
+        # Sleeping and static bodies did not move, only the others are read back
+        bodies, indices, states = self.__Bodies, [], []
+        for index, node in enumerate(self.__BulletNodes):
+            if not node.isActive() or node.isStatic(): continue
+
+            transform = node.getTransform()
+            pos, hpr, vel = transform.getPos(), transform.getHpr(), node.getLinearVelocity()
+
+            indices.append(index)
+            states.append(( pos.x, pos.y, pos.z, hpr.x, hpr.y, hpr.z, vel.x, vel.y, vel.z ))
+
+        self.__Moving = { id(bodies[index]): bodies[index] for index in indices }
+        states = np.array(states).reshape(-1, 9)
+
+        self.__Positions[indices]  = states[:, 0:3]
+        self.__Rotations[indices]  = states[:, 3:6]
+        self.__Velocities[indices] = states[:, 6:9]
+
+    def __CollectContacts(self) -> None:
+        masks, touching = self.ContactMasks, {}
+
+        for manifold in self.__BulletWorld.getManifolds():
+            count = manifold.getNumManifoldPoints()
+            if count == 0: continue
+
+            a, b = manifold.getNode0().getPythonTag("Body"), manifold.getNode1().getPythonTag("Body")
+            if a is None or b is None or not (masks[a.Layer] >> b.Layer) & 1: continue
+
+            # The deepest point stands for the pair, with the impulse of all of them
+            points = [ manifold.getManifoldPoint(index) for index in range(count) ]
+            deepest = min(points, key=lambda point: point.getDistance())
+            position, normal = deepest.getPositionWorldOnB(), deepest.getNormalWorldOnB()
+
+            key = ( id(a), id(b) ) if id(a) < id(b) else ( id(b), id(a) )
+            touching[key] = ( a, b, ( position.x, position.y, position.z ), ( normal.x, normal.y, normal.z ),
+                sum(point.getAppliedImpulse() for point in points) )
+
+        for key, ( a, b, position, normal, impulse ) in touching.items():
+            event = PhysicsState.ContactEvent.Stay if key in self.__Touching else PhysicsState.ContactEvent.Enter
+            self.__AddContact(event, a, b, position, normal, impulse)
+
+        for key, ( a, b, *_ ) in self.__Touching.items():
+            if key not in touching: self.__AddContact(PhysicsState.ContactEvent.Exit, a, b, ( 0, 0, 0 ), ( 0, 0, 0 ), 0.0)
+
+        self.__Touching = touching
+
+    def __AddContact(self, event: int, a: RigidBody, b: RigidBody, position: Tuple, normal: Tuple, impulse: float) -> None:
+        trigger = a.Collider.IsTrigger or b.Collider.IsTrigger
+        self.__ContactRows.append(( event, trigger, self.__ContactIndex(a), self.__ContactIndex(b), position, normal, impulse ))
+
+    def __ContactIndex(self, body: RigidBody) -> int:
+        index = self.__ContactIndices.get(id(body), None)
+        if index is None:
+            index = self.__ContactIndices[id(body)] = len(self.__ContactBodies)
+            self.__ContactBodies.append(body)
+        return index
+
+    def __Publish(self, moved: List[RigidBody]) -> None:
+        state = self.__States[1] if self.__Front is self.__States[0] else self.__States[0]
+        count = len(self.__Bodies)
+
+        state.Bodies = list(self.__Bodies)
+        state.Positions  = self.__Fill(state.Positions , self.__Positions , count)
+        state.Rotations  = self.__Fill(state.Rotations , self.__Rotations , count)
+        state.Velocities = self.__Fill(state.Velocities, self.__Velocities, count)
+        state.PreviousPositions = self.__Fill(state.PreviousPositions, self.__PreviousPositions, count)
+        state.PreviousRotations = self.__Fill(state.PreviousRotations, self.__PreviousRotations, count)
+
+        # Bodies removed since they moved are left out
+        state.Moved  = [ body for body in moved if body._Node is not None ]
+        state.Moving = list(self.__Moving.values())
+        state.MovedRows, state.MovingRows = [ body._Index for body in state.Moved ], [ body._Index for body in state.Moving ]
+
+        state.Contacts = np.array(self.__ContactRows, dtype=PhysicsState.ContactType)
+        state.ContactBodies = list(self.__ContactBodies)
+
+        # Publishing is a single assignment, the main thread never sees a partly written state
+        state.Sequence = self.__Front.Sequence + 1
+        self.__Front = state
+
+    @staticmethod
+    def __Fill(array: np.ndarray, source: np.ndarray, count: int) -> np.ndarray:
+        if len(array) != count: array = np.empty(( count, 3 ))
+        array[:] = source[:count]
+        return array
+
+    def __Attach(self, body: RigidBody, pos: List[float], rot: List[float], vel: List[float]) -> None:
+        scale = body.Collider.Scale.tolist() if body.Collider.Scaled else [ 1.0, 1.0, 1.0 ]
+
+        node = BulletRigidBodyNode("RB")
         node.setTransform(TransformState.make_pos_hpr_scale(
-            Point3(pos.x, pos.y, pos.z),
-            Vec3(rot.x, rot.y, rot.z),
-            Vec3(scale.x, scale.y, scale.z)
+            Point3(*pos),
+            Vec3(*rot),
+            Vec3(*scale)
         ))
 
-        bounds = body.Collider.Bounds
-        if isinstance(body.Collider, BoxCollider):
-            shape = BulletBoxShape(Vec3(bounds.x, bounds.y, bounds.z))
-        elif isinstance(body.Collider, PlaneCollider):
-            shape = BulletPlaneShape(
-                Vec3(body.Collider.Up.x, body.Collider.Up.y, body.Collider.Up.z),
-                bounds.x
-            )
-
-        node.addShape(shape)
+        node.addShape(self.__Shape(body.Collider, scale, body.IsStatic))
         node.setMass(body.Mass)
 
+        node.setLinearSleepThreshold(self.LinearSleepThreshold)
+        node.setAngularSleepThreshold(self.AngularSleepThreshold)
+        node.setDeactivationTime(self.DeactivationTime)
+
         if body.CCD:
             node.setCcdMotionThreshold(1e-7)
             node.setCcdSweptSphereRadius(0.50)
 
+        # Triggers report contacts, but nothing bounces off them
+        if body.Collider.IsTrigger: node.setCollisionResponse(False)
+        node.setPythonTag("Body", body)      # To find the body of a contact's node
+
         self.__BulletWorld.attachRigidBody(node)
+
+        index = len(self.__Bodies)
+        if index == len(self.__Positions): self.__Grow()
+
+        self.__Positions[index]  = self.__PreviousPositions[index] = pos
+        self.__Rotations[index]  = self.__PreviousRotations[index] = rot
+        self.__Velocities[index] = vel
+
+        self.__Bodies.append(body)
         self.__BulletNodes.append(node)
-        body._Node = node
-        return node
+        body._Node, body._Index = node, index
 
-    def CreateRigidBody(self, mat: PySicsMaterial) -> RigidBody:
-        body = RigidBody(mat)
-        self.AddRigidBody(body)
-        return body
+    def __Shape(self, collider: Collider, scale: List[float], static: bool) -> Any:
+        key = collider.ShapeKey
+        if isinstance(collider, TriangleMeshCollider) and not static: key = ( "ConvexHullCollider", collider.Source.Key )
 
-    def DeleteRigidBody(self, rb: RigidBody) -> None:
-        self.__Bodies.remove(rb)
-        self.__BulletNodes.remove(rb._Node)
+        # Bullet scales the shapes of a body with it, a shape is only shared by bodies of the same scale
+        key = ( *key, *scale )
+
+        shape = self.__Shapes.get(key, None)
+        if shape is None: shape = self.__Shapes[key] = PySics.__BuildShape(collider, static)
+        return shape
+
+    @staticmethod
+    def __BuildShape(collider: Collider, static: bool) -> Any:
+        bounds = collider.Bounds
+
+        if isinstance(collider, BoxCollider): return BulletBoxShape(Vec3(bounds.x, bounds.y, bounds.z))
+        if isinstance(collider, PlaneCollider):
+            return BulletPlaneShape(Vec3(collider.Up.x, collider.Up.y, collider.Up.z), bounds.x)
+
+        if isinstance(collider, SphereCollider)  : return BulletSphereShape(collider.Radius)
+        if isinstance(collider, CapsuleCollider) : return BulletCapsuleShape(collider.Radius, collider.Height, YUp)
+
+        if isinstance(collider, TriangleMeshCollider) and static: return PySics.__TriangleMeshShape(collider.Source)
+
+        # The hull only needs the distinct points
+        positions, _ = collider.Source.Load()
+        shape = BulletConvexHullShape()
+        for point in np.unique(np.asarray(positions, dtype=np.float64), axis=0).tolist(): shape.addPoint(Point3(*point))
+        return shape
+
+    @staticmethod
+    def __TriangleMeshShape(source: Any) -> Any:
+        '''
+        Building the mesh is a call per triangle, the built shape is cached at `source.CachePath`. Bullet's BVH is
+        not part of what Panda3D writes, it is rebuilt (natively) when the shape is read.
+        '''
+        path = source.CachePath
+        if path is not None and os.path.isfile(path):
+            try:
+                with open(path, "rb") as f: return pickle.load(f)
+            except Exception: pass      # An unreadable cache is built again
+
+        positions, indices = source.Load()
+        triangles = np.asarray(positions, dtype=np.float64)[np.asarray(indices, dtype=np.int64)].reshape(-1, 3, 3)
+
+        mesh = BulletTriangleMesh()
+        for a, b, c in triangles.tolist(): mesh.addTriangle(Point3(*a), Point3(*b), Point3(*c))
+        shape = BulletTriangleMeshShape(mesh, dynamic=False)
+
+        if path is not None:
+            temporaryPath = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(temporaryPath, "wb") as f: pickle.dump(shape, f)
+                os.replace(temporaryPath, path)
+            except Exception:
+                if os.path.exists(temporaryPath): os.remove(temporaryPath)
+
+        return shape
+
+    def __Grow(self) -> None:
+        capacity, count = len(self.__Positions) * 2, len(self.__Bodies)
+
+        def Grown(array: np.ndarray) -> np.ndarray:
+            grown = np.zeros(( capacity, 3 ))
+            grown[:count] = array[:count]
+            return grown
+
+        self.__Positions, self.__Rotations, self.__Velocities = \
+            Grown(self.__Positions), Grown(self.__Rotations), Grown(self.__Velocities)
+        self.__PreviousPositions, self.__PreviousRotations = Grown(self.__PreviousPositions), Grown(self.__PreviousRotations)
+
+    def __Remove(self, rb: RigidBody) -> None:
+        if rb._Node is None: return     # Removed before it was attached
+
+        index, last = rb._Index, len(self.__Bodies) - 1
         self.__BulletWorld.removeRigidBody(rb._Node)
+        rb._Node.clearPythonTag("Body")
+        self.__Moving.pop(id(rb), None)
+        rb._Node, rb._Index = None, -1
 
-    def OnSimulationStart(self) -> None: ...
+        # The last body takes the removed one's row
+        if index != last:
+            moved = self.__Bodies[last]
+            self.__Bodies[index], self.__BulletNodes[index] = moved, self.__BulletNodes[last]
+
+            for array in ( self.__Positions, self.__Rotations, self.__Velocities, self.__PreviousPositions, self.__PreviousRotations ):
+                array[index] = array[last]
+            moved._Index = index
 
-    def Update(self, dt: float) -> None:
-        # Set variables
+        self.__Bodies.pop()
+        self.__BulletNodes.pop()
 
-        # Update bullet physics
-        self.__BulletWorld.doPhysics(dt, 10, 1/180)
+    def __Push(self, body: RigidBody, force: List[float], torque: List[float]) -> None:
+        if body._Node is None: return
 
-        # Get variables
-        for pySicsBody, bulletBody in zip(self.__Bodies, self.__BulletNodes):
-            centralForce = pySicsBody.CentralForce
-            bulletBody.applyCentralForce(Vec3(
-                centralForce.x, centralForce.y, centralForce.z
-            ))
-            pySicsBody._SetCentralForce()
+        node = body._Node
+        node.setActive(True)
 
-            vel = bulletBody.getLinearVelocity()
-            pos = bulletBody.getTransform().getPos()
-            rot = bulletBody.getTransform().getHpr()
+        if any(force): node.applyCentralForce(Vec3(*force))
+        if any(torque): node.applyTorque(Vec3(*torque))
 
-            # Velocity
-            pySicsBody.Velocity.x = vel.x
-            pySicsBody.Velocity.y = vel.y
-            pySicsBody.Velocity.z = vel.z
+    def __Place(self, body: RigidBody, position: List[float], rotation: List[float]) -> None:
+        if body._Node is None: return
 
-            # Position
-            pySicsBody.Position.x = pos.x
-            pySicsBody.Position.y = pos.y
-            pySicsBody.Position.z = pos.z
+        index = body._Index
+        self.__Positions[index], self.__Rotations[index] = position, rotation
+        # Not interpolated from where it was
+        self.__PreviousPositions[index], self.__PreviousRotations[index] = position, rotation
 
-            # Rotation
-            pySicsBody.Rotation.x = rot.x
-            pySicsBody.Rotation.y = rot.y
-            pySicsBody.Rotation.z = rot.z
+        node = body._Node
+        node.setTransform(TransformState.make_pos_hpr_scale(
+            Point3(*position), Vec3(*rotation), node.getTransform().getScale()
+        ))
+        node.setActive(True)
 
-    def OnSimulationEnd(self) -> None: ...
+    def OnSimulationEnd(self) -> None:
+        '''Waits for the simulation thread, the world is not stepped again'''
+        self.Wait()
+        if self.__Pool is not None:
+            self.__Pool.shutdown(wait=True)
+            self.__Pool = None
@@ -15,6 +15,7 @@ class PySicsMaterial:
 
     IsStatic : bool
     CCD      : bool
+    Layer    : int
 
     def __init__(self,
         mass     : float=1.0,
@@ -22,7 +23,8 @@ class PySicsMaterial:
         rotation : pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]),
         collider : Collider=None,
         isStatic : bool=False,
-        ccd      : bool=True
+        ccd      : bool=True,
+        layer    : int=0
     ) -> None:
         self.Mass     = mass
 
@@ -32,14 +34,15 @@ class PySicsMaterial:
 
         self.IsStatic = isStatic
         self.CCD      = ccd
+        self.Layer    = layer
 
 class RigidBody:
+    '''
+    While it is in a world (see `PySics.AddRigidBody`), the body's position, rotation and velocity are read from the
+    world's last published state. Otherwise (or until the world published a state with it) the body keeps its own.
+    '''
     Mass: float
 
-    Position: pyrr.Vector3
-    Rotation: pyrr.Vector3
-    Velocity: pyrr.Vector3
-
     Collider: Collider
 
     AllowMovement: pyrr.Vector3
@@ -47,8 +50,17 @@ class RigidBody:
 
     IsStatic : bool
     CCD      : bool
+    Layer    : int      # 0 to 31, which contacts are reported is filtered by layer (see `PySics.SetContactFilter`)
+
+    UserData: Any       # Set by the owner of the body, e.g. the transform the scene copies the body's to
 
-    _Node: Any      # For Book Keeping
+    _Node  : Any        # For Book Keeping, owned by the world's simulation thread
+    _World : Any        # The `PySics` the body is in, if any
+    _Index : int        # The body's row in the world's arrays, owned by the world's simulation thread
+
+    __Position : pyrr.Vector3
+    __Rotation : pyrr.Vector3
+    __Velocity : pyrr.Vector3
 
     __CentralForce: pyrr.Vector3
     __CentralTorque: pyrr.Vector3
@@ -56,9 +68,9 @@ class RigidBody:
     def __init__(self, mat: PySicsMaterial) -> None:
         self.Mass     = mat.Mass
 
-        self.Position = mat.Position
-        self.Rotation = mat.Rotation
-        self.Velocity = pyrr.Vector3([ 0, 0, 0 ])
+        self.__Position = mat.Position
+        self.__Rotation = mat.Rotation
+        self.__Velocity = pyrr.Vector3([ 0, 0, 0 ])
 
         self.Collider = mat.Collider
 
@@ -67,6 +79,10 @@ class RigidBody:
 
         self.IsStatic = mat.IsStatic
         self.CCD = mat.CCD
+        self.Layer = mat.Layer
+
+        self.UserData = None
+        self._Node, self._World, self._Index = None, None, -1
 
         self.__CentralForce  = pyrr.Vector3([ 0, 0, 0 ])
         self.__CentralTorque = pyrr.Vector3([ 0, 0, 0 ])
@@ -89,13 +105,43 @@ class RigidBody:
 
         return s
 
+    def __State(self, index: int, own: pyrr.Vector3) -> pyrr.Vector3:
+        state = self._World._State(self) if self._World is not None else None
+        return own if state is None else pyrr.Vector3(state[index].tolist())
+
+    @property
+    def Position(self) -> pyrr.Vector3: return self.__State(0, self.__Position)
+    @property
+    def Rotation(self) -> pyrr.Vector3: return self.__State(1, self.__Rotation)
+    @property
+    def Velocity(self) -> pyrr.Vector3: return self.__State(2, self.__Velocity)
+
+    def SetPosition(self, position: pyrr.Vector3) -> None:
+        if self._World is None: self.__Position = position
+        else: self._World._Teleport(self, position, self.Rotation)
+
+    def SetRotation(self, rotation: pyrr.Vector3) -> None:
+        if self._World is None: self.__Rotation = rotation
+        else: self._World._Teleport(self, self.Position, rotation)
+
+    def _Detach(self) -> None:
+        '''Called by the world when the body is removed from it, the body keeps its last published state'''
+        self.__Position, self.__Rotation, self.__Velocity = self.Position, self.Rotation, self.Velocity
+        self._World = None
+
     @property
     def CentralForce  (self) -> pyrr.Vector3: return self.__CentralForce
     @property
     def CentralTorque (self) -> pyrr.Vector3: return self.__CentralTorque
 
-    def ApplyCentralForce  (self, force  : pyrr.Vector3) -> None: self.__CentralForce  = self.__CentralForce  + force
-    def ApplyCentralTorque (self, torque : pyrr.Vector3) -> None: self.__CentralTorque = self.__CentralTorque + torque
+    # The world applies them before its next step
+    def ApplyCentralForce(self, force: pyrr.Vector3) -> None:
+        self.__CentralForce = self.__CentralForce + force
+        if self._World is not None: self._World._QueueForce(self)
+
+    def ApplyCentralTorque(self, torque: pyrr.Vector3) -> None:
+        self.__CentralTorque = self.__CentralTorque + torque
+        if self._World is not None: self._World._QueueForce(self)
 
     def _SetCentralForce  (self, force  : pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ])): self.__CentralForce  = force
     def _SetCentralTorque (self, torque : pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ])): self.__CentralTorque = torque
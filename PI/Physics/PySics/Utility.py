@@ -1,9 +1,14 @@
-from panda3d.bullet import BulletWorld, BulletRigidBodyNode, BulletBoxShape, BulletPlaneShape
-from panda3d.core   import Vec3, Point3, TransformState, VBase3, Vec4, LQuaternion, Quat, BitMask32
+from panda3d.bullet import BulletWorld, BulletRigidBodyNode, BulletBoxShape, BulletPlaneShape, BulletSphereShape, \
+    BulletCapsuleShape, BulletConvexHullShape, BulletTriangleMesh, BulletTriangleMeshShape, YUp
+from panda3d.core   import Vec3, Point3, TransformState, VBase3, Vec4, LQuaternion, Quat, BitMask32, \
+    loadPrcFileData, unloadPrcFile
 
+import numpy as np
 import pyrr, math
+import pickle
+import os
 
-from typing import List, Tuple, Any
+from typing import Callable, Dict, List, Tuple, Any
 
 from math import radians as ToRadians
 from math import degrees as ToDegrees
@@ -1,29 +1,48 @@
 from ...Renderer.Buffer import VertexBuffer, IndexBuffer, BufferLayout
+from ...Renderer.UploadQueue import UploadQueue
 
-from OpenGL.GL import glGenBuffers, glBufferData, glDeleteBuffers, glBindBuffer, glBufferSubData
+from OpenGL.GL import glGenBuffers, glBufferData, glDeleteBuffers, glBindBuffer, glBufferSubData, glNamedBufferSubData
 from OpenGL.GL import GL_ARRAY_BUFFER, GL_STATIC_DRAW, GL_ELEMENT_ARRAY_BUFFER, GL_DYNAMIC_DRAW
+from OpenGL.GL import GL_UNSIGNED_SHORT, GL_UNSIGNED_INT
 
 import ctypes
 import numpy as np
 from multipledispatch import dispatch
 
+def _StreamBuffer(buffer, rendererID: int, data: np.ndarray) -> UploadQueue.Upload:
+    '''Submits the contents of the (already allocated) buffer to the UploadQueue, as rows of 1 byte'''
+    data = data.reshape(-1).view(np.uint8)
+
+    # Direct state access: binding the buffer could change the vertex array that is bound
+    def write(first: int, count: int) -> None: glNamedBufferSubData(rendererID, first, count, data[first:first + count])
+    return UploadQueue.Submit(buffer, [ (data.nbytes, 1, write) ])
+
 class OpenGLVertexBuffer(VertexBuffer):
     __slots__ = "__RendererID", "__itemsize", \
-        "__Layout"
+        "__Layout", "__Size", "__Upload", "__weakref__"
 
-    @dispatch(list)
-    def __init__(self, vertices: list) -> None:
-        vertices: np.ndarray = np.array(vertices, dtype=np.float32)
+    @dispatch((list, np.ndarray))
+    def __init__(self, vertices: list, streamed: bool=False) -> None:
+        # Float32 arrays are uploaded without a copy
+        vertices: np.ndarray = np.ascontiguousarray(vertices, dtype=np.float32)
         self.__itemsize = vertices.itemsize
+        self.__Size = vertices.nbytes
+        self.__Upload: UploadQueue.Upload = None
 
         self.__RendererID = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.__RendererID)
-        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+
+        if not streamed: glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        else:
+            glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, ctypes.c_void_p(None), GL_STATIC_DRAW)
+            self.__Upload = _StreamBuffer(self, self.__RendererID, vertices)
 
     @dispatch(int)
     def __init__(self, size: int) -> None:
         vertices = np.zeros((size,))
         self.__itemsize = size
+        self.__Size = vertices.nbytes
+        self.__Upload: UploadQueue.Upload = None
 
         self.__RendererID = glGenBuffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, self.__RendererID)
@@ -40,6 +59,14 @@ class OpenGLVertexBuffer(VertexBuffer):
     def RendererID(self) -> int:
         return self.__RendererID
 
+    @property
+    def Size(self) -> int:
+        return self.__Size
+
+    @property
+    def IsResident(self) -> bool:
+        return self.__Upload is None or self.__Upload.IsDone
+
     def Bind(self) -> None:
         glBindBuffer(GL_ARRAY_BUFFER, self.__RendererID)
 
@@ -60,14 +87,28 @@ class OpenGLVertexBuffer(VertexBuffer):
 class OpenGLIndexBuffer(IndexBuffer):
     __RendererID : int
     __Count      : int
+    __DataType   : int
+    __Size       : int
+    __Upload     : UploadQueue.Upload = None
+
+    def __init__(self, indices: list, streamed: bool=False) -> None:
+        if isinstance(indices, np.ndarray) and indices.dtype == np.uint16:
+            indices: np.ndarray = np.ascontiguousarray(indices)
+            self.__DataType = GL_UNSIGNED_SHORT
+        else:
+            indices: np.ndarray = np.ascontiguousarray(indices, dtype=np.uint32)
+            self.__DataType = GL_UNSIGNED_INT
 
-    def __init__(self, indices: list) -> None:
-        indices: np.ndarray = np.array(indices, dtype=np.uint32)
         self.__Count = len(indices)
+        self.__Size = indices.nbytes
 
         self.__RendererID = glGenBuffers(1)
         self.Bind()
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+
+        if not streamed: glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        else:
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, ctypes.c_void_p(None), GL_STATIC_DRAW)
+            self.__Upload = _StreamBuffer(self, self.__RendererID, indices)
 
     def __del__(self) -> None:
         glDeleteBuffers(1, [self.__RendererID])
@@ -80,6 +121,18 @@ class OpenGLIndexBuffer(IndexBuffer):
     def Count(self) -> int:
         return self.__Count
 
+    @property
+    def DataType(self) -> int:
+        return self.__DataType
+
+    @property
+    def Size(self) -> int:
+        return self.__Size
+
+    @property
+    def IsResident(self) -> bool:
+        return self.__Upload is None or self.__Upload.IsDone
+
     def Bind(self) -> None:
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.__RendererID)
 
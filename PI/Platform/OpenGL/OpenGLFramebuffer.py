@@ -1,61 +1,16 @@
 from ...Logging import PI_CORE_ASSERT, PI_CORE_WARN
-from ...Renderer import Framebuffer, TextureFormat, TextureSpecification
+from ...Renderer import Framebuffer, TextureFormat, TextureSpecification, RenderTargetPool
 from ...Core.Constants import *
 
 from OpenGL.GL import *
 
+from time   import perf_counter
 from typing import List  as _List
+from typing import Tuple as _Tuple
 
 class Utils:
     @staticmethod
     def TextureTarget(multisampled: bool) -> int: return GL_TEXTURE_2D_MULTISAMPLE if multisampled else GL_TEXTURE_2D
-    
-    @staticmethod
-    def CreateTextures(multisampled: bool, count: int) -> int:
-        texture = glGenTextures(count)
-
-        if count == 1: texture = [texture]
-        else: texture = list(texture)
-
-        return texture
-
-    @staticmethod
-    def BindTexture(multisampled: bool, id: int) -> None: glBindTexture(Utils.TextureTarget(multisampled), id)
-
-    @staticmethod
-    def AttachColorTexture(id: int, samples: int, internalFormat: int, format: int, width: int, height: int, index: int):
-        multisampled: bool = samples > 1
-        if multisampled:
-            glTexImage2DMultisample(GL_TEXTURE_2D_MULTISAMPLE, samples, internalFormat, width, height, GL_FALSE)
-        else:
-            glTexImage2D(GL_TEXTURE_2D, 0, internalFormat, width, height, 0, format, GL_UNSIGNED_BYTE, None)
-
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-
-        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + index, Utils.TextureTarget(multisampled), id, 0)
-
-    @staticmethod
-    def AttachDepthTexture(id: int, samples: int, format: int, attachmentType: int, width: int, height: int):
-        width = int(width)
-        height = int(height)
-
-        multisampled: bool = samples > 1
-        if multisampled:
-            glTexImage2DMultisample(GL_TEXTURE_2D_MULTISAMPLE, samples, format, width, height, GL_FALSE)
-        else:
-            glTexStorage2D(GL_TEXTURE_2D, 1, format, width, height)
-
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-
-        glFramebufferTexture2D(GL_FRAMEBUFFER, attachmentType, Utils.TextureTarget(multisampled), id, 0)
 
     def IsDepthFormat(format: int):
         if format == TextureFormat.DEPTH24STENCIL8: return True
@@ -70,6 +25,10 @@ class Utils:
 
 _MaxFramebufferSize : int = 8192
 
+# When a resize does not fit in the current attachments they are grown by this factor,
+# so that dragging a dock splitter does not reallocate every frame.
+_ResizeHeadroom : float = 1.25
+
 class OpenGLFramebuffer(Framebuffer):
     __Specs: Framebuffer.Specs
 
@@ -81,6 +40,12 @@ class OpenGLFramebuffer(Framebuffer):
     
     __RendererID: int
 
+    __AllocatedWidth  : int
+    __AllocatedHeight : int
+
+    __ResizePending  : bool
+    __LastResizeTime : float
+
     def __init__(self, specs: Framebuffer.Specs) -> None:
         self.__Specs = specs
 
@@ -88,6 +53,12 @@ class OpenGLFramebuffer(Framebuffer):
         self.__ColorAttachmentsSpecs = []
         self.__ColorAttachments = []
 
+        self.__AllocatedWidth  = 0
+        self.__AllocatedHeight = 0
+
+        self.__ResizePending  = False
+        self.__LastResizeTime = 0.0
+
         for attachment in specs.AttachmentSpecification.Attachments:
             if not Utils.IsDepthFormat(attachment.TextureFormat):
                 self.__ColorAttachmentsSpecs.append(attachment)
@@ -96,42 +67,35 @@ class OpenGLFramebuffer(Framebuffer):
 
         self.Invalidate()
 
-    def Invalidate(self) -> None:
-        if self.__RendererID:
-            glDeleteFramebuffers(1, [self.__RendererID])
-            glDeleteTextures(self.__ColorAttachments)
-            glDeleteTextures([self.__DepthAttachment])
+    def __ReleaseAttachments(self) -> None:
+        for attachment in self.__ColorAttachments: RenderTargetPool.Release(attachment)
+        if self.__DepthAttachment: RenderTargetPool.Release(self.__DepthAttachment)
 
-            self.__ColorAttachments = []
-            self.__DepthAttachment = 0
+        self.__ColorAttachments = []
+        self.__DepthAttachment = 0
 
-        self.__RendererID = glGenFramebuffers(1)
-        glBindFramebuffer(GL_FRAMEBUFFER, self.__RendererID)
+    def Invalidate(self, width: int=None, height: int=None) -> None:
+        '''(Re)attaches targets of the given size (defaults to the size in the specs) from the RenderTargetPool'''
+        width  = int(self.__Specs.Width  if width  is None else width )
+        height = int(self.__Specs.Height if height is None else height)
 
-        multisample = self.__Specs.Samples > 1
+        self.__ReleaseAttachments()
 
-        # Attachments
-        if len(self.__ColorAttachmentsSpecs):
-            self.__ColorAttachments = Utils.CreateTextures(multisample, len(self.__ColorAttachmentsSpecs))
-
-            for attachment, spec in zip(self.__ColorAttachments, self.__ColorAttachmentsSpecs):
-                Utils.BindTexture(multisample, attachment)
+        if not self.__RendererID: self.__RendererID = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.__RendererID)
 
-                if spec.TextureFormat == TextureFormat.RGBA8:
-                    Utils.AttachColorTexture(attachment, self.__Specs.Samples, GL_RGBA8, GL_RGBA,
-                        self.__Specs.Width, self.__Specs.Height, self.__ColorAttachmentsSpecs.index(spec))
+        samples = self.__Specs.Samples
+        target  = Utils.TextureTarget(samples > 1)
 
-                elif spec.TextureFormat == TextureFormat.RED_INTEGER:
-                    Utils.AttachColorTexture(attachment, self.__Specs.Samples, GL_R32I, GL_RED_INTEGER,
-                        self.__Specs.Width, self.__Specs.Height, self.__ColorAttachmentsSpecs.index(spec))
+        # Attachments
+        for index, spec in enumerate(self.__ColorAttachmentsSpecs):
+            attachment = RenderTargetPool.Acquire(spec.TextureFormat, width, height, samples)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + index, target, attachment, 0)
+            self.__ColorAttachments.append(attachment)
 
         if self.__DepthAttachmentSpecs.TextureFormat != TextureFormat.NULL:
-            self.__DepthAttachment = Utils.CreateTextures(multisample, 1)[0]
-            Utils.BindTexture(multisample, self.__DepthAttachment)
-
-            if self.__DepthAttachmentSpecs.TextureFormat == TextureFormat.DEPTH24STENCIL8:
-                Utils.AttachDepthTexture(self.__DepthAttachment, self.__Specs.Samples, GL_DEPTH24_STENCIL8,
-                    GL_DEPTH_STENCIL_ATTACHMENT, self.__Specs.Width, self.__Specs.Height)
+            self.__DepthAttachment = RenderTargetPool.Acquire(self.__DepthAttachmentSpecs.TextureFormat, width, height, samples)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_DEPTH_STENCIL_ATTACHMENT, target, self.__DepthAttachment, 0)
 
         if len(self.__ColorAttachments) > 1:
             PI_CORE_ASSERT(len(self.__ColorAttachments) <= 4, "There can be atmost 4 color attachment")
@@ -145,15 +109,31 @@ class OpenGLFramebuffer(Framebuffer):
         PI_CORE_ASSERT(glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE, "Framebuffer is incomplete!")
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
 
+        self.__AllocatedWidth  = width
+        self.__AllocatedHeight = height
+        self.__ResizePending   = False
+
     def Resize(self, width: int, height: int) -> None:
         if width == 0 or height == 0 or width > _MaxFramebufferSize or height > _MaxFramebufferSize:
             PI_CORE_WARN("Attempting to resize framebuffer to {}, {}", width, height)
             return
 
-        self.__Specs.Width  = width
-        self.__Specs.Height = height
+        self.__Specs.Width  = width  = int(width)
+        self.__Specs.Height = height = int(height)
 
-        self.Invalidate()
+        if self.__Specs.ResizeDebounce <= 0.0:
+            self.Invalidate()
+            return
+
+        # Until the size settles we render into a sub-viewport of the (larger) cached attachments
+        if width > self.__AllocatedWidth or height > self.__AllocatedHeight:
+            self.Invalidate(
+                min(max(int(width  * _ResizeHeadroom), self.__AllocatedWidth ), _MaxFramebufferSize),
+                min(max(int(height * _ResizeHeadroom), self.__AllocatedHeight), _MaxFramebufferSize)
+            )
+
+        self.__ResizePending  = (width, height) != (self.__AllocatedWidth, self.__AllocatedHeight)
+        self.__LastResizeTime = perf_counter()
 
     def ReadPixel(self, attachmentIndex: int, x: int, y: int) -> None:
         PI_CORE_ASSERT(attachmentIndex < len(self.__ColorAttachments), "Index must be less than attachments length")
@@ -165,11 +145,16 @@ class OpenGLFramebuffer(Framebuffer):
     def Attachments(self) -> _List[int]: return self.__ColorAttachments
     @property
     def Spec(self) -> Framebuffer.Specs: return self.__Specs
+    @property
+    def ViewportUV(self) -> _Tuple[float, float]:
+        return self.__Specs.Width / self.__AllocatedWidth, self.__Specs.Height / self.__AllocatedHeight
 
     def GetColorAttachment(self, index=0) -> int:
         PI_CORE_ASSERT(index < len(self.__ColorAttachments), "Index must be less than attachments length")
         return self.__ColorAttachments[index]
 
+    def GetDepthAttachment(self) -> int: return self.__DepthAttachment
+
     def ClearAttachment(self, attachmentIndex: int, value: bytes) -> bytes:
         PI_CORE_ASSERT(attachmentIndex < len(self.__ColorAttachments), "Cannot generate Framebuffer with no attachments")
 
@@ -178,12 +163,14 @@ class OpenGLFramebuffer(Framebuffer):
             Utils.PIFBTextureFormatToGL(spec.TextureFormat), GL_INT, value)
 
     def Bind(self) -> None:
+        if self.__ResizePending and perf_counter() - self.__LastResizeTime >= self.__Specs.ResizeDebounce:
+            self.Invalidate()
+
         if not self.__Specs.SwapChainTarget: glBindFramebuffer(GL_FRAMEBUFFER, self.__RendererID)
         else: glBindFramebuffer(GL_FRAMEBUFFER, 0)
 
     def Unbind(self) -> None: glBindFramebuffer(GL_FRAMEBUFFER, 0)
 
     def __del__(self) -> None:
+        self.__ReleaseAttachments()
         glDeleteFramebuffers(1, [self.__RendererID])
-        glDeleteTextures(self.__ColorAttachments)
-        glDeleteTextures([self.__DepthAttachment])
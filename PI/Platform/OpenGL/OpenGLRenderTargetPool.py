@@ -0,0 +1,48 @@
+from ...Logging import PI_CORE_ASSERT
+from ...Renderer.Texture import TextureFormat
+
+from OpenGL.GL import glGenTextures, glBindTexture, glDeleteTextures, glTexImage2D, glTexStorage2D, \
+                      glTexImage2DMultisample, glTexParameteri
+from OpenGL.GL import GL_TEXTURE_2D, GL_TEXTURE_2D_MULTISAMPLE, GL_FALSE, GL_UNSIGNED_BYTE, \
+                      GL_RGBA8, GL_RGBA, GL_R32I, GL_RED_INTEGER, GL_DEPTH24_STENCIL8, \
+                      GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER, GL_LINEAR, GL_CLAMP_TO_EDGE, \
+                      GL_TEXTURE_WRAP_R, GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T
+
+class OpenGLRenderTargetPool:
+    @staticmethod
+    def TextureTarget(samples: int) -> int: return GL_TEXTURE_2D_MULTISAMPLE if samples > 1 else GL_TEXTURE_2D
+
+    @staticmethod
+    def Allocate(textureFormat: int, width: int, height: int, samples: int) -> int:
+        target = OpenGLRenderTargetPool.TextureTarget(samples)
+
+        rendererID = glGenTextures(1)
+        glBindTexture(target, rendererID)
+
+        if   textureFormat == TextureFormat.RGBA8           : internalFormat, dataFormat = GL_RGBA8, GL_RGBA
+        elif textureFormat == TextureFormat.RED_INTEGER     : internalFormat, dataFormat = GL_R32I, GL_RED_INTEGER
+        elif textureFormat == TextureFormat.DEPTH24STENCIL8 : internalFormat, dataFormat = GL_DEPTH24_STENCIL8, None
+        else:
+            PI_CORE_ASSERT(False, "Invalid render target format.")
+            return 0
+
+        if samples > 1:
+            glTexImage2DMultisample(GL_TEXTURE_2D_MULTISAMPLE, samples, internalFormat, width, height, GL_FALSE)
+        else:
+            if dataFormat is None: glTexStorage2D(GL_TEXTURE_2D, 1, internalFormat, width, height)
+            else: glTexImage2D(GL_TEXTURE_2D, 0, internalFormat, width, height, 0, dataFormat, GL_UNSIGNED_BYTE, None)
+
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_R, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+
+        glBindTexture(target, 0)
+        return rendererID
+
+    @staticmethod
+    def Free(rendererID: int) -> None:
+        from .OpenGLRendererAPI import OpenGLRendererAPI
+        OpenGLRendererAPI._ForgetRenderTarget(rendererID)
+        glDeleteTextures([rendererID])
@@ -1,16 +1,26 @@
 from ...Renderer import RendererAPI
 
+from ...Logging  import PI_CORE_ASSERT
+
 from OpenGL.GL import glClear, glClearColor, glDrawElements, glDrawArrays, glEnable, glBlendFunc, glViewport, \
-                      glCullFace, glFrontFace
+                      glCullFace, glFrontFace, glDepthFunc, glDepthMask, \
+                      glGenFramebuffers, glDeleteFramebuffers, glBindFramebuffer, glFramebufferTexture2D, \
+                      glDrawBuffers, glDrawBuffer, glCheckFramebufferStatus, glGetIntegerv
 from OpenGL.GL import GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, GL_TRIANGLES, GL_LINES, \
                       GL_UNSIGNED_INT, GL_DEPTH_TEST, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, \
-                      GL_CULL_FACE, GL_FRONT, GL_BACK, GL_FRONT_AND_BACK, GL_CW, GL_CCW
+                      GL_CULL_FACE, GL_FRONT, GL_BACK, GL_FRONT_AND_BACK, GL_CW, GL_CCW, \
+                      GL_FRAMEBUFFER, GL_FRAMEBUFFER_COMPLETE, GL_COLOR_ATTACHMENT0, GL_DEPTH_STENCIL_ATTACHMENT, \
+                      GL_TEXTURE_2D, GL_TEXTURE_2D_MULTISAMPLE, GL_NONE, GL_VIEWPORT, GL_LEQUAL, GL_TRUE, GL_FALSE
 
 from ctypes import c_void_p
+from typing import Dict, List, Tuple
 
 class OpenGLRendererAPI(RendererAPI):
     __ClearFlags: int = 0
 
+    # Framebuffer objects used to bind arbitrary render targets, keyed by (colors, depth, samples)
+    __RenderTargetFramebuffers: Dict[Tuple[Tuple[int, ...], int, int], int] = {}
+
     @staticmethod
     def SetClearColor(*args) -> None:
         glClearColor(*args)
@@ -18,16 +28,20 @@ class OpenGLRendererAPI(RendererAPI):
 
     @staticmethod
     def Clear() -> None: glClear(OpenGLRendererAPI.__ClearFlags)
+    @staticmethod
+    def ClearColor() -> None: glClear(GL_COLOR_BUFFER_BIT)
+    @staticmethod
+    def ClearDepth() -> None: glClear(GL_DEPTH_BUFFER_BIT)
 
     @staticmethod
     def DrawIndexed(vertexArray, indices: int=None) -> None:
         vertexArray.Bind()
 
         if indices is None:
-            glDrawElements(GL_TRIANGLES, vertexArray.IndexBuffer.Count, GL_UNSIGNED_INT, c_void_p(0))
+            glDrawElements(GL_TRIANGLES, vertexArray.IndexBuffer.Count, vertexArray.IndexBuffer.DataType, c_void_p(0))
             return
             
-        glDrawElements(GL_TRIANGLES, indices, GL_UNSIGNED_INT, c_void_p(0))
+        glDrawElements(GL_TRIANGLES, indices, vertexArray.IndexBuffer.DataType, c_void_p(0))
 
     @staticmethod
     def DrawLines(vertexArray, indices: int) -> None:
@@ -36,12 +50,20 @@ class OpenGLRendererAPI(RendererAPI):
 
     @staticmethod
     def Resize(x: int, y: int, width: int, height: int) -> None: glViewport(int(x), int(y), int(width), int(height))
+    @staticmethod
+    def GetViewport() -> tuple: return tuple(int(value) for value in glGetIntegerv(GL_VIEWPORT))
 
     @staticmethod
     def EnableDepth() -> None:
         glEnable(GL_DEPTH_TEST)
         OpenGLRendererAPI.__ClearFlags |= GL_DEPTH_BUFFER_BIT
 
+        # Passes after a depth pre-pass draw the same surfaces again, at the depth it wrote
+        glDepthFunc(GL_LEQUAL)
+
+    @staticmethod
+    def SetDepthWrite(enabled: bool) -> None: glDepthMask(GL_TRUE if enabled else GL_FALSE)
+
     @staticmethod
     def EnableBlending() -> None:
         glEnable(GL_BLEND)
@@ -52,3 +74,42 @@ class OpenGLRendererAPI(RendererAPI):
         glEnable(GL_CULL_FACE)
         glCullFace(GL_BACK)
         glFrontFace(GL_CCW)
+
+    @staticmethod
+    def BindRenderTargets(colorAttachments: List[int], depthAttachment: int=0, samples: int=1) -> None:
+        key = (tuple(colorAttachments), depthAttachment, samples)
+        framebuffer = OpenGLRendererAPI.__RenderTargetFramebuffers.get(key, None)
+
+        if framebuffer is not None:
+            glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+            return
+
+        framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+
+        # A 0 leaves the attachment empty, what the shaders write to it is dropped
+        target = GL_TEXTURE_2D_MULTISAMPLE if samples > 1 else GL_TEXTURE_2D
+        for index, attachment in enumerate(colorAttachments):
+            if attachment: glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0 + index, target, attachment, 0)
+
+        if depthAttachment:
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_DEPTH_STENCIL_ATTACHMENT, target, depthAttachment, 0)
+
+        if not any(colorAttachments): glDrawBuffer(GL_NONE)
+        else: glDrawBuffers(len(colorAttachments), [
+            GL_COLOR_ATTACHMENT0 + i if attachment else GL_NONE for i, attachment in enumerate(colorAttachments)
+        ])
+
+        PI_CORE_ASSERT(glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE, "Framebuffer is incomplete!")
+        OpenGLRendererAPI.__RenderTargetFramebuffers[key] = framebuffer
+
+    @staticmethod
+    def UnbindRenderTargets() -> None: glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    @staticmethod
+    def _ForgetRenderTarget(rendererID: int) -> None:
+        '''Deletes the cached framebuffers that have the (freed) texture attached'''
+        framebuffers = OpenGLRendererAPI.__RenderTargetFramebuffers
+
+        for key in [ key for key in framebuffers.keys() if rendererID in key[0] or rendererID == key[1] ]:
+            glDeleteFramebuffers(1, [ framebuffers.pop(key) ])
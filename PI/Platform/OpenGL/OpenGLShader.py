@@ -1,4 +1,4 @@
-from ...Logging import PI_CORE_ASSERT, PI_CORE_WARN
+from ...Logging import PI_CORE_ASSERT, PI_CORE_WARN, PI_CORE_ERROR
 from ...Renderer import PI_DEBUG, StateManager, Shader
 
 from OpenGL.GL import glDeleteProgram, glUseProgram,\
@@ -14,10 +14,6 @@ class OpenGLShader(Shader):
 
     def __init__(self, shaderFile: str) -> None:
         self._Path = shaderFile
-        
-        src = ""
-        with open(shaderFile, 'r') as file: src = file.read()
-        src = src.split('\n')
 
         slashIndex = shaderFile.rfind("\\")
         if slashIndex == -1: slashIndex = shaderFile.rfind("/")
@@ -27,6 +23,15 @@ class OpenGLShader(Shader):
         if   dotIndex != -1: self.__Name = shaderFile [ slashIndex+1:dotIndex ]  # Has file extension
         else               : self.__Name = shaderFile [ slashIndex+1:         ]  # Does not have file extension
 
+        self.__RendererID = OpenGLShader.__Compile(shaderFile)
+        self.__UniformLocations: dict = {}
+
+    @staticmethod
+    def __Compile(shaderFile: str) -> int:
+        src = ""
+        with open(shaderFile, 'r') as file: src = file.read()
+        src = src.split('\n')
+
         currentShaderType = -1
         currentCode = []
         codes = []
@@ -63,8 +68,7 @@ class OpenGLShader(Shader):
             PI_CORE_WARN("Older version of GLSL ({1} {2}) used in Shader: {0}", shaderFile, version, shaderVersionType)
             PI_CORE_WARN("Use GLSL version 450 core or higher")
 
-        self.__RendererID = compileProgram(*codes)
-        self.__UniformLocations: dict = {}
+        return compileProgram(*codes)
 
     @staticmethod
     def StrToGLShaderType(_str: str) -> int:
@@ -90,6 +94,18 @@ class OpenGLShader(Shader):
     def __del__ (self) -> None: glDeleteProgram(self.__RendererID)
     def Unbind  (self) -> None: glUseProgram(0)
     
+    def Reload(self) -> bool:
+        # A file that is still being written can fail in any way, the shader keeps working with its old program
+        try: rendererID = OpenGLShader.__Compile(self._Path)
+        except Exception as e:
+            PI_CORE_ERROR("Failed to reload Shader: {} ({})", self._Path, e)
+            return False
+
+        glDeleteProgram(self.__RendererID)
+        self.__RendererID = rendererID
+        self.__UniformLocations.clear()
+        return True
+
     def Bind    (self) -> None:
         if PI_DEBUG: StateManager.Stats.Shaders.ShadersBinded += 1
         glUseProgram(self.__RendererID)
@@ -1,34 +1,46 @@
 from ...Logging import PI_CORE_ASSERT, PI_CLIENT_ERROR
 from ...Renderer import Texture2D, RenderCommand, TextureSpecification
+from ...Renderer.TextureLoader import TextureLoader
+from ...Renderer.TextureResidency import TextureResidency
+from ...Renderer.MipChain import MipChain
+from ...Renderer.UploadQueue import UploadQueue
 from ...Core.Constants import *
 
 from OpenGL.GL import glGenTextures, glBindTextureUnit, glTextureSubImage2D, glTextureParameteri, glTextureStorage2D,\
-                      glBindTexture, glTexImage2D, glTexStorage2D, glDeleteTextures
+                      glBindTexture, glTexImage2D, glTexStorage2D, glDeleteTextures, glCopyImageSubData
 
 from OpenGL.GL import GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, \
                       GL_TEXTURE_MIN_FILTER, GL_TEXTURE_MAG_FILTER
 
 from multipledispatch import dispatch
 from random import randrange
+from typing import Callable, List, Tuple
 from PIL import Image
+import numpy as np
 
 class OpenGLTexture2D(Texture2D):
     __slots__ = "__RendererID", "__Width", "__Height", \
         "__Format", "__DataType", \
-        "__Path", "__Name"
+        "__Path", "__Name", "__Loaded", \
+        "__MipChain", "__ResidentLevel", "__Upload"
+
+    __Placeholder = None
 
     @dispatch(str, TextureSpecification)
     def __init__(self, path: str, spec: TextureSpecification) -> None:
         self.__RendererID = None
+        self.__Loaded = False
+        self.__MipChain: MipChain = None
+        self.__ResidentLevel = 0
+        self.__Upload: UploadQueue.Upload = None
 
         self.__Path = path
         try:
+            # Only reads the header, the pixels are decoded by `TextureLoader.Decode`
             image = Image.open(path)
         except FileNotFoundError as e:
             PI_CLIENT_ERROR("File: {} Not Found!!", path)
             raise e
-        image = image.transpose(Image.FLIP_TOP_BOTTOM)
-        imageByte = image.convert("RGBA").tobytes()
 
         self.__Width = image.width
         self.__Height = image.height
@@ -43,30 +55,162 @@ class OpenGLTexture2D(Texture2D):
         else:
             self.__Name = path[slashIndex+1:]
         
-        self.__RendererID = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, self.__RendererID)
         self.__Specification: TextureSpecification = spec
 
-        glTextureStorage2D(self.__RendererID, 1, spec.TextureSize, image.width, image.height)
+        if spec.AsyncLoad: TextureLoader.Submit(self, path, image, spec)
+        else: self._OnDecoded(TextureLoader.Load(path, image, spec))
 
-        glTextureParameteri(self.__RendererID, GL_TEXTURE_WRAP_S, spec.WrapS)
-        glTextureParameteri(self.__RendererID, GL_TEXTURE_WRAP_T, spec.WrapT)
+    def Reload(self) -> None:
+        '''Decodes the image again (e.g. after it changed on disk), the old pixels are shown till the new ones are uploaded'''
+        if not self.__Path: return
 
-        glTextureParameteri(self.__RendererID, GL_TEXTURE_MIN_FILTER, spec.MinFilter)
-        glTextureParameteri(self.__RendererID, GL_TEXTURE_MAG_FILTER, spec.MagFilter)
+        try: image = Image.open(self.__Path)
+        except OSError as e:
+            PI_CLIENT_ERROR("Failed to reload Texture: {} ({})", self.__Path, e)
+            return
 
-        glTextureSubImage2D(
-            self.__RendererID,
-            0, 0, 0, image.width, image.height, spec.TextureFormat, 
-            spec.DataType, imageByte
-        )
+        spec = self.__Specification
+        if spec.AsyncLoad: TextureLoader.Submit(self, self.__Path, image, spec)
+        else: self._OnDecoded(TextureLoader.Load(self.__Path, image, spec))
+
+    def _OnDecoded(self, result) -> None:
+        # Reloaded while the previous image was being uploaded
+        if self.__Upload is not None: self.__Upload.Cancel()
+        self.__Upload = None
+
+        spec = self.__Specification
+
+        if isinstance(result, MipChain):
+            # Reloaded: the resident levels are of the old image (still drawn until the new one is resident)
+            reloaded = self.__Loaded
+
+            self.__MipChain = result
+            self.__Width, self.__Height = result.Size(0)
+
+            self._MakeResident(TextureResidency.InitialLevel(self.MipLevelSizes), immediate=not spec.AsyncLoad, reloaded=reloaded)
+            TextureResidency.Register(self)
+            return
+
+        pixels: np.ndarray = result
+        height, width = pixels.shape[:2]
+
+        rendererID = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, rendererID)
+
+        glTextureStorage2D(rendererID, 1, spec.TextureSize, width, height)
+
+        glTextureParameteri(rendererID, GL_TEXTURE_WRAP_S, spec.WrapS)
+        glTextureParameteri(rendererID, GL_TEXTURE_WRAP_T, spec.WrapT)
+
+        glTextureParameteri(rendererID, GL_TEXTURE_MIN_FILTER, spec.MinFilter)
+        glTextureParameteri(rendererID, GL_TEXTURE_MAG_FILTER, spec.MagFilter)
 
-        RenderCommand.EnableBlending()
         glBindTexture(GL_TEXTURE_2D, 0)
 
+        def resident(texture: OpenGLTexture2D) -> None:
+            if texture.__RendererID is not None: glDeleteTextures(1, [texture.__RendererID])
+            texture.__RendererID = rendererID
+            texture.__Width, texture.__Height = width, height
+
+            RenderCommand.EnableBlending()
+            texture.__Loaded = True
+
+        self.__Submit(rendererID, [ (0, width, pixels) ], resident, immediate=not spec.AsyncLoad)
+
+    def _MakeResident(self, firstLevel: int, immediate: bool=False, reloaded: bool=False) -> None:
+        '''
+        Replaces the GPU texture with one holding the mip levels from `firstLevel` on, once they are uploaded.
+        When `reloaded`, the resident levels are of the previous image and none of them are copied.
+        '''
+        # TextureResidency asks again once the change in flight is resident
+        if self.IsUploading: return
+
+        spec, chain = self.__Specification, self.__MipChain
+        levels = chain.LevelCount - firstLevel
+        width, height = chain.Size(firstLevel)
+
+        rendererID = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, rendererID)
+
+        glTextureStorage2D(rendererID, levels, spec.TextureSize, width, height)
+
+        glTextureParameteri(rendererID, GL_TEXTURE_WRAP_S, spec.WrapS)
+        glTextureParameteri(rendererID, GL_TEXTURE_WRAP_T, spec.WrapT)
+
+        glTextureParameteri(rendererID, GL_TEXTURE_MIN_FILTER, PIConstants.LINEAR_MIPMAP_LINEAR)
+        glTextureParameteri(rendererID, GL_TEXTURE_MAG_FILTER, spec.MagFilter)
+
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        # Levels that are already resident are copied on the GPU (once the others are uploaded)
+        copied = [
+            level for level in range(firstLevel, chain.LevelCount)
+            if self.__Loaded and not reloaded and level >= self.__ResidentLevel
+        ]
+        uploaded = [
+            (level - firstLevel, chain.Size(level)[0], chain.Level(level))
+            for level in range(firstLevel, chain.LevelCount) if level not in copied
+        ]
+
+        def resident(texture: OpenGLTexture2D) -> None:
+            for level in copied:
+                levelWidth, levelHeight = chain.Size(level)
+                glCopyImageSubData(
+                    texture.__RendererID, GL_TEXTURE_2D, level - texture.__ResidentLevel, 0, 0, 0,
+                    rendererID          , GL_TEXTURE_2D, level - firstLevel             , 0, 0, 0,
+                    levelWidth, levelHeight, 1
+                )
+
+            if texture.__RendererID is not None: glDeleteTextures(1, [texture.__RendererID])
+            texture.__RendererID, texture.__ResidentLevel = rendererID, firstLevel
+            texture.__Loaded = True
+
+            chain.Evict(firstLevel)
+
+        self.__Submit(rendererID, uploaded, resident, immediate)
+
+    def __Submit(self, rendererID: int, levels: List[Tuple[int, int, np.ndarray]],
+        onResident: Callable[["OpenGLTexture2D"], None], immediate: bool) -> None:
+        '''Uploads `levels` ((mip level, width, pixels)) to `rendererID` row range by row range, through the UploadQueue'''
+        spec = self.__Specification
+
+        def part(level: int, width: int, pixels: np.ndarray) -> tuple:
+            def write(first: int, count: int) -> None:
+                glTextureSubImage2D(
+                    rendererID,
+                    level, 0, first, width, count, spec.TextureFormat,
+                    spec.DataType, np.ascontiguousarray(pixels[first:first + count])
+                )
+
+            return len(pixels), pixels.nbytes // max(len(pixels), 1), write
+
+        parts = [ part(*level) for level in levels ]
+
+        if immediate:
+            for rows, _, write in parts: write(0, rows)
+            onResident(self)
+            return
+
+        # The new texture is dropped if this one is deleted (or reloaded) before it is resident
+        self.__Upload = UploadQueue.Submit(self, parts, onCancel=lambda: glDeleteTextures(1, [rendererID]))
+        self.__Upload.AddCallback(onResident)
+
+    @staticmethod
+    def _GetPlaceholder():
+        # Plain white, so that the material's colors still show while the texture is loading
+        if OpenGLTexture2D.__Placeholder is None:
+            OpenGLTexture2D.__Placeholder = OpenGLTexture2D(1, 1, TextureSpecification())
+            OpenGLTexture2D.__Placeholder.SetData(b'\xff\xff\xff\xff', 4)
+
+        return OpenGLTexture2D.__Placeholder
+
     @dispatch(int, int, TextureSpecification)
     def __init__(self, width: int, height: int, spec: TextureSpecification) -> None:
         self.__RendererID = None
+        self.__Loaded = True
+        self.__MipChain: MipChain = None
+        self.__ResidentLevel = 0
+        self.__Upload: UploadQueue.Upload = None
 
         self.__Width = width
         self.__Height = height
@@ -92,7 +236,27 @@ class OpenGLTexture2D(Texture2D):
         glDeleteTextures(1, [self.__RendererID])
 
     @property
-    def RendererID(self) -> int: return self.__RendererID
+    def RendererID(self) -> int:
+        if not self.__Loaded: return OpenGLTexture2D._GetPlaceholder().RendererID
+        return self.__RendererID
+    @property
+    def IsLoaded(self) -> bool: return self.__Loaded
+    @property
+    def IsUploading(self) -> bool: return self.__Upload is not None and not self.__Upload.IsDone
+    @property
+    def MipLevelSizes(self) -> list:
+        if self.__MipChain is None: return [ (self.__Width, self.__Height) ]
+        return self.__MipChain.Sizes
+    @property
+    def ResidentLevel(self) -> int: return self.__ResidentLevel
+    @property
+    def CPUBytes(self) -> int:
+        '''Pixels kept in memory for uploading mip levels later'''
+        return self.__MipChain.ResidentBytes if self.__MipChain is not None else 0
+    @property
+    def GPUBytes(self) -> int:
+        if not self.__Loaded: return 0
+        return sum(width * height * 4 for width, height in self.MipLevelSizes[self.__ResidentLevel:])
     @property
     def Name(self) -> int: return self.__Name
     @property
@@ -105,11 +269,13 @@ class OpenGLTexture2D(Texture2D):
     def Specifications(self) -> int: return self.__Specification
 
     def SetData(self, data, size) -> None:
+        if not self.__Loaded or self.__MipChain is not None: return
+
         glTextureSubImage2D(
             self.__RendererID,
             0, 0, 0, self.__Width, self.__Height, self.__Specification.TextureFormat, 
             self.__Specification.DataType, data
         )
 
-    def Bind(self, slot: int=0) -> None: glBindTextureUnit(slot, self.__RendererID)
+    def Bind(self, slot: int=0) -> None: glBindTextureUnit(slot, self.RendererID)
     def Unbind(self) -> None: glBindTextureUnit(0, 0)
@@ -3,6 +3,8 @@ from ..Logging     import PI_CLIENT_WARN
 from ..Scene.Scene import Scene
 from ..Core.CacheManager.Manager import ProjectCache
 from ..AssetManager.AssetManager import AssetManager
+from ..AssetManager.AssetDatabase import AssetDatabase
+from ..AssetManager.AssetWatcher  import AssetWatcher
 from ..Scripting.ScriptingEngine import ScriptingEngine
 
 import os
@@ -53,6 +55,11 @@ class Project:
         AssetManager()
         AssetManager().GetInstance().SetCurrentProjectLocation(str(self.AssetsLocation))
 
+        # Reimports (in the background) whatever changed since the project was last open
+        AssetDatabase.Open(str(self.ProjectLocation), str(self.AssetsLocation))
+        AssetDatabase.Refresh()
+        AssetWatcher.SetProjectLocation(str(self.AssetsLocation))
+
         ScriptingEngine .Init(str(self.ScriptsLocation))
 
         ProjectCache.DumpFields()
@@ -4,6 +4,7 @@ from ..Logging.logger   import PI_CORE_ASSERT
 from OpenGL.GL import GL_FLOAT, GL_INT, GL_BOOL
 from ctypes    import c_void_p
 
+import numpy as np
 from multipledispatch import dispatch
 
 from dataclasses import dataclass
@@ -129,6 +130,14 @@ class VertexBuffer(ABC):
 
     @property
     def Layout(self) -> BufferLayout: ...
+    @property
+    def Size(self) -> int:
+        '''Size of the buffer on the GPU, in bytes'''
+        ...
+    @property
+    def IsResident(self) -> bool:
+        '''False while a streamed buffer is still being uploaded by the UploadQueue'''
+        ...
 
     @staticmethod
     def Init() -> None:
@@ -146,8 +155,14 @@ class VertexBuffer(ABC):
 
     @staticmethod
     @dispatch(list)
-    def Create(vertices: list):
-        return VertexBuffer.__NativeAPI(vertices)
+    def Create(vertices: list, streamed: bool=False):
+        return VertexBuffer.__NativeAPI(vertices, streamed=streamed)
+
+    @staticmethod
+    @dispatch(np.ndarray)
+    def Create(vertices: np.ndarray, streamed: bool=False):
+        '''Streamed buffers are uploaded over the next frames by the UploadQueue'''
+        return VertexBuffer.__NativeAPI(vertices, streamed=streamed)
 
     @staticmethod
     @dispatch(int)
@@ -162,6 +177,15 @@ class IndexBuffer:
     @abstractmethod
     def Unbind(self) -> None: ...
 
+    @property
+    def DataType(self) -> int: ...
+    @property
+    def Size(self) -> int:
+        '''Size of the buffer on the GPU, in bytes'''
+        ...
+    @property
+    def IsResident(self) -> bool: ...
+
     @staticmethod
     def Init() -> None:
         if (RendererAPI.GetAPI() == RendererAPI.API.Null):
@@ -177,5 +201,6 @@ class IndexBuffer:
         return None
 
     @staticmethod
-    def Create(indices: list):
-        return IndexBuffer.__NativeAPI(indices)
+    def Create(indices, streamed: bool=False):
+        '''`indices` can be a list (uint32) or a uint16/uint32 numpy array, which is uploaded as is'''
+        return IndexBuffer.__NativeAPI(indices, streamed)
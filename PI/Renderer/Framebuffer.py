@@ -5,6 +5,7 @@ from .Texture import TextureSpecification
 from abc import ABC, abstractmethod, abstractproperty
 
 from typing import List  as _List
+from typing import Tuple as _Tuple
 
 class Framebuffer:
     class AttachmentSpecification : ...      # Forward decleration
@@ -25,6 +26,10 @@ class Framebuffer(ABC):
         Samples : int = 1
         SwapChainTarget = False
 
+        # Seconds a new size has to stay unchanged before the attachments are reallocated to fit it exactly.
+        # Till then the framebuffer renders into a sub-viewport of its (larger) cached attachments.
+        ResizeDebounce : float = 0.25
+
         def __init__(self) -> None: pass
 
     __slots__ = ("__NativeAPI",)
@@ -47,6 +52,8 @@ class Framebuffer(ABC):
     def Attachments(self) -> _List[int]: ...
     @abstractproperty
     def Spec(self) -> Specs: ...
+    @abstractproperty
+    def ViewportUV(self) -> _Tuple[float, float]: ...
 
     @abstractmethod
     def Bind(self) -> None: ...
@@ -55,6 +62,8 @@ class Framebuffer(ABC):
     @abstractmethod
     def GetColorAttachment(self, index=0) -> int: ...
     @abstractmethod
+    def GetDepthAttachment(self) -> int: ...
+    @abstractmethod
     def Unbind(self) -> None: ...
     @abstractmethod
     def Resize(self, width: int, height: int) -> None: ...
@@ -84,6 +84,15 @@ class Material:
 
         self.ResetShader()
 
+    def _Replace(self, other) -> None:
+        '''Takes over every property of `other`, so that everything holding this material sees the new one'''
+        self.__Shader = other.__Shader
+        self.__TextureAlbedo, self.__TextureSpecular = other.__TextureAlbedo, other.__TextureSpecular
+        self.__TilingFactor = other.__TilingFactor
+
+        self.__Diffuse, self.__Specular, self.__Shininess = other.__Diffuse, other.__Specular, other.__Shininess
+        self.__Name, self.__Type = other.__Name, other.__Type
+
     def ResetShader(self) -> None:
         if Material.Type.Is(self.__Type, Material.Type.Lit):
             if Material.Type.Is(self.__Type, Material.Type.Phong):
@@ -119,7 +128,11 @@ class Material:
     def Shininess (self) -> float        : return self.__Shininess
 
     @property
-    def AlbedoMap (self) -> pyrr.Vector4 : return self.__TextureAlbedo
+    def AlbedoMap   (self) -> Texture2D : return self.__TextureAlbedo
+    @property
+    def SpecularMap (self) -> Texture2D : return self.__TextureSpecular
+    @property
+    def TilingFactor(self) -> float     : return self.__TilingFactor
 
     def SetDiffuse   (self, diffuse   : pyrr.Vector4) -> None: self.__Diffuse = diffuse
     def SetSpecular  (self, specular  : pyrr.Vector4) -> None: self.__Specular = specular
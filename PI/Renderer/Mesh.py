@@ -1,10 +1,12 @@
-from .Texture import Texture2D
+from .Texture import Texture2D, TextureSpecification
 from .VertexArray import *
 from .Buffer import *
 from .Material import *
 from .Light import DirectionalLight, PointLight, SpotLight
+from .MeshData import MeshData
 
 import pyrr
+import numpy as np
 from multipledispatch import dispatch
 from math import radians
 from typing import List
@@ -13,19 +15,21 @@ class Mesh:
     __slots__ = "__VertexArray", "__VertexBuffer", "__IndexBuffer", \
         "__Translation", "__Rotation", "__Scale", \
         "__Translation_Matrix", "__Rotation_Matrix", "__Scale_Matrix", "__Transform", "__Transformed", \
-        "__Name", "__Path", "__Material"
+        "__Name", "__Path", "__Material", "__BoundingRadius"
 
-    @dispatch(list, list, BufferLayout)
+    @dispatch((list, np.ndarray), (list, np.ndarray), BufferLayout)
     def __init__(self, vertices: list, indicies: list, layout: BufferLayout,
         name: str=Random.GenerateName("Mesh"),
         translation : pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]),
         rotation    : pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]),
-        scale       : pyrr.Vector3=pyrr.Vector3([ 1, 1, 1 ])
+        scale       : pyrr.Vector3=pyrr.Vector3([ 1, 1, 1 ]),
+        streamed    : bool=False
         ) -> None:
 
         self.__Name = name
         self.__Path = "."
         self.__Material = Material(Material.Type.StandardPhong)
+        self.__BoundingRadius: float = None
 
         self.__Translation = translation
         self.__Rotation    = rotation
@@ -35,9 +39,10 @@ class Mesh:
 
         self._RecalculateTransform()
 
+        # Streamed meshes are uploaded over the next frames by the UploadQueue, they are drawn once resident
         self.__VertexArray  : VertexArray  = VertexArray.Create()
-        self.__VertexBuffer : VertexBuffer = VertexBuffer.Create(vertices)
-        self.__IndexBuffer  : IndexBuffer  = IndexBuffer.Create(indicies)
+        self.__VertexBuffer : VertexBuffer = VertexBuffer.Create(vertices, streamed=streamed)
+        self.__IndexBuffer  : IndexBuffer  = IndexBuffer.Create(indicies, streamed)
 
         self.__VertexBuffer.SetLayout(layout)
 
@@ -56,6 +61,7 @@ class Mesh:
         self.__Name = name
         self.__Path = "."
         self.__Material = Material(Material.Type.StandardPhong)
+        self.__BoundingRadius: float = None
 
         self.__Translation = translation
         self.__Rotation    = rotation
@@ -73,52 +79,53 @@ class Mesh:
 
     @staticmethod
     def Load(path: str):
-        from ..Core import OBJReader
-        objs = OBJReader.Read(path)
-        materials = objs.materials
-        meshes = objs.meshes
+        '''Loads every submesh of `path` (OBJ or `.pimesh`), see `MeshData.Load`'''
+        return Mesh.FromData(MeshData.Load(path), path)
+
+    @staticmethod
+    def FromData(data: MeshData, path: str):
+        '''Uploads every submesh of `data`, which was loaded from `path`'''
+        from ..AssetManager.AssetManager import AssetManager
 
         objects = []
 
-        for (nameMat, material), (nameMesh, mesh) in zip(materials.items(), meshes.items()):
+        # Streamed: decoded in the background, with only the needed mip levels resident
+        textureSpec = TextureSpecification(asyncLoad=True, mipmaps=True)
+
+        for submesh in data.Submeshes:
+            material = data.Materials[submesh.Material]
             mat: Material = None
 
-            if material.texture is not None:
-                if material.texture_specular_color is not None:
-                    mat = Material(
-                        Material.Type.Standard | Material.Type.Lit | Material.Type.Phong | Material.Type.Textured,
-                        textureAlbedo=Texture2D.Create(material.texture.path),
-                        textureSpecular=Texture2D.Create(material.texture_specular_color.path),
-                        tilingFactor=material.texture.options.s[0],
-                        name=nameMat
-                    )
-                
-                else:
-                    mat = Material(
-                        Material.Type.Standard | Material.Type.Lit | Material.Type.Phong | Material.Type.Textured,
-                        textureAlbedo=Texture2D.Create(material.texture.path),
-                        tilingFactor=material.texture.options.s[0],
-                        name=nameMat
-                    )
+            if material["Albedo"] is not None:
+                mat = Material(
+                    Material.Type.Standard | Material.Type.Lit | Material.Type.Phong | Material.Type.Textured,
+                    textureAlbedo=AssetManager.LoadTexture(data.ResolvePath(material["Albedo"]), textureSpec),
+                    textureSpecular=AssetManager.LoadTexture(data.ResolvePath(material["SpecularMap"]), textureSpec) \
+                        if material["SpecularMap"] is not None else None,
+                    tilingFactor=material["TilingFactor"],
+                    name=material["Name"]
+                )
 
             else:
                 mat = Material(
                     Material.Type.Standard | Material.Type.Lit | Material.Type.Phong,
-                    diffuse=pyrr.Vector4([ *material.diffuse ]),
-                    specular=pyrr.Vector4([ *material.specular ]),
-                    name=nameMat
+                    diffuse=pyrr.Vector4([ *material["Diffuse"] ]),
+                    specular=pyrr.Vector4([ *material["Specular"] ]),
+                    name=material["Name"]
                 )
 
+            # The arrays are views into the memory mapped cache, they are uploaded without copying
             mesh = Mesh(
-                material.vertices, list(range(0, int(len(material.vertices)/8))),
+                submesh.Vertices, submesh.Indices,
                 BufferLayout(
                     ( ShaderDataType.Float2, "a_TexCoord" ),
                     ( ShaderDataType.Float3, "a_Normal"   ),
                     ( ShaderDataType.Float3, "a_Position" )
                 ),
-                name=nameMesh
+                name=submesh.Name, streamed=True
             )
             mesh.__Path = path
+            mesh.__BoundingRadius = submesh.Radius
             mesh.SetMaterial(mat)
 
             objects.append(mesh)
@@ -132,6 +139,14 @@ class Mesh:
     @property
     def Material(self) -> Material: return self.__Material
     @property
+    def BoundingRadius(self) -> float:
+        '''Radius of a sphere around the mesh' origin containing every vertex, None if unknown'''
+        return self.__BoundingRadius
+    @property
+    def GPUBytes(self) -> int: return self.__VertexBuffer.Size + self.__IndexBuffer.Size
+    @property
+    def IsResident(self) -> bool: return self.__VertexBuffer.IsResident and self.__IndexBuffer.IsResident
+    @property
     def Transform(self) -> pyrr.Matrix44: return self.__Transform
     @property
     def Translation(self) -> pyrr.Vector3: return self.__Translation
@@ -170,6 +185,12 @@ class Mesh:
 
     def SetMaterial(self, material: Material) -> None: self.__Material = material
 
+    def _Replace(self, other) -> None:
+        '''Takes over the buffers and material of `other` (a reimport of this mesh), keeping its own transform'''
+        self.__VertexArray, self.__VertexBuffer, self.__IndexBuffer = other.__VertexArray, other.__VertexBuffer, other.__IndexBuffer
+        self.__Name, self.__BoundingRadius = other.__Name, other.__BoundingRadius
+        self.__Material._Replace(other.__Material)
+
     def SetTranslation(self, translation: pyrr.Vector3):
         self.__Translation = translation
         self.__Transformed = True
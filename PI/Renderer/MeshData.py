@@ -0,0 +1,264 @@
+from ..Core.CacheManager import Cache
+from ..Logging.logger    import PI_CORE_ASSERT, PI_CORE_TRACE
+from .MeshOptimizer      import MeshOptimizer, MeshOptimizationReport
+
+import numpy as np
+from hashlib import sha1
+from io import BytesIO
+from typing import Any, Dict, List
+import json
+import os
+import re
+
+class SubmeshData:
+    __slots__ = "Name", "Material", "Vertices", "Indices", "BoundsMin", "BoundsMax", "Radius"
+
+    def __init__(self, name: str, material: int, vertices: np.ndarray, indices: np.ndarray) -> None:
+        self.Name, self.Material = name, material
+
+        # (V, MeshData.VertexStride) float32 and uint16/uint32, indices are local to `Vertices`
+        self.Vertices, self.Indices = vertices, indices
+
+        positions = vertices[:, MeshData.PositionOffset:MeshData.PositionOffset + 3]
+        if len(positions):
+            self.BoundsMin, self.BoundsMax = positions.min(axis=0), positions.max(axis=0)
+            self.Radius = float(np.sqrt((positions.astype(np.float64) ** 2).sum(axis=1).max()))
+        else:
+            self.BoundsMin, self.BoundsMax, self.Radius = np.zeros(3, np.float32), np.zeros(3, np.float32), 0.0
+
+class MeshData:
+    '''
+    CPU side contents of a model: its submeshes (optimized vertices and indices) and the materials they use.
+
+    `Load` imports a source file once and caches the result as a `.pimesh` file, which is memory mapped
+    on later loads, so the vertex and index arrays point straight into the file.
+
+    `.pimesh` layout (little endian, every block aligned to `Alignment` bytes):
+        Header          (`HeaderType`)
+        Submesh table   (`SubmeshType` * SubmeshCount)
+        Metadata        (UTF-8 JSON: submesh names, materials)
+        Vertex blocks   (float32, VertexStride floats per vertex, one block per submesh)
+        Index blocks    (uint16 or uint32, one block per submesh)
+    '''
+    __slots__ = "Submeshes", "Materials", "Directory"
+
+    Magic        : bytes = b"PIMESH"
+    Version      : int   = 2
+    Alignment    : int   = 64
+    Extension    : str   = ".pimesh"
+
+    # T2F_N3F_V3F, as read by the OBJReader
+    VertexStride  : int = 8
+    PositionOffset: int = 5
+
+    HeaderType = np.dtype([
+        ("Magic"          , "S8"       ),
+        ("Version"        , "<u4"      ),
+        ("VertexStride"   , "<u4"      ),
+        ("SubmeshCount"   , "<u4"      ),
+        ("MetadataSize"   , "<u4"      ),
+        ("SubmeshOffset"  , "<u8"      ),
+        ("MetadataOffset" , "<u8"      ),
+        ("BoundsMin"      , "<f4", (3,)),
+        ("BoundsMax"      , "<f4", (3,)),
+        ("Radius"         , "<f4"      ),
+        ("Reserved"       , "<u4"      ),
+    ])
+
+    SubmeshType = np.dtype([
+        ("Material"       , "<i4"      ),
+        ("IndexSize"      , "<u4"      ),   # 2 or 4 bytes
+        ("VertexCount"    , "<u8"      ),
+        ("VertexOffset"   , "<u8"      ),
+        ("IndexCount"     , "<u8"      ),
+        ("IndexOffset"    , "<u8"      ),
+        ("BoundsMin"      , "<f4", (3,)),
+        ("BoundsMax"      , "<f4", (3,)),
+        ("Radius"         , "<f4"      ),
+        ("Reserved"       , "<u4"      ),
+    ])
+
+    def __init__(self, submeshes: List[SubmeshData], materials: List[Dict[str, Any]], directory: str) -> None:
+        self.Submeshes = submeshes
+
+        # Material descriptions (see `Import`), texture paths are relative to `Directory`
+        self.Materials = materials
+        self.Directory = directory
+
+    @property
+    def BoundsMin(self) -> np.ndarray: return np.min([ submesh.BoundsMin for submesh in self.Submeshes ], axis=0)
+    @property
+    def BoundsMax(self) -> np.ndarray: return np.max([ submesh.BoundsMax for submesh in self.Submeshes ], axis=0)
+    @property
+    def Radius(self) -> float: return max(submesh.Radius for submesh in self.Submeshes)
+
+    def ResolvePath(self, path: str) -> str:
+        if path is None: return None
+        return os.path.normpath(os.path.join(self.Directory, path))
+
+    @staticmethod
+    def Import(path: str):
+        '''Parses the OBJ at `path` and optimizes its submeshes (one per material) for rendering'''
+        from ..Core import OBJReader
+        meshes = OBJReader.Read(path)
+        directory = os.path.dirname(os.path.abspath(path))
+
+        def relative(texture: str) -> str:
+            if texture is None: return None
+            return os.path.relpath(texture, directory)
+
+        submeshes, materials = [], []
+        report = MeshOptimizationReport(path)
+
+        for mesh in meshes:
+            material = mesh.Material
+            materials.append({
+                "Name"         : material.Name,
+                "Albedo"       : relative(material.Albedo),
+                "SpecularMap"  : relative(material.SpecularMap) if material.Albedo is not None else None,
+                "TilingFactor" : material.TilingFactor if material.Albedo is not None else 1.0,
+                "Diffuse"      : material.Diffuse,
+                "Specular"     : material.Specular,
+            })
+
+            # The reader gives a flat triangle list, weld and reorder it before uploading
+            vertices, indices, submeshReport = MeshOptimizer.Optimize(
+                mesh.Vertices, MeshData.VertexStride, MeshData.PositionOffset, mesh.Name
+            )
+            report += submeshReport
+
+            submeshes.append(SubmeshData(mesh.Name, len(materials) - 1, vertices, indices))
+
+        report.Log()
+        return MeshData(submeshes, materials, directory)
+
+    @staticmethod
+    def Dependencies(path: str) -> List[str]:
+        '''Paths of the MTL files the OBJ at `path` references (the ones that exist)'''
+        directory = os.path.dirname(os.path.abspath(path))
+
+        with open(path, "rb") as f:
+            libraries = re.findall(rb"^[ \t]*mtllib[ \t]+(.+?)[ \t]*$", f.read(), re.MULTILINE)
+
+        libraryPaths = [ os.path.join(directory, library.decode(errors="replace")) for library in libraries ]
+        return [ libraryPath for libraryPath in libraryPaths if os.path.isfile(libraryPath) ]
+
+    @staticmethod
+    def SourceHash(path: str) -> str:
+        '''Hash of the OBJ, the MTL files it references and the format version'''
+        from ..AssetManager.AssetManager import AssetManager
+
+        digest = sha1(f"{MeshData.Version}|{AssetManager.HashFile(path)}".encode())
+        for libraryPath in MeshData.Dependencies(path): digest.update(AssetManager.HashFile(libraryPath).encode())
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def CacheDirectory() -> str:
+        directory = f"{Cache.GetLocalTempDirectory()}\\MeshCache"
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @staticmethod
+    def CachePath(path: str) -> str:
+        '''Location of the `.pimesh` file `path` is (or will be) imported to'''
+        if path.endswith(MeshData.Extension): return path
+        return f"{MeshData.CacheDirectory()}\\{MeshData.SourceHash(path)}{MeshData.Extension}"
+
+    @staticmethod
+    def Load(path: str):
+        '''Returns the MeshData of `path`, read from (or written to) the `.pimesh` cache'''
+        if path.endswith(MeshData.Extension): return MeshData.Read(path, os.path.dirname(os.path.abspath(path)))
+
+        cachePath = MeshData.CachePath(path)
+        directory = os.path.dirname(os.path.abspath(path))
+
+        if os.path.isfile(cachePath):
+            try: return MeshData.Read(cachePath, directory)
+            except (ValueError, KeyError) as e: PI_CORE_TRACE("Discarding invalid mesh cache: {} ({})", cachePath, e)
+
+        data = MeshData.Import(path)
+        data.Write(cachePath)
+        return data
+
+    @staticmethod
+    def __Align(stream: BytesIO) -> int:
+        padding = -stream.tell() % MeshData.Alignment
+        stream.write(b"\0" * padding)
+        return stream.tell()
+
+    def Write(self, path: str) -> None:
+        header = np.zeros(1, dtype=MeshData.HeaderType)
+        table  = np.zeros(len(self.Submeshes), dtype=MeshData.SubmeshType)
+
+        metadata = json.dumps({
+            "Submeshes" : [ submesh.Name for submesh in self.Submeshes ],
+            "Materials" : self.Materials,
+        }).encode()
+
+        stream = BytesIO()
+        stream.write(b"\0" * (header.nbytes + table.nbytes))
+        header["MetadataOffset"], header["MetadataSize"] = MeshData.__Align(stream), len(metadata)
+        stream.write(metadata)
+
+        for entry, submesh in zip(table, self.Submeshes):
+            entry["VertexOffset"] = MeshData.__Align(stream)
+            stream.write(np.ascontiguousarray(submesh.Vertices, dtype="<f4").tobytes())
+
+        for entry, submesh in zip(table, self.Submeshes):
+            entry["IndexOffset"] = MeshData.__Align(stream)
+            stream.write(np.ascontiguousarray(submesh.Indices, dtype=submesh.Indices.dtype.newbyteorder("<")).tobytes())
+
+            entry["Material"]    = submesh.Material
+            entry["IndexSize"]   = submesh.Indices.dtype.itemsize
+            entry["VertexCount"] = len(submesh.Vertices)
+            entry["IndexCount"]  = len(submesh.Indices)
+            entry["BoundsMin"], entry["BoundsMax"], entry["Radius"] = submesh.BoundsMin, submesh.BoundsMax, submesh.Radius
+
+        header["Magic"], header["Version"] = MeshData.Magic, MeshData.Version
+        header["VertexStride"], header["SubmeshCount"] = MeshData.VertexStride, len(self.Submeshes)
+        header["SubmeshOffset"] = header.nbytes
+        if self.Submeshes:
+            header["BoundsMin"], header["BoundsMax"], header["Radius"] = self.BoundsMin, self.BoundsMax, self.Radius
+
+        stream.seek(0)
+        stream.write(header.tobytes())
+        stream.write(table.tobytes())
+
+        # Written next to the destination and then renamed, so a crash never leaves a half written file behind
+        temporaryPath = f"{path}.{os.getpid()}.tmp"
+        with open(temporaryPath, "wb") as f: f.write(stream.getbuffer())
+        os.replace(temporaryPath, path)
+
+    @staticmethod
+    def Read(path: str, directory: str):
+        '''Memory maps a `.pimesh` file, the returned arrays are read-only views into it'''
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+        header = np.frombuffer(buffer, dtype=MeshData.HeaderType, count=1)[0]
+        if header["Magic"] != MeshData.Magic or header["Version"] != MeshData.Version:
+            raise ValueError(f"{path} is not a version {MeshData.Version} .pimesh file")
+
+        PI_CORE_ASSERT(header["VertexStride"] == MeshData.VertexStride, "Unsupported vertex layout in: {}", path)
+
+        table = np.frombuffer(buffer, dtype=MeshData.SubmeshType, count=int(header["SubmeshCount"]),
+            offset=int(header["SubmeshOffset"]))
+
+        metadataOffset = int(header["MetadataOffset"])
+        metadata = json.loads(bytes(buffer[metadataOffset:metadataOffset + int(header["MetadataSize"])]).decode())
+
+        submeshes = []
+        for name, entry in zip(metadata["Submeshes"], table):
+            vertices = np.frombuffer(buffer, dtype="<f4", count=int(entry["VertexCount"]) * MeshData.VertexStride,
+                offset=int(entry["VertexOffset"])).reshape(-1, MeshData.VertexStride)
+
+            indexType = "<u2" if entry["IndexSize"] == 2 else "<u4"
+            indices = np.frombuffer(buffer, dtype=indexType, count=int(entry["IndexCount"]), offset=int(entry["IndexOffset"]))
+
+            submesh = SubmeshData.__new__(SubmeshData)
+            submesh.Name, submesh.Material = name, int(entry["Material"])
+            submesh.Vertices, submesh.Indices = vertices, indices
+            submesh.BoundsMin, submesh.BoundsMax, submesh.Radius = entry["BoundsMin"], entry["BoundsMax"], float(entry["Radius"])
+            submeshes.append(submesh)
+
+        return MeshData(submeshes, metadata["Materials"], directory)
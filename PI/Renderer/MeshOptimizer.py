@@ -0,0 +1,239 @@
+from ..Logging.logger import PI_CORE_INFO
+
+import numpy as np
+from typing import List, Tuple
+
+class MeshOptimizationReport:
+    __slots__ = "Name", "VertexBytesBefore", "VertexBytesAfter", "IndexBytesBefore", "IndexBytesAfter"
+
+    def __init__(self, name: str="", vertexBytesBefore: int=0, vertexBytesAfter: int=0,
+        indexBytesBefore: int=0, indexBytesAfter: int=0) -> None:
+        self.Name = name
+        self.VertexBytesBefore, self.VertexBytesAfter = vertexBytesBefore, vertexBytesAfter
+        self.IndexBytesBefore , self.IndexBytesAfter  = indexBytesBefore , indexBytesAfter
+
+    def __iadd__(self, other):
+        self.VertexBytesBefore += other.VertexBytesBefore
+        self.VertexBytesAfter  += other.VertexBytesAfter
+        self.IndexBytesBefore  += other.IndexBytesBefore
+        self.IndexBytesAfter   += other.IndexBytesAfter
+        return self
+
+    @property
+    def VertexBytesSaved(self) -> int: return self.VertexBytesBefore - self.VertexBytesAfter
+    @property
+    def IndexBytesSaved(self) -> int: return self.IndexBytesBefore - self.IndexBytesAfter
+
+    def Log(self) -> None:
+        PI_CORE_INFO("Mesh: {}, VBO: {} -> {} bytes ({} saved), IBO: {} -> {} bytes ({} saved)",
+            self.Name,
+            self.VertexBytesBefore, self.VertexBytesAfter, self.VertexBytesSaved,
+            self.IndexBytesBefore , self.IndexBytesAfter , self.IndexBytesSaved
+        )
+
+class MeshOptimizer:
+    '''
+    Import time optimizations for triangle lists:
+        * Welds identical vertices and generates an index buffer (uint16 where possible)
+        * Reorders triangles for the post-transform vertex cache (Tom Forsyth's algorithm)
+        * Reorders the resulting triangle clusters front to back to reduce overdraw
+        * Reorders vertices by first use for better vertex fetch locality
+    '''
+    CacheSize      : int   = 32
+    CacheDecayPower: float = 1.5
+    LastTriScore   : float = 0.75
+    ValenceBoostScale : float = 2.0
+    ValenceBoostPower : float = 0.5
+    MaxValence     : int   = 64
+
+    @staticmethod
+    def WeldVertices(vertices: np.ndarray, stride: int) -> Tuple[np.ndarray, np.ndarray]:
+        '''Returns the unique vertices (in order of first occurrence) and the indices into them'''
+        # Adding 0.0 turns -0.0 into 0.0 so that both hash the same
+        data = np.ascontiguousarray(np.asarray(vertices, dtype=np.float32).reshape(-1, stride) + np.float32(0.0))
+
+        # Every vertex is viewed as an opaque blob of bytes, so they can be compared as a whole
+        rows = data.view(np.dtype((np.void, data.dtype.itemsize * stride))).ravel()
+        _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+
+        order = np.argsort(first, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+
+        return data[first[order]], remap[inverse.ravel()]
+
+    @staticmethod
+    def CompactIndices(indices: np.ndarray, vertexCount: int) -> np.ndarray:
+        '''Uses 16 bit indices whenever every vertex can be addressed with them'''
+        dtype = np.uint16 if vertexCount <= np.iinfo(np.uint16).max + 1 else np.uint32
+        return np.ascontiguousarray(indices, dtype=dtype)
+
+    @staticmethod
+    def __ScoreTables() -> Tuple[List[float], List[float]]:
+        cacheScores = []
+        for position in range(MeshOptimizer.CacheSize):
+            # The last triangle's vertices get a fixed score, so that it does not matter in which order they were added
+            if position < 3: cacheScores.append(MeshOptimizer.LastTriScore)
+            else:
+                scaler = 1.0 / (MeshOptimizer.CacheSize - 3)
+                cacheScores.append((1.0 - (position - 3) * scaler) ** MeshOptimizer.CacheDecayPower)
+
+        # Index 0 means the vertex has no triangles left to emit
+        valenceScores = [ -1.0 ] + [
+            MeshOptimizer.ValenceBoostScale * (valence ** -MeshOptimizer.ValenceBoostPower)
+            for valence in range(1, MeshOptimizer.MaxValence + 1)
+        ]
+
+        return cacheScores, valenceScores
+
+    @staticmethod
+    def OptimizeVertexCache(indices: np.ndarray, vertexCount: int) -> Tuple[np.ndarray, List[int]]:
+        '''
+        Tom Forsyth's "Linear-Speed Vertex Cache Optimisation".
+        Returns the reordered triangles (T, 3) and the triangles that start a new cluster
+        (none of their vertices were in the cache when they were emitted).
+        '''
+        triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        triangleCount = len(triangles)
+        if triangleCount == 0: return triangles, []
+
+        cacheScores, valenceScores = MeshOptimizer.__ScoreTables()
+        maxValence = MeshOptimizer.MaxValence
+        cacheSize  = MeshOptimizer.CacheSize
+
+        # Vertex -> triangles adjacency in CSR form
+        flat    = triangles.ravel()
+        valence = np.bincount(flat, minlength=vertexCount)
+        offsets = np.concatenate(( [ 0 ], np.cumsum(valence) )).tolist()
+        adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+
+        remaining  = valence.tolist()
+        tris       = triangles.tolist()
+        cachePos   = [ -1 ] * vertexCount
+        vertScore  = [ valenceScores[min(v, maxValence)] for v in remaining ]
+        triScore   = [ vertScore[a] + vertScore[b] + vertScore[c] for a, b, c in tris ]
+        emitted    = [ False ] * triangleCount
+
+        cache: List[int] = []
+        order: List[int] = []
+        clusters: List[int] = []
+        nextUnused = 0
+
+        best = max(range(triangleCount), key=triScore.__getitem__)
+
+        while best != -1:
+            triangle = tris[best]
+
+            if all(cachePos[v] == -1 for v in triangle): clusters.append(len(order))
+
+            order.append(best)
+            emitted[best] = True
+
+            for v in triangle: remaining[v] -= 1
+
+            # Most recent vertices go to the front of the LRU cache
+            newCache = triangle + [ v for v in cache if v not in triangle ]
+            for v in newCache[cacheSize:]: cachePos[v] = -1
+            cache = newCache[:cacheSize]
+
+            # Rescore the vertices in (or just evicted from) the cache and their triangles
+            best, bestScore = -1, -1.0
+            for position, v in enumerate(newCache):
+                if position < cacheSize:
+                    cachePos[v] = position
+                    score = cacheScores[position] if remaining[v] else 0.0
+                else: score = 0.0
+
+                vertScore[v] = score + valenceScores[min(remaining[v], maxValence)] if remaining[v] else -1.0
+
+            for v in newCache:
+                for t in adjacency[offsets[v]:offsets[v + 1]]:
+                    if emitted[t]: continue
+                    a, b, c = tris[t]
+                    score = vertScore[a] + vertScore[b] + vertScore[c]
+                    triScore[t] = score
+
+                    if score > bestScore: best, bestScore = t, score
+
+            # Dead end, continue with the next triangle that was not emitted yet
+            if best == -1:
+                while nextUnused < triangleCount and emitted[nextUnused]: nextUnused += 1
+                if nextUnused < triangleCount: best = nextUnused
+
+        return triangles[order], clusters
+
+    @staticmethod
+    def OptimizeOverdraw(triangles: np.ndarray, clusters: List[int], positions: np.ndarray) -> np.ndarray:
+        '''
+        Sorts the clusters produced by `OptimizeVertexCache` so that the ones facing away from the mesh center
+        are drawn first. They are the most likely to occlude the rest of the mesh.
+        '''
+        if len(clusters) <= 1: return triangles
+
+        corners  = positions[triangles]                         # (T, 3, 3)
+        centers  = corners.mean(axis=1)
+        normals  = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        areas    = np.linalg.norm(normals, axis=1)
+
+        starts = np.asarray(clusters)
+        clusterNormals = np.add.reduceat(normals, starts)
+        clusterCenters = np.add.reduceat(centers * areas[:, None], starts)
+        clusterAreas   = np.add.reduceat(areas, starts)
+
+        clusterCenters /= np.maximum(clusterAreas, 1e-12)[:, None]
+        clusterNormals /= np.maximum(np.linalg.norm(clusterNormals, axis=1), 1e-12)[:, None]
+
+        meshCenter = (centers * areas[:, None]).sum(axis=0) / max(float(areas.sum()), 1e-12)
+        keys = np.einsum("ij,ij->i", clusterCenters - meshCenter, clusterNormals)
+
+        ends  = np.append(starts[1:], len(triangles))
+        order = np.argsort(-keys, kind="stable")
+        return np.concatenate([ triangles[starts[i]:ends[i]] for i in order ])
+
+    @staticmethod
+    def OptimizeVertexFetch(vertices: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''Reorders the vertices in the order they are first referenced by the index buffer'''
+        _, first = np.unique(indices, return_index=True)
+        used  = indices[np.sort(first)]
+
+        remap = np.full(len(vertices), -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+
+        return vertices[used], remap[indices]
+
+    @staticmethod
+    def Optimize(vertices: np.ndarray, stride: int, positionOffset: int, name: str="") \
+        -> Tuple[np.ndarray, np.ndarray, MeshOptimizationReport]:
+        '''
+        Optimizes a non-indexed triangle list with `stride` floats per vertex,
+        the position (3 floats) starting at `positionOffset`.
+        Returns the vertices (V, stride) float32, the indices (uint16/uint32) and a report.
+        '''
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, stride)
+        report = MeshOptimizationReport(name, vertexBytesBefore=vertices.nbytes, indexBytesBefore=len(vertices) * 4)
+
+        unique, indices = MeshOptimizer.WeldVertices(vertices, stride)
+
+        triangles, clusters = MeshOptimizer.OptimizeVertexCache(indices, len(unique))
+        triangles = MeshOptimizer.OptimizeOverdraw(
+            triangles, clusters, unique[:, positionOffset:positionOffset + 3].astype(np.float64)
+        )
+
+        unique, indices = MeshOptimizer.OptimizeVertexFetch(unique, triangles.ravel())
+        indices = MeshOptimizer.CompactIndices(indices, len(unique))
+
+        report.VertexBytesAfter, report.IndexBytesAfter = unique.nbytes, indices.nbytes
+        return unique, indices, report
+
+    @staticmethod
+    def ACMR(indices: np.ndarray, cacheSize: int=16) -> float:
+        '''Average cache miss ratio of a FIFO cache, 3.0 is the worst and ~0.5 is great'''
+        cache, misses = [], 0
+
+        for v in np.asarray(indices).tolist():
+            if v in cache: continue
+            misses += 1
+            cache.append(v)
+            if len(cache) > cacheSize: cache.pop(0)
+
+        return misses / max(len(indices) // 3, 1)
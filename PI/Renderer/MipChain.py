@@ -0,0 +1,185 @@
+from ..Core.CacheManager import Cache
+
+import numpy as np
+from hashlib import sha1
+from math import ceil
+from typing import List, Tuple
+import threading
+import os
+
+class MipFilter:
+    Box, Kaiser = range(2)
+
+class MipChain:
+    '''
+    A full mip chain of an RGBA8 image, generated once and stored as one `.npy` file per level in the cache,
+    so that single levels can be (memory mapped and) loaded on demand. Each level file is written to a temporary
+    file and then renamed, a marker file written after the last level tells that the chain is complete.
+    Level 0 is the full resolution image, rows are bottom first (as uploaded to OpenGL).
+    '''
+    __slots__ = "__Key", "__Sizes", "__Levels"
+
+    KaiserRadius : float = 2.0      # In destination pixels
+    KaiserBeta   : float = 4.0
+    Gamma        : float = 2.2
+
+    def __init__(self, key: str, sizes: List[Tuple[int, int]]) -> None:
+        self.__Key = key
+        self.__Sizes = sizes
+        self.__Levels: List[np.ndarray] = [ None ] * len(sizes)
+
+    @property
+    def Key(self) -> str: return self.__Key
+    @property
+    def LevelCount(self) -> int: return len(self.__Sizes)
+    @property
+    def Sizes(self) -> List[Tuple[int, int]]: return self.__Sizes
+
+    def Size(self, level: int) -> Tuple[int, int]:
+        '''(width, height) of `level`'''
+        return self.__Sizes[level]
+
+    def Bytes(self, firstLevel: int=0) -> int:
+        return sum(width * height * 4 for width, height in self.__Sizes[firstLevel:])
+
+    @property
+    def ResidentBytes(self) -> int:
+        '''Memory held by the preloaded levels (memory mapped ones are left to the OS)'''
+        return sum(level.nbytes for level in self.__Levels if level is not None and not isinstance(level, np.memmap))
+
+    def Level(self, level: int) -> np.ndarray:
+        if self.__Levels[level] is None:
+            self.__Levels[level] = np.load(MipChain.LevelPath(self.__Key, level), mmap_mode="r")
+        return self.__Levels[level]
+
+    def Evict(self, firstLevel: int) -> None:
+        '''Drops the CPU side copies of the levels above `firstLevel`'''
+        for level in range(firstLevel): self.__Levels[level] = None
+
+    @staticmethod
+    def CacheDirectory() -> str:
+        directory = f"{Cache.GetLocalTempDirectory()}\\MipCache"
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @staticmethod
+    def LevelPath(key: str, level: int) -> str: return f"{MipChain.CacheDirectory()}\\{key}_{level}.npy"
+    @staticmethod
+    def CompletePath(key: str) -> str: return f"{MipChain.CacheDirectory()}\\{key}.complete"
+
+    @staticmethod
+    def __Write(path: str, write) -> None:
+        '''Calls `write(file)` on a temporary file that then replaces `path`, readers never see a partial file'''
+        # Another worker may be writing the same chain
+        temporaryPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        try:
+            with open(temporaryPath, "wb") as f: write(f)
+            os.replace(temporaryPath, path)
+        finally:
+            if os.path.exists(temporaryPath): os.remove(temporaryPath)
+
+    @staticmethod
+    def CacheKey(path: str, mipFilter: int) -> str:
+        stat = os.stat(path)
+        return sha1(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{mipFilter}".encode()).hexdigest()
+
+    @staticmethod
+    def LevelSizes(width: int, height: int) -> List[Tuple[int, int]]:
+        sizes = [ (width, height) ]
+        while width > 1 or height > 1:
+            width, height = max(width // 2, 1), max(height // 2, 1)
+            sizes.append((width, height))
+        return sizes
+
+    @staticmethod
+    def __Weights(distance: np.ndarray, mipFilter: int) -> np.ndarray:
+        if mipFilter == MipFilter.Box: return (np.abs(distance) <= 0.5).astype(np.float32)
+
+        # Kaiser windowed sinc
+        radius = MipChain.KaiserRadius
+        window = np.clip(1.0 - (distance / radius) ** 2, 0.0, None)
+        weights = np.sinc(distance) * np.i0(MipChain.KaiserBeta * np.sqrt(window)) / np.i0(MipChain.KaiserBeta)
+        return np.where(np.abs(distance) < radius, weights, 0.0).astype(np.float32)
+
+    @staticmethod
+    def __Resample(data: np.ndarray, axis: int, size: int, mipFilter: int) -> np.ndarray:
+        '''Shrinks `data` along `axis` to `size` samples with a separable filter, clamping at the edges'''
+        length = data.shape[axis]
+        if length == size: return data
+
+        scale = length / size
+        radius = 0.5 if mipFilter == MipFilter.Box else MipChain.KaiserRadius
+        taps = int(ceil(radius * scale)) + 1
+
+        centers = (np.arange(size) + 0.5) * scale - 0.5
+        indices = np.floor(centers).astype(np.int64)[:, None] + np.arange(-taps + 1, taps + 1)[None, :]
+        weights = MipChain.__Weights((indices - centers[:, None]) / scale, mipFilter)
+        weights /= weights.sum(axis=1, keepdims=True)
+        indices = np.clip(indices, 0, length - 1)
+
+        shape = [ 1 ] * data.ndim
+        shape[axis] = size
+
+        # One tap at a time keeps the temporaries at the size of the result
+        result = None
+        for tap in range(indices.shape[1]):
+            if not weights[:, tap].any(): continue
+            contribution = np.take(data, indices[:, tap], axis=axis) * weights[:, tap].reshape(shape)
+            result = contribution if result is None else result + contribution
+
+        return result
+
+    @staticmethod
+    def Generate(pixels: np.ndarray, mipFilter: int=MipFilter.Kaiser) -> List[np.ndarray]:
+        '''Returns every level of `pixels` ((height, width, 4) uint8), filtered in linear space'''
+        levels = [ pixels ]
+
+        linear = pixels.astype(np.float32) / 255.0
+        linear[..., :3] **= MipChain.Gamma
+
+        for width, height in MipChain.LevelSizes(pixels.shape[1], pixels.shape[0])[1:]:
+            # Each level is filtered from the previous one
+            linear = MipChain.__Resample(linear, 0, height, mipFilter)
+            linear = MipChain.__Resample(linear, 1, width , mipFilter)
+            linear = np.clip(linear, 0.0, 1.0)
+
+            level = linear.copy()
+            level[..., :3] **= 1.0 / MipChain.Gamma
+            levels.append((level * 255.0 + 0.5).astype(np.uint8))
+
+        return levels
+
+    @staticmethod
+    def Cached(path: str, mipFilter: int=MipFilter.Kaiser):
+        '''Returns the cached MipChain of the image at `path` or None'''
+        key = MipChain.CacheKey(path, mipFilter)
+
+        # Written after every level, without it the chain is still being (or was never completely) written
+        if not os.path.isfile(MipChain.CompletePath(key)): return None
+
+        level0 = np.load(MipChain.LevelPath(key, 0), mmap_mode="r")
+        return MipChain(key, MipChain.LevelSizes(level0.shape[1], level0.shape[0]))
+
+    @staticmethod
+    def Load(path: str, pixels: np.ndarray, mipFilter: int=MipFilter.Kaiser):
+        '''
+        Returns the MipChain of the image at `path`, generating it from `pixels` if it is not cached yet.
+        Meant to be called from the TextureLoader's worker threads.
+        '''
+        chain = MipChain.Cached(path, mipFilter)
+        if chain is not None: return chain
+
+        chain = MipChain(MipChain.CacheKey(path, mipFilter), MipChain.LevelSizes(pixels.shape[1], pixels.shape[0]))
+        levels = MipChain.Generate(pixels, mipFilter)
+
+        for level in range(chain.LevelCount):
+            MipChain.__Write(MipChain.LevelPath(chain.Key, level), lambda f: np.save(f, levels[level]))
+        MipChain.__Write(MipChain.CompletePath(chain.Key), lambda f: None)
+
+        return chain
+
+    def Preload(self, firstLevel: int) -> None:
+        '''Reads the levels from `firstLevel` on into memory, so that uploading them does not touch the disk'''
+        for level in range(firstLevel, self.LevelCount):
+            self.__Levels[level] = np.load(MipChain.LevelPath(self.__Key, level))
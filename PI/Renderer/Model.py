@@ -0,0 +1,57 @@
+from ..Logging.logger import PI_CORE_ASSERT, PI_CORE_WARN
+from .Mesh import Mesh
+from .MeshData import MeshData
+
+from typing import List
+import os
+
+class Model:
+    '''
+    Every submesh of a model file with its material, built from a single parse (see `MeshData.Load`).
+    Components reference a submesh by the model's path and the submesh's index.
+    '''
+    __slots__ = "__Path", "__Name", "__Meshes"
+
+    def __init__(self, path: str, meshes: List[Mesh]) -> None:
+        self.__Path = path
+        self.__Name = os.path.splitext(os.path.basename(path))[0]
+        self.__Meshes = meshes
+
+    @staticmethod
+    def Load(path: str): return Model(path, Mesh.Load(path))
+
+    @staticmethod
+    def FromData(data: MeshData, path: str): return Model(path, Mesh.FromData(data, path))
+
+    @property
+    def Path(self) -> str: return self.__Path
+    @property
+    def Name(self) -> str: return self.__Name
+    @property
+    def Meshes(self) -> List[Mesh]: return self.__Meshes
+    @property
+    def SubmeshCount(self) -> int: return len(self.__Meshes)
+    @property
+    def GPUBytes(self) -> int: return sum(mesh.GPUBytes for mesh in self.__Meshes)
+
+    def Submesh(self, index: int) -> Mesh:
+        PI_CORE_ASSERT(0 <= index < len(self.__Meshes), "Model: {} has no submesh {}", self.__Path, index)
+        return self.__Meshes[index]
+
+    def ValidSubmesh(self, index: int) -> int:
+        '''`index`, or 0 if the model has no such submesh (e.g. a scene saved before the file was re-exported with fewer parts)'''
+        if 0 <= index < len(self.__Meshes): return index
+
+        PI_CORE_WARN("Model: {} has no submesh {}, using submesh 0 instead", self.__Path, index)
+        return 0
+
+    def _Replace(self, other) -> None:
+        '''
+        Swaps in the submeshes of `other` (a reimport of the same file) in place, so that the meshes and materials
+        components hold stay valid. Submeshes the file no longer has keep their old data.
+        '''
+        for mesh, new in zip(self.__Meshes, other.Meshes): mesh._Replace(new)
+        self.__Meshes += other.Meshes[len(self.__Meshes):]
+
+        if other.SubmeshCount < len(self.__Meshes):
+            PI_CORE_WARN("Model: {} has {} submeshes less after reloading", self.__Path, len(self.__Meshes) - other.SubmeshCount)
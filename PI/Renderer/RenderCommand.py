@@ -24,6 +24,10 @@ class RenderCommand:
     def SetClearColor(*args) -> None: RenderCommand.__RendererAPI.SetClearColor(*args)
     @staticmethod
     def Clear() -> None: RenderCommand.__RendererAPI.Clear()
+    @staticmethod
+    def ClearColor() -> None: RenderCommand.__RendererAPI.ClearColor()
+    @staticmethod
+    def ClearDepth() -> None: RenderCommand.__RendererAPI.ClearDepth()
 
     @staticmethod
     def DrawIndexed(vertexArray, indices: int=None) -> None:
@@ -38,8 +42,18 @@ class RenderCommand:
     @staticmethod
     def Resize(x: int, y: int, width: int, height: int) -> None: RenderCommand.__RendererAPI.Resize(x, y, width, height)
     @staticmethod
+    def GetViewport() -> tuple: return RenderCommand.__RendererAPI.GetViewport()
+    @staticmethod
     def EnableDepth() -> None: RenderCommand.__RendererAPI.EnableDepth()
     @staticmethod
     def EnableBlending() -> None: RenderCommand.__RendererAPI.EnableBlending()
     @staticmethod
     def EnableCulling() -> None: RenderCommand.__RendererAPI.EnableCulling()
+    @staticmethod
+    def SetDepthWrite(enabled: bool) -> None: RenderCommand.__RendererAPI.SetDepthWrite(enabled)
+
+    @staticmethod
+    def BindRenderTargets(colorAttachments: list, depthAttachment: int=0, samples: int=1) -> None:
+        RenderCommand.__RendererAPI.BindRenderTargets(colorAttachments, depthAttachment, samples)
+    @staticmethod
+    def UnbindRenderTargets() -> None: RenderCommand.__RendererAPI.UnbindRenderTargets()
@@ -0,0 +1,298 @@
+from .RenderCommand    import RenderCommand
+from .RenderTargetPool import RenderTargetPool
+from ..Core.StateManager import StateManager
+from ..Logging.logger    import PI_CORE_ASSERT
+
+from heapq  import heappush, heappop
+from time   import perf_counter
+from typing import Callable, Dict, List, Set, Tuple
+
+class RenderGraph:
+    '''
+    Describes a frame as a set of passes that read and write named render targets.
+
+    `Compile` orders the passes by their dependencies, culls the passes whose results are never used
+    and aliases transient targets whose lifetimes do not overlap onto the same texture.
+    `Execute` then runs the surviving passes through `RenderCommand`, timing each of them.
+
+    Example (depth pre-pass, main color pass and an editor only ID pass, the shaders write the IDs to their second
+    output, see `EditorLayer` for the editor's frame):
+
+        graph = RenderGraph(width, height)
+        graph.CreateTexture("Depth"   , TextureFormat.DEPTH      )
+        graph.CreateTexture("Color"   , TextureFormat.RGBA8      )
+        graph.CreateTexture("EntityID", TextureFormat.RED_INTEGER)
+
+        graph.AddPass("DepthPrePass", DrawDepth).DepthStencil("Depth")
+        graph.AddPass("ColorPass"   , DrawLit  ).Write("Color").DepthStencil("Depth", readOnly=True)
+        graph.AddPass("IDPass"      , DrawIDs, editorOnly=True) \
+            .Write("EntityID", attachment=1).DepthStencil("Depth", readOnly=True)
+
+        graph.SetOutput("Color", "EntityID")
+        graph.Compile(editor=True)
+        graph.Execute()
+    '''
+    class Resource:
+        __slots__ = "Name", "Format", "Width", "Height", "Samples", "RendererID"
+
+        def __init__(self, name: str, textureFormat: int, width: int, height: int, samples: int, rendererID: int=0) -> None:
+            self.Name, self.Format = name, textureFormat
+            self.Width, self.Height, self.Samples = width, height, samples
+
+            # Imported resources are owned by someone else and have a fixed RendererID
+            self.RendererID = rendererID
+
+        @property
+        def Imported(self) -> bool: return self.RendererID != 0
+
+    class Pass:
+        __slots__ = "Name", "Execute", "EditorOnly", "SideEffects", \
+            "Reads", "Writes", "Attachments", "Depth", "DepthReadOnly"
+
+        def __init__(self, name: str, execute: Callable, editorOnly: bool, sideEffects: bool) -> None:
+            self.Name = name
+            self.Execute = execute
+            self.EditorOnly = editorOnly
+            self.SideEffects = sideEffects
+
+            self.Reads  : List[str] = []
+            self.Writes : List[str] = []
+            self.Attachments : List[int] = []   # The color attachment of each of `Writes`
+
+            self.Depth         : str  = None
+            self.DepthReadOnly : bool = False
+
+        def Read(self, resource: str):
+            '''Samples `resource` in this pass'''
+            if resource not in self.Reads: self.Reads.append(resource)
+            return self
+
+        def Write(self, resource: str, attachment: int=None):
+            '''
+            Renders into `resource`, as color `attachment` (by default the one after the last declared). The
+            attachments in between are left empty, e.g. to only keep a shader's second output.
+            '''
+            if resource in self.Writes: return self
+
+            self.Writes.append(resource)
+            self.Attachments.append(attachment if attachment is not None else max(self.Attachments, default=-1) + 1)
+            return self
+
+        def DepthStencil(self, resource: str, readOnly: bool=False):
+            '''Uses `resource` as the depth-stencil attachment of this pass'''
+            self.Depth, self.DepthReadOnly = resource, readOnly
+            return self
+
+        @property
+        def Inputs(self) -> List[str]:
+            # A depth attachment is loaded, so it is always an input. It is also an output unless it is read-only.
+            return self.Reads + ([ self.Depth ] if self.Depth else [])
+
+        @property
+        def Outputs(self) -> List[str]:
+            return self.Writes + ([ self.Depth ] if self.Depth and not self.DepthReadOnly else [])
+
+    __slots__ = "__Width", "__Height", "__Resources", "__Passes", "__Outputs", \
+        "__Compiled", "__Aliases", "__Slots", "__Textures", "__Timings"
+
+    def __init__(self, width: int=1, height: int=1) -> None:
+        self.__Width, self.__Height = int(width), int(height)
+
+        self.__Resources : Dict[str, RenderGraph.Resource] = {}
+        self.__Passes    : List[RenderGraph.Pass] = []
+        self.__Outputs   : Set[str] = set()
+
+        self.__Compiled : List[RenderGraph.Pass] = []
+        self.__Aliases  : Dict[str, int] = {}                       # Resource -> physical slot
+        self.__Slots    : List[Tuple[int, int, int, int]] = []      # Physical slot -> (format, width, height, samples)
+        self.__Textures : List[int] = []                            # Physical slot -> texture acquired for this frame
+        self.__Timings  : Dict[str, float] = {}
+
+    @property
+    def Width(self) -> int: return self.__Width
+    @property
+    def Height(self) -> int: return self.__Height
+    @property
+    def CompiledPasses(self) -> List[str]: return [ _pass.Name for _pass in self.__Compiled ]
+    @property
+    def Aliases(self) -> Dict[str, int]: return self.__Aliases
+    @property
+    def Timings(self) -> Dict[str, float]:
+        '''Milliseconds spent submitting each pass in the last `Execute`'''
+        return self.__Timings
+
+    def SetSize(self, width: int, height: int) -> None:
+        '''Resizes every transient resource that follows the size of the graph'''
+        self.__Width, self.__Height = int(width), int(height)
+        if self.__Compiled: self.__Alias()
+
+    def CreateTexture(self, name: str, textureFormat: int, width: int=None, height: int=None, samples: int=1) -> None:
+        '''Declares a transient texture. Without a width and height it follows the size of the graph.'''
+        PI_CORE_ASSERT(name not in self.__Resources, "Resource: {} already exists in the RenderGraph", name)
+        self.__Resources[name] = RenderGraph.Resource(name, textureFormat, width, height, samples)
+
+    def ImportTexture(self, name: str, rendererID: int, textureFormat: int, width: int, height: int, samples: int=1) -> None:
+        '''Makes an externally owned texture usable by the passes'''
+        PI_CORE_ASSERT(name not in self.__Resources, "Resource: {} already exists in the RenderGraph", name)
+        self.__Resources[name] = RenderGraph.Resource(name, textureFormat, width, height, samples, rendererID)
+
+    def SetImportedTexture(self, name: str, rendererID: int, width: int, height: int) -> None:
+        '''Points an imported resource to another texture, e.g. once its owner reallocated it'''
+        resource = self.__Resources[name]
+        PI_CORE_ASSERT(resource.Imported, "Resource: {} is not imported", name)
+        resource.RendererID, resource.Width, resource.Height = rendererID, width, height
+
+    def AddPass(self, name: str, execute: Callable, editorOnly: bool=False, sideEffects: bool=False) -> Pass:
+        '''
+        `execute(graph, pass)` is called with the pass' targets bound.
+        Passes with `sideEffects` are never culled.
+        '''
+        _pass = RenderGraph.Pass(name, execute, editorOnly, sideEffects)
+        self.__Passes.append(_pass)
+        return _pass
+
+    def SetOutput(self, *names: str) -> None:
+        for name in names: self.__Outputs.add(name)
+
+    def __ResourceSize(self, resource: Resource) -> Tuple[int, int]:
+        width  = self.__Width  if resource.Width  is None else resource.Width
+        height = self.__Height if resource.Height is None else resource.Height
+        return int(width), int(height)
+
+    def __Sort(self, passes: List[Pass]) -> List[Pass]:
+        '''
+        Topologically sorts the passes. Dependencies follow the declaration order of each resource:
+        a reader depends on the previous writer, a writer on the previous writer and the readers since.
+        '''
+        dependencies: List[Set[int]] = [ set() for _ in passes ]
+        lastWriter  : Dict[str, int] = {}
+        readers     : Dict[str, List[int]] = {}
+
+        for index, _pass in enumerate(passes):
+            for resource in _pass.Inputs:
+                if resource in lastWriter: dependencies[index].add(lastWriter[resource])
+                readers.setdefault(resource, []).append(index)
+
+            for resource in _pass.Outputs:
+                if resource in lastWriter: dependencies[index].add(lastWriter[resource])
+                dependencies[index].update(readers.get(resource, []))
+                lastWriter[resource], readers[resource] = index, []
+
+            dependencies[index].discard(index)
+
+        dependents: List[List[int]] = [ [] for _ in passes ]
+        for index, deps in enumerate(dependencies):
+            for dependency in deps: dependents[dependency].append(index)
+
+        remaining = [ len(deps) for deps in dependencies ]
+        ready = [ index for index, count in enumerate(remaining) if count == 0 ]
+        order = []
+
+        # Ties are broken by the declaration order
+        while ready:
+            index = heappop(ready)
+            order.append(passes[index])
+
+            for dependent in dependents[index]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0: heappush(ready, dependent)
+
+        PI_CORE_ASSERT(len(order) == len(passes), "RenderGraph has a cyclic dependency!")
+        return order
+
+    def __Cull(self, passes: List[Pass]) -> List[Pass]:
+        needed = set(self.__Outputs)
+        alive  = []
+
+        for _pass in reversed(passes):
+            if not _pass.SideEffects and not any(resource in needed for resource in _pass.Outputs): continue
+            alive.append(_pass)
+
+            # A pass that overwrites a resource without loading it makes the earlier writers redundant
+            for resource in _pass.Outputs:
+                if resource not in _pass.Inputs: needed.discard(resource)
+
+            needed.update(_pass.Inputs)
+
+        alive.reverse()
+        return alive
+
+    def __Alias(self) -> None:
+        lifetimes: Dict[str, List[int]] = {}
+
+        for index, _pass in enumerate(self.__Compiled):
+            for resource in _pass.Inputs + _pass.Outputs:
+                PI_CORE_ASSERT(resource in self.__Resources, "Unknown resource: {} used by pass: {}", resource, _pass.Name)
+                lifetime = lifetimes.setdefault(resource, [index, index])
+                lifetime[1] = index
+
+        # Outputs have to survive till the end of the frame
+        for resource in self.__Outputs:
+            if resource in lifetimes: lifetimes[resource][1] = len(self.__Compiled)
+
+        self.__Aliases = {}
+        self.__Slots   = []
+        slotEnds: List[int] = []
+
+        transients = [ name for name in lifetimes.keys() if not self.__Resources[name].Imported ]
+        for name in sorted(transients, key=lambda name: lifetimes[name][0]):
+            resource = self.__Resources[name]
+            key = (resource.Format, *self.__ResourceSize(resource), max(int(resource.Samples), 1))
+            first, last = lifetimes[name]
+
+            for slot, slotKey in enumerate(self.__Slots):
+                if slotKey == key and slotEnds[slot] < first: break
+            else:
+                slot = len(self.__Slots)
+                self.__Slots.append(key)
+                slotEnds.append(last)
+
+            slotEnds[slot] = last
+            self.__Aliases[name] = slot
+
+    def Compile(self, editor: bool=True) -> None:
+        passes = [ _pass for _pass in self.__Passes if editor or not _pass.EditorOnly ]
+
+        self.__Compiled = self.__Cull(self.__Sort(passes))
+        self.__Alias()
+
+    def GetTexture(self, name: str) -> int:
+        '''Returns the texture backing `name` for the current frame'''
+        resource = self.__Resources[name]
+        if resource.Imported: return resource.RendererID
+        return self.__Textures[self.__Aliases[name]]
+
+    def Release(self) -> None:
+        '''Returns the textures of the last frame to the RenderTargetPool'''
+        for texture in self.__Textures: RenderTargetPool.Release(texture)
+        self.__Textures = []
+
+    def Execute(self) -> None:
+        # The outputs of the previous frame are kept alive till now
+        self.Release()
+        self.__Textures = [ RenderTargetPool.Acquire(*key) for key in self.__Slots ]
+        self.__Timings  = {}
+
+        for _pass in self.__Compiled:
+            start = perf_counter()
+
+            colors = [ 0 ] * (max(_pass.Attachments, default=-1) + 1)
+            for resource, attachment in zip(_pass.Writes, _pass.Attachments): colors[attachment] = self.GetTexture(resource)
+            depth = self.GetTexture(_pass.Depth) if _pass.Depth else 0
+
+            attachments = _pass.Writes + ([ _pass.Depth ] if _pass.Depth else [])
+            readOnly = _pass.Depth is not None and _pass.DepthReadOnly
+
+            if attachments:
+                resource = self.__Resources[attachments[0]]
+                RenderCommand.BindRenderTargets(colors, depth, max(int(resource.Samples), 1))
+                RenderCommand.Resize(0, 0, *self.__ResourceSize(resource))
+            if readOnly: RenderCommand.SetDepthWrite(False)
+
+            _pass.Execute(self, _pass)
+
+            if readOnly: RenderCommand.SetDepthWrite(True)
+            if attachments: RenderCommand.UnbindRenderTargets()
+            self.__Timings[_pass.Name] = (perf_counter() - start) * 1000.0
+
+        StateManager.Stats.RenderPasses = self.__Timings
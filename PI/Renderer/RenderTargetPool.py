@@ -0,0 +1,108 @@
+from .RendererAPI import RendererAPI
+from .Texture     import TextureFormat
+from ..Logging.logger import PI_CORE_ASSERT
+
+from typing import Dict, List, Tuple
+
+class RenderTargetPool:
+    '''
+    Hands out transient render target textures keyed by (format, width, height, samples).
+
+    Released targets are kept around for `MaxIdleFrames` frames so that the next request
+    for the same key (next frame, another pass or a resized framebuffer) reuses the GPU memory
+    instead of reallocating it.
+    '''
+    class _Entry:
+        __slots__ = "RendererID", "Key", "LastUsedFrame"
+
+        def __init__(self, rendererID: int, key: Tuple[int, int, int, int]) -> None:
+            self.RendererID    = rendererID
+            self.Key           = key
+            self.LastUsedFrame = 0
+
+    __slots__ = ("__NativeAPI",)
+
+    __Free  : Dict[Tuple[int, int, int, int], List[_Entry]] = {}
+    __InUse : Dict[int, _Entry] = {}
+    __Frame : int = 0
+
+    MaxIdleFrames: int = 3
+
+    @staticmethod
+    def Init() -> None:
+        if (RendererAPI.GetAPI() == RendererAPI.API.Null):
+            PI_CORE_ASSERT(False, "RendererAPI.None is currently not supported!")
+            return
+
+        elif (RendererAPI.GetAPI() == RendererAPI.API.OpenGL):
+            from ..Platform.OpenGL.OpenGLRenderTargetPool import OpenGLRenderTargetPool
+            RenderTargetPool.__NativeAPI = OpenGLRenderTargetPool
+            return
+
+        PI_CORE_ASSERT(False, "Unknown RendererAPI!!")
+        return None
+
+    @staticmethod
+    def Acquire(textureFormat: int, width: int, height: int, samples: int=1) -> int:
+        key = (textureFormat, int(width), int(height), max(int(samples), 1))
+
+        freeList = RenderTargetPool.__Free.get(key, None)
+        if freeList: entry = freeList.pop()
+        else: entry = RenderTargetPool._Entry(RenderTargetPool.__NativeAPI.Allocate(*key), key)
+
+        entry.LastUsedFrame = RenderTargetPool.__Frame
+        RenderTargetPool.__InUse[entry.RendererID] = entry
+        return entry.RendererID
+
+    @staticmethod
+    def Release(rendererID: int) -> None:
+        entry = RenderTargetPool.__InUse.pop(rendererID, None)
+        PI_CORE_ASSERT(entry is not None, "Render target {} was not acquired from the pool", rendererID)
+        if entry is None: return
+
+        entry.LastUsedFrame = RenderTargetPool.__Frame
+        RenderTargetPool.__Free.setdefault(entry.Key, []).append(entry)
+
+    @staticmethod
+    def NextFrame() -> None:
+        '''Frees the targets that nobody asked for in the last `MaxIdleFrames` frames'''
+        RenderTargetPool.__Frame += 1
+        oldest = RenderTargetPool.__Frame - RenderTargetPool.MaxIdleFrames
+
+        for key in list(RenderTargetPool.__Free.keys()):
+            entries = RenderTargetPool.__Free[key]
+            alive = [ entry for entry in entries if entry.LastUsedFrame >= oldest ]
+
+            for entry in entries:
+                if entry.LastUsedFrame < oldest: RenderTargetPool.__NativeAPI.Free(entry.RendererID)
+
+            if alive: RenderTargetPool.__Free[key] = alive
+            else: del RenderTargetPool.__Free[key]
+
+    @staticmethod
+    def Clear() -> None:
+        for entries in RenderTargetPool.__Free.values():
+            for entry in entries: RenderTargetPool.__NativeAPI.Free(entry.RendererID)
+
+        RenderTargetPool.__Free = {}
+
+    @staticmethod
+    def GetStats() -> Tuple[int, int, int]:
+        '''Returns (targets in use, idle targets, total bytes held by the pool)'''
+        free = [ entry for entries in RenderTargetPool.__Free.values() for entry in entries ]
+        allEntries = free + list(RenderTargetPool.__InUse.values())
+
+        size = 0
+        for entry in allEntries:
+            textureFormat, width, height, samples = entry.Key
+            size += width * height * samples * RenderTargetPool.BytesPerPixel(textureFormat)
+
+        return len(RenderTargetPool.__InUse), len(free), size
+
+    @staticmethod
+    def BytesPerPixel(textureFormat: int) -> int:
+        # RGBA8, R32I and DEPTH24_STENCIL8 all take 4 bytes per texel
+        if textureFormat in (TextureFormat.RGBA8, TextureFormat.RED_INTEGER, TextureFormat.DEPTH24STENCIL8): return 4
+
+        PI_CORE_ASSERT(False, "Unknown render target format!")
+        return 0
@@ -8,8 +8,12 @@ from .RenderCommand import RenderCommand
 from .VertexArray   import VertexArray
 from .Buffer        import VertexBuffer, IndexBuffer
 from .Shader        import Shader
-from .Texture       import Texture
+from .Texture       import Texture, Texture2D
+from .TextureLoader import TextureLoader
+from .TextureResidency import TextureResidency
+from .UploadQueue   import UploadQueue
 from .Framebuffer   import Framebuffer
+from .RenderTargetPool import RenderTargetPool
 from .UniformBuffer import UniformBuffer
 
 import pyrr
@@ -36,8 +40,9 @@ class Renderer:
         Shader  .Init()
         Texture .Init()
 
-        UniformBuffer .Init()
-        Framebuffer   .Init()
+        UniformBuffer    .Init()
+        RenderTargetPool .Init()
+        Framebuffer      .Init()
         
         # Renderer.__CurrentSceneData.CameraUniformBuffer  = UniformBuffer.Create(80, 0) # cameraMatrix.nbytes -> 80
 
@@ -51,7 +56,6 @@ class Renderer:
     @staticmethod
     def BeginScene(scene, camera=None):
         Renderer.__CurrentSceneData = Renderer.SceneData()
-        if PI_DEBUG: StateManager.Stats.Reset()
 
         if camera is None:
             camera = scene.PrimaryCameraEntity
@@ -140,6 +144,26 @@ class Renderer:
         Renderer.__CurrentSceneData.Scene.Draw()
         return Renderer
 
+    @staticmethod
+    def OnFrameBegin():
+        # A frame can draw a scene more than once (e.g. a pass of a `RenderGraph` each), the stats add up
+        if PI_DEBUG: StateManager.Stats.Reset()
+        return Renderer
+
+    @staticmethod
+    def OnFrameEnd():
+        RenderTargetPool.NextFrame()
+        Texture2D.ProcessUploads()
+        UploadQueue.Process()
+        TextureResidency.Update()
+        return Renderer
+
+    @staticmethod
+    def Shutdown():
+        TextureLoader.Shutdown()
+        UploadQueue.Clear()
+        return Renderer
+
     @staticmethod
     def OnResize(width: int, height: int):
         RenderCommand.Resize(0, 0, width, height)
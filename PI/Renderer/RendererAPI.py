@@ -26,6 +26,10 @@ class RendererAPI:
     @staticmethod
     def Clear() -> None: ...
     @staticmethod
+    def ClearColor() -> None: ...
+    @staticmethod
+    def ClearDepth() -> None: ...
+    @staticmethod
     def DrawIndexed(vertexArray, indices: int=None) -> None: ...
     @staticmethod
     def DrawLines(vertexArray, indices: int) -> None: ...
@@ -35,6 +39,14 @@ class RendererAPI:
     def EnableBlending() -> None: ...
     @staticmethod
     def EnableCulling() -> None: ...
+    @staticmethod
+    def SetDepthWrite(enabled: bool) -> None: ...
+    @staticmethod
+    def BindRenderTargets(colorAttachments: list, depthAttachment: int=0, samples: int=1) -> None: ...
+    @staticmethod
+    def UnbindRenderTargets() -> None: ...
+    @staticmethod
+    def GetViewport() -> tuple: ...
 
     @staticmethod
     def GetAPI() -> int: return RendererAPI.__API
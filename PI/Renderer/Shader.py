@@ -4,10 +4,16 @@ from ..Core.StateManager import StateManager
 from .RendererAPI import RendererAPI
 
 import pyrr
+import weakref
+import os
 from abc import ABC, abstractmethod
+from typing import Dict
 
 class Shader(ABC):
-    __slots__ = ("__NativeAPI", "_Path")
+    __slots__ = ("__NativeAPI", "_Path", "__weakref__")
+
+    # Every live shader by its normalized path, so that they can be recompiled when their file changes
+    __Loaded: Dict[str, weakref.WeakSet] = {}
 
     @staticmethod
     def Init() -> None:
@@ -51,7 +57,19 @@ class Shader(ABC):
     def Bind(self) -> None: ...
     @abstractmethod
     def Unbind(self) -> None: ...
+    @abstractmethod
+    def Reload(self) -> bool:
+        '''Recompiles the shader from its file, the old program is kept if that fails'''
+        ...
 
     @staticmethod
     def Create(shaderFile: str):
-        return Shader.__NativeAPI(shaderFile)
+        shader = Shader.__NativeAPI(shaderFile)
+        Shader.__Loaded.setdefault(os.path.normcase(os.path.abspath(shaderFile)), weakref.WeakSet()).add(shader)
+        return shader
+
+    @staticmethod
+    def ReloadFile(shaderFile: str) -> int:
+        '''Recompiles every live shader created from `shaderFile`. Returns the number of shaders reloaded.'''
+        shaders = Shader.__Loaded.get(os.path.normcase(os.path.abspath(shaderFile)), ())
+        return sum(shader.Reload() for shader in list(shaders))
@@ -1,6 +1,9 @@
 from ..Logging.logger import PI_CORE_ASSERT
 from ..Core.Constants import *
 from .RendererAPI import RendererAPI
+from .TextureLoader import TextureLoader
+from .TextureResidency import TextureResidency
+from .MipChain import MipFilter
 
 from multipledispatch import dispatch
 
@@ -18,12 +21,19 @@ class TextureSpecification:
     def __init__(self, format: int=PIConstants.RGBA,
         textureSize: int=PIConstants.RGBA8, dataType: int=PIConstants.UNSIGNED_BYTE,
         wrapS: int=PIConstants.REPEAT, wrapT: int=PIConstants.REPEAT, wrapR: int=PIConstants.REPEAT,
-        magFilter: int=PIConstants.LINEAR, minFilter: int=PIConstants.LINEAR
+        magFilter: int=PIConstants.LINEAR, minFilter: int=PIConstants.LINEAR,
+        asyncLoad: bool=False, mipmaps: bool=False, mipFilter: int=MipFilter.Kaiser
     ) -> None:
         self.TextureFormat, self.TextureSize, self.DataType = format, textureSize, dataType
         self.WrapS, self.WrapT, self.WrapR = wrapS, wrapT, wrapR
         self.MagFilter, self.MinFilter     = magFilter, minFilter
 
+        # Decodes the image on a worker thread, the texture shows a placeholder till it is uploaded
+        self.AsyncLoad = asyncLoad
+
+        # Generates (and caches) the full mip chain, the resident levels are then managed by TextureResidency
+        self.Mipmaps, self.MipFilter = mipmaps, mipFilter
+
 class Texture:
     @staticmethod
     def Init() -> None: Texture2D.Init()
@@ -36,7 +46,16 @@ class Texture:
     def Width(self) -> int: pass
     @property
     def Height(self) -> int: pass
+    @property
+    def IsLoaded(self) -> bool: return True
+    @property
+    def IsUploading(self) -> bool: return False
+    @property
+    def CPUBytes(self) -> int: return 0
+    @property
+    def GPUBytes(self) -> int: return 0
     def SetData(self, data, size) -> None: pass
+    def Reload(self) -> None: pass
     def Bind(self, slot: int=0) -> None: pass
     def Unbind(self) -> None: pass
 
@@ -61,11 +80,16 @@ class Texture2D(Texture):
     @dispatch(str)
     def Create(texturePath: str): return Texture2D.__NativeAPI(texturePath, TextureSpecification())
     @staticmethod
-    @dispatch(str, int)
+    @dispatch(str, TextureSpecification)
     def Create(texturePath: str, spec: TextureSpecification): return Texture2D.__NativeAPI(texturePath, spec)
     @staticmethod
     @dispatch(int, int)
     def Create(width: int, height: int): return Texture2D.__NativeAPI(width, height, TextureSpecification())
     @staticmethod
-    @dispatch(int, int, int)
+    @dispatch(int, int, TextureSpecification)
     def Create(width: int, height: int, spec: TextureSpecification): return Texture2D.__NativeAPI(width, height, spec)
+
+    @staticmethod
+    def ProcessUploads() -> int:
+        '''Uploads the textures that finished decoding in the background, has to be called from the main thread'''
+        return TextureLoader.ProcessUploads()
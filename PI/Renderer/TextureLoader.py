@@ -0,0 +1,103 @@
+from ..Logging.logger import PI_CORE_ERROR
+from .MipChain import MipChain
+from .TextureResidency import TextureResidency
+
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, List, Tuple
+import weakref
+import os
+
+import numpy as np
+
+class TextureLoader:
+    '''
+    Decodes images on a pool of worker threads (Pillow releases the GIL while decoding).
+
+    The decoded pixels are handed back to the texture on the main thread through `ProcessUploads`,
+    which is called once per frame, since the GL context can only be used from there.
+    '''
+    __slots__ = ()
+
+    MaxWorkers: int = min(4, os.cpu_count() or 1)
+
+    # Takes over `Submit` when set (see `ImportService.Init`), called with the same arguments
+    Importer: Callable[..., None] = None
+
+    __Pool    : ThreadPoolExecutor = None
+    __Pending : List[Tuple[weakref.ref, Future]] = []
+
+    @staticmethod
+    def Decode(image) -> np.ndarray:
+        '''
+        Returns the image as a (height, width, 4) uint8 array, bottom row first.
+        The flip is a view, it is only made contiguous once, on the calling thread.
+        '''
+        if image.mode != "RGBA": image = image.convert("RGBA")
+
+        pixels = np.asarray(image)
+        return np.ascontiguousarray(pixels[::-1])
+
+    @staticmethod
+    def DecodeInto(image, pixels: np.ndarray) -> None:
+        '''Same as `Decode`, but writes into `pixels` ((height, width, 4) uint8) instead of a new array'''
+        if image.mode != "RGBA": image = image.convert("RGBA")
+        pixels[...] = np.asarray(image)[::-1]
+
+    @staticmethod
+    def Load(path: str, image, spec):
+        '''Returns the decoded pixels or, for mipmapped textures, the (cached) MipChain with its initial levels loaded'''
+        if not spec.Mipmaps: return TextureLoader.Decode(image)
+
+        # A cached chain does not need the image to be decoded at all
+        chain = MipChain.Cached(path, spec.MipFilter)
+        if chain is None: chain = MipChain.Load(path, TextureLoader.Decode(image), spec.MipFilter)
+
+        chain.Preload(TextureResidency.InitialLevel(chain.Sizes))
+        return chain
+
+    @staticmethod
+    def Submit(texture, path: str, image, spec) -> None:
+        '''Loads the already opened `image` in the background and calls `texture._OnDecoded(result)` when done'''
+        if TextureLoader.Importer is not None: return TextureLoader.Importer(texture, path, image, spec)
+
+        if TextureLoader.__Pool is None:
+            TextureLoader.__Pool = ThreadPoolExecutor(TextureLoader.MaxWorkers, thread_name_prefix="PI-TextureLoader")
+
+        future = TextureLoader.__Pool.submit(TextureLoader.Load, path, image, spec)
+        TextureLoader.__Pending.append((weakref.ref(texture), future))
+
+    @staticmethod
+    def ProcessUploads() -> int:
+        '''Uploads every texture that finished decoding. Returns the number of textures still pending.'''
+        pending = []
+
+        for textureRef, future in TextureLoader.__Pending:
+            if not future.done():
+                pending.append((textureRef, future))
+                continue
+
+            # The texture was deleted while it was decoding
+            texture = textureRef()
+            if texture is None: continue
+
+            try:
+                result = future.result()
+            except Exception as e:
+                PI_CORE_ERROR("Failed to decode texture: {} ({})", texture.Path, e)
+                continue
+
+            texture._OnDecoded(result)
+
+        TextureLoader.__Pending = pending
+        return len(pending)
+
+    @staticmethod
+    def PendingCount() -> int: return len(TextureLoader.__Pending)
+
+    @staticmethod
+    def Shutdown() -> None:
+        if TextureLoader.__Pool is None: return
+
+        TextureLoader.__Pool.shutdown(wait=False)
+        TextureLoader.__Pool = None
+        TextureLoader.__Pending = []
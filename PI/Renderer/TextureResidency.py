@@ -0,0 +1,128 @@
+import weakref
+import numpy as np
+from math import log2, floor
+from typing import List, Tuple
+
+class TextureResidency:
+    '''
+    Keeps only the mip levels a streamed texture needs on the GPU.
+
+    Every frame the renderer calls `Request` with the on-screen size (in pixels) a texture is drawn at.
+    `Update` then picks the first mip level of every texture so that it has about one texel per pixel,
+    drops levels of the least recently used textures till everything fits in `Budget`
+    and applies at most `MaxChangesPerFrame` changes (memory is freed before new levels are loaded).
+    '''
+    class _Entry:
+        __slots__ = "Requested", "LastRequested", "LastRequestFrame"
+
+        def __init__(self) -> None:
+            self.Requested        : float = 0.0     # Largest size asked for this frame
+            self.LastRequested    : float = 0.0
+            self.LastRequestFrame : int   = -1
+
+    __slots__ = ()
+
+    Budget             : int = 512 * 1024 * 1024    # Bytes
+    InitialSize        : int = 256                  # Textures are first made resident at (or below) this size
+    MaxChangesPerFrame : int = 2
+    IdleFrames         : int = 300                  # Textures not drawn for this long fall back to `InitialSize`
+
+    __Textures: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+    __Frame   : int = 0
+
+    @staticmethod
+    def Register(texture) -> None: TextureResidency.__Textures[texture] = TextureResidency._Entry()
+
+    @staticmethod
+    def InitialLevel(levelSizes: List[Tuple[int, int]]) -> int:
+        for level, (width, height) in enumerate(levelSizes):
+            if max(width, height) <= TextureResidency.InitialSize: return level
+        return len(levelSizes) - 1
+
+    @staticmethod
+    def ScreenSize(transform: np.ndarray, radius: float, viewProjection: np.ndarray, viewportHeight: int) -> float:
+        '''Approximate on-screen diameter (pixels) of a bounding sphere centered at the origin of `transform`'''
+        transform, viewProjection = np.asarray(transform), np.asarray(viewProjection)
+
+        # Row vectors, as everywhere else in the engine
+        center = transform[3, :3]
+        scale  = np.linalg.norm(transform[:3, :3], axis=1).max()
+        clip   = np.append(center, 1.0) @ viewProjection
+
+        # The camera is inside the sphere
+        if clip[3] <= radius * scale: return float(viewportHeight)
+
+        # The view matrix is orthonormal, so the length of the y column is the projection's y scale
+        projectedRadius = radius * scale * np.linalg.norm(viewProjection[:3, 1]) / clip[3]
+        return float(projectedRadius * viewportHeight)
+
+    @staticmethod
+    def Request(texture, screenSize: float) -> None:
+        if texture is None: return
+
+        entry = TextureResidency.__Textures.get(texture, None)
+        if entry is None: return
+
+        entry.Requested = max(entry.Requested, screenSize)
+        entry.LastRequestFrame = TextureResidency.__Frame
+
+    @staticmethod
+    def __WantedLevel(texture, entry) -> int:
+        sizes = texture.MipLevelSizes
+        if entry.LastRequestFrame < 0 or TextureResidency.__Frame - entry.LastRequestFrame > TextureResidency.IdleFrames:
+            return TextureResidency.InitialLevel(sizes)
+
+        width, height = sizes[0]
+        screenSize = max(entry.LastRequested, 1.0)
+        level = int(floor(log2(max(max(width, height) / screenSize, 1.0))))
+        return min(level, len(sizes) - 1)
+
+    @staticmethod
+    def __Bytes(texture, firstLevel: int) -> int:
+        return sum(width * height * 4 for width, height in texture.MipLevelSizes[firstLevel:])
+
+    @staticmethod
+    def Update() -> None:
+        textures = [ (texture, entry) for texture, entry in TextureResidency.__Textures.items() if texture.IsLoaded ]
+
+        wanted = {}
+        for texture, entry in textures:
+            if entry.Requested > 0.0: entry.LastRequested = entry.Requested
+            entry.Requested = 0.0
+            wanted[texture] = TextureResidency.__WantedLevel(texture, entry)
+
+        # Over budget: coarsen the least recently drawn (then the biggest) textures first
+        total = sum(TextureResidency.__Bytes(texture, level) for texture, level in wanted.items())
+        if total > TextureResidency.Budget:
+            candidates = sorted(textures, key=lambda item: (
+                item[1].LastRequestFrame, -TextureResidency.__Bytes(item[0], wanted[item[0]])
+            ))
+
+            while total > TextureResidency.Budget:
+                changed = False
+                for texture, _ in candidates:
+                    level = wanted[texture]
+                    if level + 1 >= len(texture.MipLevelSizes): continue
+
+                    total -= TextureResidency.__Bytes(texture, level) - TextureResidency.__Bytes(texture, level + 1)
+                    wanted[texture] = level + 1
+                    changed = True
+                    if total <= TextureResidency.Budget: break
+
+                if not changed: break
+
+        # Freeing memory first, then the most recently drawn textures
+        changes = [ (texture, level) for texture, level in wanted.items() if level != texture.ResidentLevel and not texture.IsUploading ]
+        changes.sort(key=lambda change: (
+            change[1] < change[0].ResidentLevel, -TextureResidency.__Textures[change[0]].LastRequestFrame
+        ))
+
+        for texture, level in changes[:TextureResidency.MaxChangesPerFrame]: texture._MakeResident(level)
+
+        TextureResidency.__Frame += 1
+
+    @staticmethod
+    def GetStats() -> Tuple[int, int]:
+        '''Returns (streamed textures, bytes resident on the GPU)'''
+        textures = [ texture for texture in TextureResidency.__Textures.keys() if texture.IsLoaded ]
+        return len(textures), sum(TextureResidency.__Bytes(texture, texture.ResidentLevel) for texture in textures)
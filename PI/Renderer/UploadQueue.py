@@ -0,0 +1,130 @@
+from typing import Any, Callable, List, Tuple
+import weakref
+import time
+
+class UploadQueue:
+    '''
+    Spreads the GPU uploads of streamed resources (model buffers, decoded textures and mip levels) over several frames.
+
+    Resources allocate their GPU storage right away and submit their data as rows, `Process` (once per frame,
+    at its end) then writes as many rows as fit in `ByteBudget` and `TimeBudget`, in submission order.
+    A resource is only drawn once it is resident, its upload's callbacks are called then.
+    '''
+    class Upload:
+        '''
+        Rows of data to upload, split in `parts` of `(rows, rowBytes, write)`: `write(firstRow, rowCount)` uploads
+        a range of a part's rows (e.g. a mip level's or a buffer's bytes, as rows of 1 byte).
+        '''
+        __slots__ = "__Owner", "__Parts", "__Part", "__Row", "__Callbacks", "__OnCancel", "__Done"
+
+        def __init__(self, owner: Any, parts: List[Tuple[int, int, Callable[[int, int], None]]], onCancel: Callable[[], None]=None) -> None:
+            # The upload is dropped (and `onCancel` called to free its GPU storage) if the owner is deleted first
+            self.__Owner = weakref.ref(owner)
+            self.__Parts = [ part for part in parts if part[0] > 0 ]
+            self.__Part, self.__Row = 0, 0
+
+            self.__Callbacks: List[Callable[[Any], None]] = []
+            self.__OnCancel = onCancel
+            self.__Done = False
+
+        @property
+        def IsDone(self) -> bool: return self.__Done
+        @property
+        def Owner(self) -> Any: return self.__Owner()
+        @property
+        def RemainingBytes(self) -> int:
+            if self.__Done: return 0
+
+            remaining = sum(rows * rowBytes for rows, rowBytes, _ in self.__Parts[self.__Part:])
+            return remaining - self.__Row * self.__Parts[self.__Part][1] if self.__Part < len(self.__Parts) else 0
+
+        def AddCallback(self, callback: Callable[[Any], None]) -> None:
+            '''`callback(owner)` is called once every row is uploaded (never if the upload is cancelled)'''
+            if not self.__Done: self.__Callbacks.append(callback)
+            elif self.__Owner() is not None: callback(self.__Owner())
+
+        def Cancel(self) -> None:
+            if self.__Done: return
+            self.__Done = True
+            self.__Callbacks.clear()
+            if self.__OnCancel is not None: self.__OnCancel()
+
+        def _Write(self, maxBytes: int) -> int:
+            '''Uploads at least one row and at most `maxBytes` (whole rows). Returns the number of bytes uploaded.'''
+            rows, rowBytes, write = self.__Parts[self.__Part]
+            count = min(max(1, maxBytes // rowBytes), rows - self.__Row)
+
+            write(self.__Row, count)
+            self.__Row += count
+
+            if self.__Row == rows: self.__Part, self.__Row = self.__Part + 1, 0
+            if self.__Part == len(self.__Parts): self._Finish()
+            return count * rowBytes
+
+        def _Finish(self) -> None:
+            self.__Done = True
+            owner = self.__Owner()
+            if owner is None: return
+
+            for callback in self.__Callbacks: callback(owner)
+            self.__Callbacks.clear()
+
+    __slots__ = ()
+
+    ByteBudget : int   = 8 * 1024 * 1024    # Bytes per frame
+    TimeBudget : float = 4.0                # Milliseconds per frame
+    ChunkSize  : int   = 1024 * 1024        # The time budget is checked between chunks of at most this many bytes
+
+    __Pending      : List[Upload] = []
+    __LastUploaded : int = 0
+
+    @staticmethod
+    def Submit(owner: Any, parts: List[Tuple[int, int, Callable[[int, int], None]]], onCancel: Callable[[], None]=None) -> Upload:
+        upload = UploadQueue.Upload(owner, parts, onCancel)
+        if upload.RemainingBytes == 0: upload._Finish()
+        else: UploadQueue.__Pending.append(upload)
+
+        return upload
+
+    @staticmethod
+    def Process() -> int:
+        '''Uploads pending rows till a budget is used up, has to be called from the main thread. Returns the bytes uploaded.'''
+        start, uploaded = time.perf_counter(), 0
+
+        while UploadQueue.__Pending:
+            upload = UploadQueue.__Pending[0]
+
+            if upload.IsDone or upload.Owner is None:
+                upload.Cancel()
+                UploadQueue.__Pending.pop(0)
+                continue
+
+            # Something is uploaded every frame, however large its rows are
+            if uploaded > 0 and (uploaded >= UploadQueue.ByteBudget or
+                (time.perf_counter() - start) * 1000 >= UploadQueue.TimeBudget): break
+
+            uploaded += upload._Write(min(UploadQueue.ByteBudget - uploaded, UploadQueue.ChunkSize))
+            if upload.IsDone: UploadQueue.__Pending.pop(0)
+
+        UploadQueue.__LastUploaded = uploaded
+        return uploaded
+
+    @staticmethod
+    def Flush() -> None:
+        '''Uploads everything that is pending, regardless of the budgets'''
+        budget = UploadQueue.ByteBudget, UploadQueue.TimeBudget
+        UploadQueue.ByteBudget, UploadQueue.TimeBudget = 1 << 62, float("inf")
+
+        try: UploadQueue.Process()
+        finally: UploadQueue.ByteBudget, UploadQueue.TimeBudget = budget
+
+    @staticmethod
+    def Clear() -> None:
+        for upload in UploadQueue.__Pending: upload.Cancel()
+        UploadQueue.__Pending = []
+
+    @staticmethod
+    def GetStats() -> Tuple[int, int, int]:
+        '''Returns (pending uploads, pending bytes, bytes uploaded last frame)'''
+        pending = [ upload for upload in UploadQueue.__Pending if not upload.IsDone ]
+        return len(pending), sum(upload.RemainingBytes for upload in pending), UploadQueue.__LastUploaded
@@ -7,16 +7,22 @@ from .Shader          import *
 from .Buffer          import *
 from .VertexArray     import *
 from .Texture         import *
+from .TextureResidency import *
+from .UploadQueue     import *
 
 from .RendererAPI     import *
 from .RenderCommand   import *
 
 from .Camera          import *
 from .Mesh            import *
+from .MeshData        import *
+from .Model           import *
 from .Material        import *
 from .Light           import *
 
+from .RenderTargetPool import *
 from .Framebuffer     import *
+from .RenderGraph     import *
 
 from .UniformBuffer   import *
 
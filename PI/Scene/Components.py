@@ -1,13 +1,18 @@
-from ..Logging.logger import PI_CORE_ASSERT
+from ..Logging.logger import PI_CORE_ASSERT, PI_CORE_WARN
 from ..Renderer.Mesh  import Mesh
+from ..Renderer.Model import Model
+from ..Renderer.MeshData import MeshData
 from ..Renderer.Material import Material
 from ..Renderer.Light    import *
 from ..Scripting  import *
 from ..Physics    import *
 from ..AssetManager.AssetManager import AssetManager
+from ..Core.CacheManager import Cache
 from .SceneCamera import SceneCamera
 
+import numpy as np
 import pyrr
+import os
 
 from uuid import UUID
 from uuid import uuid4 as UUIDGenerator
@@ -15,7 +20,7 @@ from uuid import uuid4 as UUIDGenerator
 from multipledispatch import dispatch
 from dataclasses import dataclass
 
-from typing import Callable, TypeVar, Dict, Any
+from typing import Callable, TypeVar, Dict, Tuple, Any
 
 # They are applied to all Entities
 class IDComponent:
@@ -106,6 +111,8 @@ class MeshComponent:
     Path       : str
 
     Initialized: bool = False
+    Submesh    : int  = 0        # Index of the mesh within the model at `Path`
+    AssetUUID  : UUID = None     # The model asset this component holds a reference to
 
     @dispatch(Mesh)
     def __init__(self, mesh: Mesh) -> None:
@@ -118,18 +125,33 @@ class MeshComponent:
     def __init__(self, path: str) -> None:
         self.Path: str  = AssetManager.GetInstance().GetAbsolutePath(path)
 
+    @dispatch(str, int)
+    def __init__(self, path: str, submesh: int) -> None:
+        self.Path: str  = AssetManager.GetInstance().GetAbsolutePath(path)
+        self.Submesh    = submesh
+
     def Init(self) -> None:
         if self.Path == ".": return
         if AssetManager.GetInstance().GetRelativePath(self.Path) != '.' and not self.Initialized:
-            mesh = AssetManager.GetInstance().Load(AssetManager.AssetType.MeshAsset, self.Path)
-            self.MeshObject: Mesh = AssetManager.GetInstance().Get(mesh)
+            self.AssetUUID = AssetManager.GetInstance().Load(AssetManager.AssetType.MeshAsset, self.Path)
+            AssetManager.GetInstance().Acquire(self.AssetUUID)
+
+            model: Model = AssetManager.GetInstance().Get(self.AssetUUID)
+            self.Submesh = model.ValidSubmesh(self.Submesh)
+            self.MeshObject: Mesh = model.Submesh(self.Submesh)
             self.Name = self.MeshObject.Name
 
             self.Initialized = True
 
+    def Release(self) -> None:
+        '''Gives up the reference to the mesh asset, so that it can be evicted'''
+        if self.AssetUUID is None: return
+        AssetManager.GetInstance().Release(self.AssetUUID)
+        self.AssetUUID = None
+
     def __str__(self) -> str: return self.Name
 
-    def Copy(self, recipientEntity): return MeshComponent(self.Path)
+    def Copy(self, recipientEntity): return MeshComponent(self.Path, self.Submesh)
 class MaterialComponent:
     MaterialObject : Material
     Textured       : bool = False
@@ -137,6 +159,8 @@ class MaterialComponent:
     Path           : str
 
     Initialized: bool = False
+    Submesh    : int  = 0        # Index of the mesh, within the model at `Path`, the material belongs to
+    AssetUUID  : UUID = None
 
     @dispatch(Material)
     def __init__(self, material: Material) -> None:
@@ -152,10 +176,21 @@ class MaterialComponent:
     def __init__(self, path: str) -> None:
         self.Path: str = path
 
+    @dispatch(str, int)
+    def __init__(self, path: str, submesh: int) -> None:
+        self.Path: str = path
+        self.Submesh   = submesh
+
     def Init(self) -> None:
         if self.Path == ".": return
         if AssetManager.GetInstance().GetRelativePath(self.Path) != '.' and not self.Initialized:
-            mesh: Mesh = AssetManager.GetInstance().Get(self.Path)
+            # Goes through the AssetManager, so the textures are shared with every other user of the mesh
+            self.AssetUUID = AssetManager.GetInstance().Load(AssetManager.AssetType.MeshAsset, self.Path)
+            AssetManager.GetInstance().Acquire(self.AssetUUID)
+            model: Model = AssetManager.GetInstance().Get(self.AssetUUID)
+            self.Submesh = model.ValidSubmesh(self.Submesh)
+            mesh: Mesh = model.Submesh(self.Submesh)
+
             self.MaterialObject: Material = mesh.Material
             self.Name = self.MaterialObject.Name
 
@@ -163,9 +198,14 @@ class MaterialComponent:
 
             self.Initialized = True
 
+    def Release(self) -> None:
+        if self.AssetUUID is None: return
+        AssetManager.GetInstance().Release(self.AssetUUID)
+        self.AssetUUID = None
+
     def __str__(self) -> str: return self.Name
 
-    def Copy(self, recipientEntity): return MaterialComponent(self.Path)
+    def Copy(self, recipientEntity): return MaterialComponent(self.Path, self.Submesh)
 class LightComponent:
     @dataclass(frozen=True)
     class TypeEnum:
@@ -211,6 +251,14 @@ class ScriptComponent:
     OnAttach: Callable[[], None]
     OnDetach: Callable[[], None]
     OnUpdate: Callable[[float], None]
+    OnFixedUpdate: Callable[[float], None]
+
+    OnCollisionEnter : Callable[[Collision], None]
+    OnCollisionStay  : Callable[[Collision], None]
+    OnCollisionExit  : Callable[[Collision], None]
+    OnTriggerEnter   : Callable[[Any], None]
+    OnTriggerStay    : Callable[[Any], None]
+    OnTriggerExit    : Callable[[Any], None]
 
     def __init__(self, module: str, name: str, entity) -> None:
         self.Entity = entity
@@ -227,11 +275,22 @@ class ScriptComponent:
             return
 
         self.Script.Bind(self.Entity)
-        self.Script.BindFunctions("OnAttach", "OnDetach", "OnUpdate")
+        self.Script.BindFunctions(
+            "OnAttach", "OnDetach", "OnUpdate", "OnFixedUpdate",
+            "OnCollisionEnter", "OnCollisionStay", "OnCollisionExit", "OnTriggerEnter", "OnTriggerStay", "OnTriggerExit"
+        )
 
         self.OnAttach: Callable[[], None] = self.Script.OnAttach
         self.OnDetach: Callable[[], None] = self.Script.OnDetach
         self.OnUpdate: Callable[[float], None] = self.Script.OnUpdate
+        self.OnFixedUpdate: Callable[[float], None] = self.Script.OnFixedUpdate
+
+        self.OnCollisionEnter : Callable[[Collision], None] = self.Script.OnCollisionEnter
+        self.OnCollisionStay  : Callable[[Collision], None] = self.Script.OnCollisionStay
+        self.OnCollisionExit  : Callable[[Collision], None] = self.Script.OnCollisionExit
+        self.OnTriggerEnter   : Callable[[Any], None] = self.Script.OnTriggerEnter
+        self.OnTriggerStay    : Callable[[Any], None] = self.Script.OnTriggerStay
+        self.OnTriggerExit    : Callable[[Any], None] = self.Script.OnTriggerExit
 
         self.Bound = True
 
@@ -252,21 +311,52 @@ class ScriptComponent:
 
         return component
 
+class MeshColliderSource:
+    '''A submesh of a model, as the `Source` of a `MeshCollider`'''
+    __slots__ = "Path", "Submesh"
+
+    def __init__(self, path: str, submesh: int=0) -> None: self.Path, self.Submesh = path, submesh
+
+    @property
+    def Key(self) -> Tuple[str, int]: return ( os.path.normcase(os.path.abspath(self.Path)), self.Submesh )
+
+    @property
+    def CachePath(self) -> str:
+        directory = f"{Cache.GetLocalTempDirectory()}\\PhysicsCache"
+        os.makedirs(directory, exist_ok=True)
+        return f"{directory}\\{MeshData.SourceHash(self.Path)}_{self.Submesh}.bullet"
+
+    def Load(self) -> Tuple[np.ndarray, np.ndarray]:
+        submesh = MeshData.Load(self.Path).Submeshes[self.Submesh]
+        return submesh.Vertices[:, MeshData.PositionOffset:MeshData.PositionOffset + 3], submesh.Indices
 class CollidorComponent:
     class Shapes:
-        Box, Plane \
-            = range(2)
-        
+        Box, Plane, Sphere, Capsule, ConvexHull, TriangleMesh \
+            = range(6)
+
+    # `scale` is the box's size, the sphere's radius (x) or the capsule's radius (x) and height (y)
     def __init__(self,
         _type: int, scale: pyrr.Vector3=pyrr.Vector3([ 1, 1, 1 ]),
-        up: pyrr.Vector3=pyrr.Vector3([ 0, 1, 0 ]), dist: float = 0.0
+        up: pyrr.Vector3=pyrr.Vector3([ 0, 1, 0 ]), dist: float = 0.0, mesh: MeshComponent=None
     ) -> None:
+        # Mesh shapes are made of the entity's mesh
+        if _type in ( CollidorComponent.Shapes.ConvexHull, CollidorComponent.Shapes.TriangleMesh ) \
+            and (mesh is None or mesh.Path == "."):
+            PI_CORE_WARN("A mesh collidor needs the entity to have a mesh, using a box instead")
+            _type = CollidorComponent.Shapes.Box
+
         self.Type = _type
-        self._InitData = (scale, up, dist)      # For Copying
-        if   _type == CollidorComponent.Shapes.Box   : self.Collidor = BoxCollider(bounds=scale)
-        elif _type == CollidorComponent.Shapes.Plane : self.Collidor = PlaneCollider(
+        self._InitData = (scale, up, dist, mesh)        # For Copying
+        if   _type == CollidorComponent.Shapes.Box     : self.Collidor = BoxCollider(bounds=scale)
+        elif _type == CollidorComponent.Shapes.Plane   : self.Collidor = PlaneCollider(
             bounds=pyrr.Vector3([ dist, 0, 0 ]), up=up
         )
+        elif _type == CollidorComponent.Shapes.Sphere  : self.Collidor = SphereCollider(bounds=scale)
+        elif _type == CollidorComponent.Shapes.Capsule : self.Collidor = CapsuleCollider(bounds=scale)
+        elif _type == CollidorComponent.Shapes.ConvexHull:
+            self.Collidor = ConvexHullCollider(MeshColliderSource(mesh.Path, mesh.Submesh), bounds=scale)
+        elif _type == CollidorComponent.Shapes.TriangleMesh:
+            self.Collidor = TriangleMeshCollider(MeshColliderSource(mesh.Path, mesh.Submesh), bounds=scale)
     def Copy(self, recipientEntity): return CollidorComponent(self.Type, *self._InitData)
 class RigidBodyComponent:
     def __init__(self, mat: PySicsMaterial) -> None:
@@ -1,4 +1,4 @@
-from ..Renderer  import Camera, EditorCamera, RenderCommand, Material
+from ..Renderer  import Camera, EditorCamera, RenderCommand, Material, TextureResidency
 from ..Core      import PI_TIMER, PI_VERSION, Cache, Timer
 from .Components import *
 from .Entity     import Entity
@@ -7,16 +7,41 @@ from ..Scripting import Color4, Color3
 from ..Renderer import Renderer, DirectionalLight
 
 from ..AssetManager.AssetManager import AssetManager
+from ..AssetManager.ImportService import ImportHandle
+from ..AssetManager.AssetDatabase import AssetDatabase
+from .SceneFile import SceneFile
+from .SceneWriter import SceneWriter
 
 from copy import deepcopy
+import numpy as np
 import pyrr
 import esper
 import yaml
 import os
 
 from typing import Deque as _Deque
+from typing import Any, Callable, Dict, List, Set, Tuple
+from itertools import repeat
+from concurrent.futures import Future
+import weakref
 
 class PI_YAML:
+    # LibYAML's loader and dumper, when PyYAML was built with it, are several times faster than the pure Python ones
+    Loader = getattr(yaml, "CLoader", yaml.Loader)
+    Dumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+    @staticmethod
+    def Register() -> None:
+        yaml.add_constructor( "Color3"  , PI_YAML.DecodeColor3  , Loader=PI_YAML.Loader )
+        yaml.add_constructor( "Vector3" , PI_YAML.DecodeVector3 , Loader=PI_YAML.Loader )
+        yaml.add_constructor( "Color4"  , PI_YAML.DecodeColor4  , Loader=PI_YAML.Loader )
+        yaml.add_constructor( "Vector4" , PI_YAML.DecodeVector4 , Loader=PI_YAML.Loader )
+
+        yaml.add_representer( Color3       , PI_YAML.EncodeColor3  , Dumper=PI_YAML.Dumper )
+        yaml.add_representer( pyrr.Vector3 , PI_YAML.EncodeVector3 , Dumper=PI_YAML.Dumper )
+        yaml.add_representer( Color4       , PI_YAML.EncodeColor4  , Dumper=PI_YAML.Dumper )
+        yaml.add_representer( pyrr.Vector4 , PI_YAML.EncodeVector4 , Dumper=PI_YAML.Dumper )
+
     @staticmethod
     def EncodeVector3(dumper: yaml.Dumper, vector: pyrr.Vector3) -> yaml.Dumper:
         return dumper.represent_sequence("Vector3", [float(vector[0]), float(vector[1]), float(vector[2])], flow_style=True)
@@ -61,6 +86,8 @@ class PI_YAML:
     def DecodeVector4(loader: yaml.Loader, node: yaml.Node) -> pyrr.Vector4:
         return pyrr.Vector4(loader.construct_sequence(node))
 
+PI_YAML.Register()
+
 class Scene:
     _Registry: esper.World
     
@@ -81,6 +108,15 @@ class Scene:
 
     __Running: bool
     __RBWorld: PySics
+    __BodyEntities: Dict[int, Entity]     # The entity of every rigid body in `__RBWorld`, by the body's id
+
+    __DeferAssets : bool                  # Mesh and material components are initialized by `__LoadAssets` instead
+    __Imports     : List[ImportHandle]    # The models the scene is still waiting for
+    __Closed      : bool
+
+    __Records  : Dict[int, "Scene.Record"]     # Entities as last snapshotted, see `Snapshot`
+    __Dirty    : Set[int]                      # Entities changed since then
+    __Revision : int
 
     def __init__(self) -> None:
         self._Registry = esper.World()
@@ -93,6 +129,14 @@ class Scene:
         self.__ToDestroy = []
         self.__ToDuplicate = []
 
+        self.__DeferAssets = False
+        self.__Imports = []
+        self.__Closed = False
+
+        self.__Records = {}
+        self.__Dirty = set()
+        self.__Revision = 0
+
         class _TransformUpdater(esper.Processor):
             def process(self, dt: float, running: bool):                
                 for entity, (lightComponent, transform) in self.world.get_components(LightComponent, TransformComponent):
@@ -104,209 +148,314 @@ class Scene:
                     camera.SetPosition( transform.Translation )
                     camera.SetRotation( transform.Rotation    )
 
-                if not running: return
-                for entity, (rbComponent, transform) in self.world.get_components(RigidBodyComponent, TransformComponent):
-                    transform.SetTranslation(rbComponent.RigidBody.Position)
-                    transform.SetRotation(rbComponent.RigidBody.Rotation)
-
         self._Registry.add_processor(_TransformUpdater())
 
-    @staticmethod
-    def Serialize(scene, path: str) -> None:
-        data = {}
-        data["Scene"] = "Untitled"
-        data["Version"] = PI_VERSION
-
-        entities = []
-        for entityID in range(1, scene._Registry._next_entity_id+1):
-            if not scene._Registry.entity_exists(entityID): continue
-            entity = Entity(entityID, scene)
-            
-            entityDict = {}
-            entityDict["Entity"] = str(entity.GetComponent(IDComponent))
+    class Record:
+        '''An entity as it is saved, in the `.PI` layout (see `SceneFile.FromEntities`). Never changed once made.'''
+        __slots__ = "Data", "__Text"
 
-            if entity.HasComponent(TagComponent):
-                entityDict["TagComponent"] = { "Tag": entity.GetComponent(TagComponent).Tag }
-            
-            if entity.HasComponent(TransformComponent):
-                tc = entity.GetComponent(TransformComponent)
-                entityDict["TransformComponent"] = {
-                    "Translation": tc.Translation,
-                    "Rotation"   : tc.Rotation,
-                    "Scale"      : tc.Scale      
-                }
+        def __init__(self, data: Dict[str, Any]) -> None:
+            self.Data = data
+            self.__Text = None
 
-            if entity.HasComponent(MeshComponent):
-                mc = entity.GetComponent(MeshComponent)
-                entityDict["MeshComponent"] = { "Path": AssetManager.GetInstance().GetRelativePath(mc.Path) }
+        @property
+        def Text(self) -> str:
+            '''The entity's item of the YAML `Entities` list, it is only dumped again once the entity changes'''
+            if self.__Text is None: self.__Text = yaml.dump([ self.Data ], Dumper=PI_YAML.Dumper)
+            return self.__Text
 
-            if entity.HasComponent(CameraComponent):
-                cc = entity.GetComponent(CameraComponent)
-                cameraComponent = {}
+    def MarkDirty(self, entity: Entity=None) -> None:
+        '''The entity (or every entity, if None) is gathered again by the next `Snapshot`'''
+        if entity is None:
+            self.__Records.clear()
+            self.__Revision += 1
 
-                sceneCamera = {}
-                sceneCamera["ProjectionType"] = cc.Camera.ProjectionType
+        elif int(entity) not in self.__Dirty:
+            self.__Dirty.add(int(entity))
+            self.__Revision += 1
 
-                cameraComponent["Camera"] = sceneCamera
-                cameraComponent["IsPrimary"] = cc.Primary
-                cameraComponent["FixedAspectRatio"] = cc.FixedAspectRatio
+    @property
+    def Revision(self) -> int:
+        '''Changes whenever an entity is marked dirty, e.g. to only autosave a scene that changed'''
+        return self.__Revision
+
+    def Snapshot(self) -> List[Record]:
+        '''
+        The scene's entities as saved. Only the entities marked dirty (or created) since the last snapshot
+        are gathered again, the others keep their record. Has to be called from the main thread.
+        '''
+        registry, records = self._Registry, {}
+
+        for entityID in range(1, registry._next_entity_id+1):
+            if not registry.entity_exists(entityID): continue
+
+            record = self.__Records.get(entityID, None)
+            if record is None or entityID in self.__Dirty: record = Scene.Record(self.__Gather(Entity(entityID, self)))
+            records[entityID] = record
+
+        self.__Records, self.__Dirty = records, set()
+        return list(records.values())
+
+    def __Gather(self, entity: Entity) -> Dict[str, Any]:
+        vector = lambda value: pyrr.Vector3([ float(value[0]), float(value[1]), float(value[2]) ])
+
+        tc = entity.GetComponent(TransformComponent)
+        data = {
+            "Entity": str(entity.GetComponent(IDComponent).ID),
+            "TagComponent": { "Tag": entity.GetComponent(TagComponent).Tag },
+            "TransformComponent": { "Translation": vector(tc.Translation), "Rotation": vector(tc.Rotation), "Scale": vector(tc.Scale) }
+        }
+
+        if entity.HasComponent(MeshComponent):
+            mc = entity.GetComponent(MeshComponent)
+            data["MeshComponent"] = { "Path": AssetManager.GetInstance().GetRelativePath(mc.Path), "Submesh": int(mc.Submesh) }
+
+            # Lets the scene find the model again if it is moved
+            guid = AssetDatabase.GetGUID(mc.Path)
+            if guid is not None: data["MeshComponent"]["Asset"] = str(guid)
+
+        if entity.HasComponent(CameraComponent):
+            cc = entity.GetComponent(CameraComponent)
+            data["CameraComponent"] = {
+                "Camera"           : { "ProjectionType": int(cc.Camera.ProjectionType) },
+                "IsPrimary"        : bool(cc.Primary),
+                "FixedAspectRatio" : bool(cc.FixedAspectRatio)
+            }
 
-                entityDict["CameraComponent"] = cameraComponent
+        if entity.HasComponent(LightComponent):
+            lc = entity.GetComponent(LightComponent)
+            light = lc.Light
+            data["LightComponent"] = {
+                "LightType" : int(lc.LightType),
+                "Intensity" : float(light.Intensity),
+                "Diffuse"   : vector(light.Diffuse),
+                "Specular"  : vector(light.Specular)
+            }
+
+            if lc.LightType is not LightComponent.TypeEnum.Point: data["LightComponent"]["Direction"] = vector(light.Direction)
+            if lc.LightType is LightComponent.TypeEnum.Spot:
+                data["LightComponent"]["CutOff"], data["LightComponent"]["OuterCutOff"] = float(light.CutOff), float(light.OuterCutOff)
+
+        if entity.HasComponent(ScriptComponent):
+            component = entity.GetComponent(ScriptComponent)
+            # The variables are the objects the script uses, the record keeps them as they are now
+            if component.Bound: data["ScriptComponent"] = { "Namespace": component.Namespace, "Variables": deepcopy(component.Variables) }
+
+        if entity.HasComponent(CollidorComponent):
+            component = entity.GetComponent(CollidorComponent)
+            data["CollidorComponent"] = {
+                "Type": int(component.Type), "Scale": vector(component.Collidor.Scale), "IsTrigger": bool(component.Collidor.IsTrigger)
+            }
 
-            if entity.HasComponent(LightComponent):
-                lc = entity.GetComponent(LightComponent)
-                lightDict = {}
+        if entity.HasComponent(RigidBodyComponent):
+            component = entity.GetComponent(RigidBodyComponent)
+            data["RigidBodyComponent"] = {
+                "IsStatic": bool(component.RigidBody.IsStatic), "Mass": float(component.RigidBody.Mass), "Layer": int(component.RigidBody.Layer)
+            }
 
-                lightDict["LightType"] = lc.LightType
-                lightDict["Intensity"] = lc.Light.Intensity
+        return data
 
-                lightDict["Diffuse"] = lc.Light.Diffuse
-                lightDict["Specular"] = lc.Light.Specular
+    @staticmethod
+    def Metadata() -> Dict[str, List[str]]: return { "Name": [ "Untitled" ], "Version": [ PI_VERSION ] }
 
-                if lc.LightType is LightComponent.TypeEnum.Directional:
-                    lightDict["Direction"] = lc.Light.Direction
+    @staticmethod
+    def Tables(scene) -> Dict[str, Dict[str, Any]]:
+        '''The scene's components as tables, with a column per field (see `SceneFile`)'''
+        tables = SceneFile.FromEntities([ record.Data for record in scene.Snapshot() ])
+        tables["Scene"] = Scene.Metadata()
+        return tables
 
-                if lc.LightType is LightComponent.TypeEnum.Spot:
-                    lightDict["Direction"] = lc.Light.Direction
-                    lightDict["CutOff"] = lc.Light.CutOff
-                    lightDict["OuterCutOff"] = lc.Light.OuterCutOff
+    @staticmethod
+    def Serialize(scene, path: str) -> None:
+        '''Saves the scene as YAML (`.PI`) or in the binary format (`.PIB`), depending on the extension of `path`'''
+        Scene.WriteRecords(path, scene.Snapshot())
 
-                entityDict["LightComponent"] = lightDict
+    @staticmethod
+    def SerializeAsync(scene, path: str, onDone: Callable[[str], None]=None) -> Future:
+        '''Same as `Serialize`, but only the snapshot is taken here, the file is written (atomically) by the `SceneWriter`'''
+        records, binary = scene.Snapshot(), Scene.IsBinary(path)
+        return SceneWriter.Submit(path, lambda temporaryPath: Scene.WriteRecords(temporaryPath, records, binary), onDone)
 
-            if entity.HasComponent(ScriptComponent):
-                component = entity.GetComponent(ScriptComponent)
-                if component.Bound:
-                    entityDict["ScriptComponent"] = {"Namespace": component.Namespace, "Variables": component.Variables}
+    @staticmethod
+    def WriteRecords(path: str, records: List[Record], binary: bool=None) -> None:
+        if binary is None: binary = Scene.IsBinary(path)
 
-            if entity.HasComponent(CollidorComponent):
-                component = entity.GetComponent(CollidorComponent)
-                entityDict["CollidorComponent"] = { "Type": component.Type, "Scale": component.Collidor.Scale }
+        if binary:
+            tables = SceneFile.FromEntities([ record.Data for record in records ])
+            tables["Scene"] = Scene.Metadata()
+            return SceneFile.Write(path, tables)
 
-            if entity.HasComponent(RigidBodyComponent):
-                component = entity.GetComponent(RigidBodyComponent)
-                entityDict["RigidBodyComponent"] = {
-                    "IsStatic": component.RigidBody.IsStatic, "Mass": component.RigidBody.Mass 
-                }
+        # Same document as dumping the whole scene at once, but the unchanged entities reuse their text
+        metadata = Scene.Metadata()
+        with open(path, 'w') as _file:
+            _file.write("Entities:\n" if records else "Entities: []\n")
+            for record in records: _file.write(record.Text)
+            yaml.dump({ "Scene": metadata["Name"][0], "Version": metadata["Version"][0] }, _file, Dumper=PI_YAML.Dumper)
 
-            entities.append(entityDict)
+    @staticmethod
+    def IsBinary(path: str) -> bool: return path.lower().endswith(SceneFile.Extension.lower())
+
+    @staticmethod
+    def WriteFile(path: str, tables: Dict[str, Dict[str, Any]]) -> None:
+        if Scene.IsBinary(path): return SceneFile.Write(path, tables)
 
-        data["Entities"] = entities
+        metadata = tables.get("Scene", Scene.Metadata())
+        data = { "Scene": metadata["Name"][0], "Version": metadata["Version"][0], "Entities": SceneFile.ToEntities(tables) }
+        with open(path, 'w') as _file: yaml.dump(data, _file, Dumper=PI_YAML.Dumper)
+
+    @staticmethod
+    def ReadFile(path: str) -> Dict[str, Dict[str, Any]]:
+        if Scene.IsBinary(path): return SceneFile.Read(path)
+
+        with open(path, 'r') as _file: data = yaml.load(_file, PI_YAML.Loader)
+
+        tables = SceneFile.FromEntities(data["Entities"])
+        tables["Scene"] = { "Name": [ str(data.get("Scene", "Untitled")) ], "Version": [ str(data.get("Version", PI_VERSION)) ] }
+        return tables
+
+    @staticmethod
+    def Convert(sourcePath: str, destinationPath: str) -> None:
+        '''Converts between the YAML (`.PI`) and binary (`.PIB`) scene formats, e.g. to diff a binary scene'''
+        Scene.WriteFile(destinationPath, Scene.ReadFile(sourcePath))
 
-        yaml.add_representer( Color3       , PI_YAML.EncodeColor3  )
-        yaml.add_representer( pyrr.Vector3 , PI_YAML.EncodeVector3 )
-        yaml.add_representer( Color4       , PI_YAML.EncodeColor4  )
-        yaml.add_representer( pyrr.Vector4 , PI_YAML.EncodeVector4 )
-        with open(path, 'w') as _file: yaml.dump(data, _file)
-    
     @staticmethod
     def Deserialize(oldScene, path: str):
-        yaml.add_constructor( "Color3"  , PI_YAML.DecodeColor3  )
-        yaml.add_constructor( "Vector3" , PI_YAML.DecodeVector3 )
-        yaml.add_constructor( "Color4"  , PI_YAML.DecodeColor4  )
-        yaml.add_constructor( "Vector4" , PI_YAML.DecodeVector4 )
-        
-        data = {}
-        with open(path, 'r') as _file: data = yaml.load(_file, yaml.Loader)
+        scene = Scene.FromTables(oldScene, Scene.ReadFile(path))
+        scene._Filepath = path
+        return scene
 
+    @staticmethod
+    def FromTables(oldScene, tables: Dict[str, Dict[str, Any]]):
         scene = Scene()
         scene.OnViewportResize(oldScene._ViewportWidth, oldScene._ViewportHeight)
 
-        entities = data["Entities"]
-        for entity in entities:
-            uuid = entity["Entity"]
+        # Only the structure is loaded here, the models are imported in the background by `__LoadAssets`
+        scene.__DeferAssets = True
+
+        ids, tags = tables["Entity"]["ID"].tobytes(), tables["Entity"]["Tag"]
+        entities = [ scene.CreateEntityWithUUID(UUID(bytes=ids[16 * row:16 * row + 16]), tag) for row, tag in enumerate(tags) ]
+
+        def rows(name: str, *columns: str):
+            '''The entity and the `columns` of every row of the table `name`, columns older files don't have are None'''
+            table = tables.get(name, None)
+            if table is None: return []
+            return zip(( entities[row] for row in table["Entity"].tolist() ), *( table.get(column, repeat(None)) for column in columns ))
+
+        # The columns are read-only views into the file's contents, every vector is copied out of them
+        for entity, translation, rotation, scale in rows("TransformComponent", "Translation", "Rotation", "Scale"):
+            tc = entity.GetComponent(TransformComponent)
+            tc.SetTranslation(pyrr.Vector3(translation.tolist()))
+            tc.SetRotation(pyrr.Vector3(rotation.tolist()))
+            tc.SetScale(pyrr.Vector3(scale.tolist()))
+
+        for entity, path, submesh, asset in rows("MeshComponent", "Path", "Submesh", "Asset"):
+            # Models that were moved since the scene was saved are found through their GUID
+            movedPath = AssetDatabase.GetPath(UUID(asset)) if asset else None
+            entity.AddComponent(MeshComponent, movedPath if movedPath is not None else path, int(submesh))
+
+        for entity, projectionType, isPrimary, fixedAspectRatio in rows("CameraComponent", "ProjectionType", "IsPrimary", "FixedAspectRatio"):
+            entity.AddComponent(CameraComponent, SceneCamera(int(projectionType)), bool(isPrimary), bool(fixedAspectRatio))
+
+        lights = rows("LightComponent", "LightType", "Intensity", "Diffuse", "Specular", "Direction", "CutOff", "OuterCutOff")
+        for entity, lightType, intensity, diffuse, specular, direction, cutOff, outerCutOff in lights:
+            lightType, intensity = int(lightType), float(intensity)
+            diffuse, specular = pyrr.Vector3(diffuse.tolist()), pyrr.Vector3(specular.tolist())
+
+            if lightType == LightComponent.TypeEnum.Point:
+                entity.AddComponent(LightComponent, lightType, diffuse=diffuse, specular=specular, intensity=intensity)
+
+            if lightType == LightComponent.TypeEnum.Directional:
+                entity.AddComponent(LightComponent, lightType, direction=pyrr.Vector3(direction.tolist()),
+                    diffuse=diffuse, specular=specular, intensity=intensity)
+
+            if lightType == LightComponent.TypeEnum.Spot:
+                entity.AddComponent(LightComponent, lightType, direction=pyrr.Vector3(direction.tolist()),
+                    cutOff=float(cutOff), outerCutOff=float(outerCutOff),
+                    diffuse=diffuse, specular=specular, intensity=intensity)
+
+        for entity, namespace, variables in rows("ScriptComponent", "Namespace", "Variables"):
+            module, script = namespace.split(".")
+            component = entity.AddComponent(ScriptComponent, module, script)
+            if variables: component.SetVariables(variables)
+
+        for entity, collidorType, scale, isTrigger in rows("CollidorComponent", "Type", "Scale", "IsTrigger"):
+            mesh = entity.GetComponent(MeshComponent) if entity.HasComponent(MeshComponent) else None
+            collidor = entity.AddComponent(CollidorComponent, int(collidorType), mesh=mesh)
+            collidor.Collidor.SetScale(pyrr.Vector3(scale.tolist()))
+            collidor.Collidor.IsTrigger = bool(isTrigger)
+
+        for entity, isStatic, mass, layer in rows("RigidBodyComponent", "IsStatic", "Mass", "Layer"):
+            transform: TransformComponent = entity.GetComponent(TransformComponent)
+
+            collidor: Collider = None
+            if entity.HasComponent(CollidorComponent):
+                collidor = entity.GetComponent(CollidorComponent).Collidor
+            else:
+                collidor = entity.AddComponent(CollidorComponent, CollidorComponent.Shapes.Box).Collidor
+                collidor.SetScale(transform.Scale)
 
-            tagComponent = entity["TagComponent"]
-            name = tagComponent["Tag"]
+            mat = PySicsMaterial(
+                mass=float(mass), isStatic=bool(isStatic), layer=int(layer or 0),
+                position=transform.Translation, rotation=transform.Rotation, collider=collidor
+            )
+            entity.AddComponent(RigidBodyComponent, mat)
 
-            deserializedEntity = scene.CreateEntityWithUUID(UUID(uuid), name)
+        scene.__DeferAssets = False
+        scene.__LoadAssets()
 
-            transformComponent = entity["TransformComponent"]
-            tc = deserializedEntity.GetComponent(TransformComponent)
-            tc.SetTranslation(transformComponent["Translation"])
-            tc.SetRotation(transformComponent["Rotation"])
-            tc.SetScale(transformComponent["Scale"])
+        return scene
 
-            meshComponent = entity.get("MeshComponent", False)
-            if meshComponent: deserializedEntity.AddComponent(MeshComponent, meshComponent["Path"]).Init()
+    def __LoadAssets(self) -> None:
+        '''
+        Imports every model of the scene in parallel, without waiting for them: the scene can be used right away
+        and each mesh shows up once its model is loaded (resolved by `ImportService.Update`, at a frame boundary).
+        '''
+        assetManager = AssetManager.GetInstance()
 
-            cameraComponent = entity.get("CameraComponent", False)
-            if cameraComponent: deserializedEntity.AddComponent(
-                    CameraComponent,
-                    SceneCamera(cameraComponent["Camera"]["ProjectionType"]),
-                    cameraComponent["IsPrimary"], cameraComponent["FixedAspectRatio"]
-                )
+        entities: Dict[str, List[int]] = {}
+        for entity, component in self._Registry.get_component(MeshComponent):
+            if not component.Initialized: entities.setdefault(component.Path, []).append(entity)
 
-            lightComponent = entity.get("LightComponent", False)
-            if lightComponent:
-                lightType = lightComponent["LightType"]
+        # The callbacks must not keep a closed scene alive
+        sceneRef = weakref.ref(self)
 
-                if lightType is LightComponent.TypeEnum.Point:
-                    deserializedEntity.AddComponent(LightComponent, lightType,
-                        diffuse=lightComponent["Diffuse"],
-                        specular=lightComponent["Specular"],
-                        intensity=lightComponent["Intensity"]
-                    )
+        def init(entityIDs: List[int]) -> None:
+            scene = sceneRef()
+            if scene is None or scene.__Closed: return
 
-                if lightType is LightComponent.TypeEnum.Directional:
-                    deserializedEntity.AddComponent(LightComponent, lightType,
-                        direction=lightComponent["Direction"],
-                        diffuse=lightComponent["Diffuse"],
-                        specular=lightComponent["Specular"],
-                        intensity=lightComponent["Intensity"]
-                    )
+            for entityID in entityIDs:
+                if not scene._Registry.entity_exists(entityID): continue
+                entity = Entity(entityID, scene)
 
-                if lightType is LightComponent.TypeEnum.Spot:
-                    deserializedEntity.AddComponent(LightComponent, lightType,
-                        direction=lightComponent["Direction"],
-                        cutOff=lightComponent["CutOff"],
-                        outerCutOff=lightComponent["OuterCutOff"],
-                        diffuse=lightComponent["Diffuse"],
-                        specular=lightComponent["Specular"],
-                        intensity=lightComponent["Intensity"]
-                    )
-            
-            scriptComponent = entity.get("ScriptComponent", False)
-            if scriptComponent:
-                namespace = scriptComponent["Namespace"]
-                module, script = namespace.split(".")
-                component = deserializedEntity.AddComponent(ScriptComponent, module, script)
-                variables = scriptComponent.get("Variables", False)
-                if variables: component.SetVariables(variables)
-            
-            collidorComponent = entity.get("CollidorComponent", False)
-            if collidorComponent:
-                collidor = deserializedEntity.AddComponent(CollidorComponent, collidorComponent["Type"])
-                collidor.Collidor.SetScale(collidorComponent["Scale"])
-            
-            rigidbodyComponent = entity.get("RigidBodyComponent", False)
-            if rigidbodyComponent:
-                transform: TransformComponent = deserializedEntity.GetComponent(TransformComponent)
+                if entity.HasComponent(MeshComponent)     : entity.GetComponent(MeshComponent).Init()
+                if entity.HasComponent(MaterialComponent) : entity.GetComponent(MaterialComponent).Init()
 
-                collidor: Collider = None
-                if deserializedEntity.HasComponent(CollidorComponent):
-                    collidor = deserializedEntity.GetComponent(CollidorComponent).Collidor
-                else:
-                    collidor = deserializedEntity.AddComponent(CollidorComponent, CollidorComponent.Shapes.Box).Collidor
-                    collidor.SetScale(transform.Scale)
+        for path, entityIDs in entities.items():
+            if assetManager.GetRelativePath(path) == '.':
+                init(entityIDs)
+                continue
 
-                mat = PySicsMaterial(
-                    mass=rigidbodyComponent["Mass"], isStatic=rigidbodyComponent["IsStatic"],
-                    position=transform.Translation, rotation=transform.Rotation, collider=collidor
-                )
-                rb = deserializedEntity.AddComponent(RigidBodyComponent, mat)
+            handle = assetManager.LoadAsync(AssetManager.AssetType.MeshAsset, path)
+            handle.AddCallback(lambda _, entityIDs=entityIDs: init(entityIDs))
+            if not handle.IsDone: self.__Imports.append(handle)
 
-        scene._Filepath = path
-        return scene
+    @property
+    def LoadingProgress(self) -> Tuple[int, int]:
+        '''(Loaded, total) models of the scene that are still loading, (0, 0) once they all are'''
+        done = sum(handle.IsDone for handle in self.__Imports)
+        if done == len(self.__Imports): self.__Imports.clear()
+
+        return done, len(self.__Imports)
 
     @staticmethod
     def Copy(oldScene):
-        tempSceneName = str(UUIDGenerator())
-        tempFileDir = f"{Cache.GetLocalTempDirectory()}\\{tempSceneName}.PI"
+        tables = Scene.Tables(oldScene)
 
-        Scene.Serialize(oldScene, tempFileDir)
-        newScene = Scene.Deserialize(oldScene, tempFileDir)
-        os.remove(tempFileDir)
+        # The variables are the objects the scripts use, the copy gets its own
+        if "ScriptComponent" in tables: tables["ScriptComponent"]["Variables"] = deepcopy(tables["ScriptComponent"]["Variables"])
 
+        newScene = Scene.FromTables(oldScene, tables)
+        newScene._Filepath = oldScene._Filepath
         return newScene
 
     @staticmethod
@@ -340,6 +489,11 @@ class Scene:
         if entity not in self.__ToDuplicate: self.__ToDuplicate.append(entity)
 
     def DestroyEntity(self, entity: Entity) -> None:
+        self.MarkDirty(entity)
+
+        if entity.HasComponent(MeshComponent)     : entity.GetComponent(MeshComponent).Release()
+        if entity.HasComponent(MaterialComponent) : entity.GetComponent(MaterialComponent).Release()
+
         if entity.HasComponent(LightComponent):
             light = entity.GetComponent(LightComponent).Light
 
@@ -365,27 +519,44 @@ class Scene:
 
                 self._PointLights = newLights
 
-        if entity.HasComponent(RigidBodyComponent):
-            if not self.__Running: return
-            self.__RBWorld.DeleteRigidBody(entity.GetComponent(RigidBodyComponent).RigidBody)
+        # There is no physics world while editing
+        if self.__Running and entity.HasComponent(RigidBodyComponent):
+            self.__RemoveRigidBody(entity.GetComponent(RigidBodyComponent).RigidBody)
 
         self._Registry.delete_entity(int(entity), immediate=True)
 
+    def ReleaseAssets(self) -> None:
+        '''Called when the scene is closed, its assets can be evicted once no other scene uses them'''
+        self.__Closed = True
+        self.__Imports.clear()
+
+        for _, component in self._Registry.get_component(MeshComponent)     : component.Release()
+        for _, component in self._Registry.get_component(MaterialComponent) : component.Release()
+
     def DefferedDestroy(self, entity: Entity) -> None:
         if entity not in self.__ToDestroy: self.__ToDestroy.append(entity)
 
     def OnStartRuntime(self) -> None:
         self.__Running = True
         self.__RBWorld = PySics()
+        self.__BodyEntities = {}
 
         for entity, script in self._Registry.get_component(ScriptComponent):
             if script.Bound: script.OnAttach()
 
         for entity, rb in self._Registry.get_component(RigidBodyComponent):
-            self.__RBWorld.AddRigidBody(rb.RigidBody)
+            self.__AddRigidBody(Entity(entity, self), rb)
 
         self.__RBWorld.OnSimulationStart()
 
+    def __AddRigidBody(self, entity: Entity, component: RigidBodyComponent) -> None:
+        component.RigidBody.UserData = entity.GetComponent(TransformComponent)
+        self.__BodyEntities[id(component.RigidBody)] = entity
+
+        # The collidor may have been replaced (e.g. by one of another shape) since the body was made
+        if entity.HasComponent(CollidorComponent): component.RigidBody.Collider = entity.GetComponent(CollidorComponent).Collidor
+        self.__RBWorld.AddRigidBody(component.RigidBody)
+
     def OnStopRuntime(self) -> None:
         self.__Running = False
         
@@ -418,23 +589,94 @@ class Scene:
         for entity, script in self._Registry.get_component(ScriptComponent):
             if script.Bound: script.OnUpdate(dt)
  
-        self.__RBWorld.Update(dt)
+        # Physics runs in fixed ticks, only the bodies that moved are copied (interpolated) to their entity's transform
+        self.__RBWorld.Update(dt, self.__FixedUpdate)
+        positions, rotations = self.__RBWorld.MovedStates
+        for body, position, rotation in zip(self.__RBWorld.MovedBodies, positions.tolist(), rotations.tolist()):
+            body.UserData.SetTranslation(pyrr.Vector3(position))
+            body.UserData.SetRotation(pyrr.Vector3(rotation))
+
+        contacts, bodies = self.__RBWorld.Contacts
+        if len(contacts): self.__DispatchContacts(contacts, bodies)
+
         self._Registry.process(dt, self.__Running)
 
         self.HandleDefferedStuff()
+
+    def __FixedUpdate(self, dt: float) -> None:
+        for entity, script in self._Registry.get_component(ScriptComponent):
+            if script.Bound: script.OnFixedUpdate(dt)
+
+    # By `PhysicsState.ContactEvent`
+    __CollisionCallbacks = ( "OnCollisionEnter", "OnCollisionStay", "OnCollisionExit" )
+    __TriggerCallbacks   = ( "OnTriggerEnter"  , "OnTriggerStay"  , "OnTriggerExit"   )
+
+    def __DispatchContacts(self, contacts: np.ndarray, bodies: List[RigidBody]) -> None:
+        '''Gives every contact to the scripts of both of its entities, once the physics are updated'''
+        entities = [ self.__BodyEntities.get(id(body), None) for body in bodies ]
+        scripts  = [
+            entity.GetComponent(ScriptComponent) if entity is not None and entity.HasComponent(ScriptComponent) else None
+            for entity in entities
+        ]
+        scripts = [ script if script is not None and script.Bound else None for script in scripts ]
+
+        for event, trigger, a, b, point, normal, impulse in contacts.tolist():
+            for this, other, sign in ( ( a, b, 1.0 ), ( b, a, -1.0 ) ):
+                script = scripts[this]
+                if script is None or entities[other] is None: continue
+
+                if trigger: getattr(script, Scene.__TriggerCallbacks[event])(entities[other])
+                else:
+                    collision = Collision(entities[other], pyrr.Vector3(point.tolist()), pyrr.Vector3((normal * sign).tolist()), impulse)
+                    getattr(script, Scene.__CollisionCallbacks[event])(collision)
+
+    # Physics queries, they hit the bodies of the running simulation (there is none while editing)
+    def RayCast(self,
+        origin: pyrr.Vector3, direction: pyrr.Vector3, distance: float=1000.0, layers: int=PySics.AllLayers
+    ) -> RayHit:
+        if not self.__Running: return None
+
+        hit = self.__RBWorld.RayCast(origin, direction, distance, layers)
+        if hit is not None: hit.Entity = self.__BodyEntities.get(id(hit.Body), None)
+        return hit
+
+    def RayCastBatch(self,
+        origins: np.ndarray, directions: np.ndarray, distance: Any=1000.0, layers: int=PySics.AllLayers
+    ) -> RayHits:
+        hits = self.__RBWorld.RayCastBatch(origins, directions, distance, layers) if self.__Running else RayHits(len(origins))
+        hits.Entities = [ self.__BodyEntities.get(id(body), None) if body is not None else None for body in hits.Bodies ]
+        return hits
+
+    def SweepTest(self,
+        collider: Collider, start: pyrr.Vector3, end: pyrr.Vector3,
+        rotation: pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]), layers: int=PySics.AllLayers
+    ) -> RayHit:
+        if not self.__Running: return None
+
+        hit = self.__RBWorld.SweepTest(collider, start, end, rotation, layers)
+        if hit is not None: hit.Entity = self.__BodyEntities.get(id(hit.Body), None)
+        return hit
+
+    def __RemoveRigidBody(self, body: RigidBody) -> None:
+        self.__BodyEntities.pop(id(body), None)
+        self.__RBWorld.DeleteRigidBody(body)
     
     def Draw(self) -> None:
         if self._DrawCamera is None and self.PrimaryCameraEntity is None: return
         camera = self._DrawCamera if self._DrawCamera else \
             self.PrimaryCameraEntity.GetComponent(CameraComponent).Camera.CameraObject
 
+        # Textures only need as many texels as the pixels they cover
+        viewportHeight = RenderCommand.GetViewport()[3]
+
         with Renderer.BeginScene(self, self._DrawCamera):
             for entity, (meshComponent, materialComponent, transform) in \
                 self._Registry.get_components(MeshComponent, MaterialComponent, TransformComponent):
 
-                if not meshComponent.Initialized: continue
+                if not meshComponent.Initialized or not materialComponent.Initialized: continue
 
                 mesh = meshComponent.MeshObject
+                if not mesh.IsResident: continue
 
                 mesh.SetTranslation ( transform.Translation )
                 mesh.SetRotation    ( transform.Rotation    )
@@ -443,6 +685,14 @@ class Scene:
                 mesh._RecalculateTransform()
 
                 material: Material = materialComponent.MaterialObject
+
+                if mesh.BoundingRadius is not None and Material.Type.Is(material.MatType, Material.Type.Textured):
+                    screenSize = material.TilingFactor * TextureResidency.ScreenSize(
+                        mesh.Transform, mesh.BoundingRadius, camera.ViewProjectionMatrix, viewportHeight
+                    )
+                    TextureResidency.Request(material.AlbedoMap  , screenSize)
+                    TextureResidency.Request(material.SpecularMap, screenSize)
+
                 material.Bind()
                 material.SetFields(mesh, camera.Position)
 
@@ -480,7 +730,15 @@ class Scene:
 
         return None
 
+    def GetEntityByUUID(self, uuid: UUID) -> Entity:
+        for entity, component in self._Registry.get_component(IDComponent):
+            if component.ID == uuid: return Entity(entity, self)
+
+        return None
+
     def _OnComponentAdded(self, entity: Entity, component: CTV) -> None:
+        self.MarkDirty(entity)
+
         if isinstance(component, CameraComponent):
             component.Camera.CameraObject.SetAspectRatio(self._ViewportWidth / self._ViewportHeight)
 
@@ -500,16 +758,19 @@ class Scene:
             if self.__Running: component.OnAttach()
 
         elif isinstance(component, MeshComponent):
-            component.Init()
+            if not self.__DeferAssets: component.Init()
             if component.Path != "" and not entity.HasComponent(MaterialComponent):
-                entity.AddComponent(MaterialComponent, component.Path)
+                entity.AddComponent(MaterialComponent, component.Path, component.Submesh)
         
-        elif isinstance(component, MaterialComponent): component.Init()
+        elif isinstance(component, MaterialComponent):
+            if not self.__DeferAssets: component.Init()
 
         elif isinstance(component, RigidBodyComponent):
-            if self.__Running: self.__RBWorld.AddRigidBody(component.RigidBody)
+            if self.__Running: self.__AddRigidBody(entity, component)
 
     def _OnComponentRemoved(self, entity: Entity, component: CTV) -> None:
+        self.MarkDirty(entity)
+
         if isinstance(component, LightComponent):
             light = component.Light
 
@@ -535,6 +796,8 @@ class Scene:
 
                 self._PointLights = newLights
 
+        elif isinstance(component, (MeshComponent, MaterialComponent)): component.Release()
+
         if isinstance(component, RigidBodyComponent):
             if not self.__Running: return
-            self.__RBWorld.DeleteRigidBody(component.RigidBody)
+            self.__RemoveRigidBody(component.RigidBody)
@@ -0,0 +1,290 @@
+import numpy as np
+import pyrr
+
+from typing import Any, Dict, List, Union
+from uuid import UUID
+import pickle
+import struct
+import zlib
+
+Column = Union[np.ndarray, List[Any]]
+Table  = Dict[str, Column]
+
+class SceneFile:
+    '''
+    The binary scene format (`.PIB`): a lot faster to save and open than the `.PI` YAML files, which are kept for diffs.
+
+    A scene is stored as tables, one per component type, with one column per field (`Scene.Tables` builds them).
+    Every table but "Entity" has an "Entity" column, the row of its entity in the "Entity" table.
+    Numeric columns are NumPy arrays (e.g. the translations of every transform are one (count, 3) array),
+    strings are lists of `str` and anything else (the scripts' variables) is a pickled list.
+
+    The file is a header followed by one chunk per table, each optionally compressed with zlib:
+        Header : magic, version, chunk count
+        Chunk  : name, row count, column count, compressed, stored size, size, columns
+        Column : name, kind, then an array (dtype, shape, bytes), strings (offsets, UTF-8) or a pickle
+    '''
+    __slots__ = ()
+
+    Extension : str = ".PIB"
+    Version   : int = 1
+
+    Compress         : bool = True
+    CompressionLevel : int  = 1     # Scenes are mostly floats, higher levels barely shrink them further
+
+    __Magic  : bytes = b"PISCENE\0"
+    __Header : struct.Struct = struct.Struct("<8sHI")
+    __Chunk  : struct.Struct = struct.Struct("<IHBQQ")
+
+    __Array, __Strings, __Pickle = b"a", b"s", b"p"
+
+    @staticmethod
+    def __WriteName(out: bytearray, name: str) -> None:
+        name = name.encode("utf-8")
+        out += struct.pack("<H", len(name)) + name
+
+    @staticmethod
+    def __ReadName(data: memoryview, offset: int) -> tuple:
+        length, = struct.unpack_from("<H", data, offset)
+        return str(data[offset + 2:offset + 2 + length], "utf-8"), offset + 2 + length
+
+    @staticmethod
+    def __WriteColumn(out: bytearray, name: str, column: Column) -> None:
+        SceneFile.__WriteName(out, name)
+
+        if isinstance(column, np.ndarray):
+            column = np.ascontiguousarray(column)
+            dtype = column.dtype.str.encode("ascii")
+
+            out += SceneFile.__Array + struct.pack("<B", len(dtype)) + dtype
+            out += struct.pack(f"<B{column.ndim}I", column.ndim, *column.shape)
+
+            # Aligned, so that the array can be used in place when the file is read
+            out += bytes(-(len(out) + 8) % 8) + struct.pack("<Q", column.nbytes)
+            out += column.tobytes()
+
+        elif all(isinstance(value, str) for value in column):
+            strings = [ value.encode("utf-8") for value in column ]
+            offsets = np.cumsum([ 0 ] + [ len(string) for string in strings ], dtype=np.uint32)
+
+            out += SceneFile.__Strings + struct.pack("<I", len(strings))
+            out += offsets.tobytes() + b"".join(strings)
+
+        else:
+            data = pickle.dumps(list(column), protocol=pickle.HIGHEST_PROTOCOL)
+            out += SceneFile.__Pickle + struct.pack("<Q", len(data)) + data
+
+    @staticmethod
+    def __ReadColumn(data: memoryview, offset: int) -> tuple:
+        name, offset = SceneFile.__ReadName(data, offset)
+        kind, offset = bytes(data[offset:offset + 1]), offset + 1
+
+        if kind == SceneFile.__Array:
+            length, = struct.unpack_from("<B", data, offset)
+            dtype = np.dtype(str(data[offset + 1:offset + 1 + length], "ascii"))
+            offset += 1 + length
+
+            ndim, = struct.unpack_from("<B", data, offset)
+            shape = struct.unpack_from(f"<{ndim}I", data, offset + 1)
+            offset += 1 + 4 * ndim
+
+            offset += -(offset + 8) % 8
+            nbytes, = struct.unpack_from("<Q", data, offset)
+            offset += 8
+
+            column = np.frombuffer(data, dtype, nbytes // dtype.itemsize, offset).reshape(shape)
+            return name, column, offset + nbytes
+
+        if kind == SceneFile.__Strings:
+            count, = struct.unpack_from("<I", data, offset)
+            offsets = np.frombuffer(data, np.uint32, count + 1, offset + 4).tolist()
+            offset += 4 + 4 * (count + 1)
+
+            blob = str(data[offset:offset + offsets[-1]], "utf-8") if count else ""
+            if len(blob) != offsets[-1]:
+                # Not ASCII: the offsets are in bytes, not characters
+                blob = bytes(data[offset:offset + offsets[-1]])
+                column = [ str(blob[start:end], "utf-8") for start, end in zip(offsets, offsets[1:]) ]
+            else:
+                column = [ blob[start:end] for start, end in zip(offsets, offsets[1:]) ]
+
+            return name, column, offset + offsets[-1]
+
+        if kind == SceneFile.__Pickle:
+            nbytes, = struct.unpack_from("<Q", data, offset)
+            return name, pickle.loads(data[offset + 8:offset + 8 + nbytes]), offset + 8 + nbytes
+
+        raise ValueError(f"Unknown column kind: {kind}")
+
+    @staticmethod
+    def Write(path: str, tables: Dict[str, Table], compress: bool=None) -> None:
+        if compress is None: compress = SceneFile.Compress
+
+        out = bytearray(SceneFile.__Header.pack(SceneFile.__Magic, SceneFile.Version, len(tables)))
+
+        for name, table in tables.items():
+            rows = len(next(iter(table.values()))) if table else 0
+
+            chunk = bytearray()
+            for columnName, column in table.items(): SceneFile.__WriteColumn(chunk, columnName, column)
+
+            stored = zlib.compress(chunk, SceneFile.CompressionLevel) if compress else chunk
+
+            SceneFile.__WriteName(out, name)
+            out += SceneFile.__Chunk.pack(rows, len(table), compress, len(stored), len(chunk))
+
+            # Aligned like the columns within the chunk, uncompressed chunks are read in place
+            out += bytes(-len(out) % 8) + stored
+
+        with open(path, "wb") as _file: _file.write(out)
+
+    @staticmethod
+    def Read(path: str) -> Dict[str, Table]:
+        '''The columns are read-only (arrays are views into the file's contents)'''
+        with open(path, "rb") as _file: data = memoryview(_file.read())
+
+        magic, version, count = SceneFile.__Header.unpack_from(data, 0)
+        if magic != SceneFile.__Magic: raise ValueError(f"Not a PI scene file: {path}")
+        if version > SceneFile.Version: raise ValueError(f"Scene file version {version} is newer than supported: {path}")
+
+        tables, offset = {}, SceneFile.__Header.size
+        for _ in range(count):
+            name, offset = SceneFile.__ReadName(data, offset)
+            rows, columns, compressed, stored, size = SceneFile.__Chunk.unpack_from(data, offset)
+
+            offset += SceneFile.__Chunk.size
+            offset += -offset % 8
+
+            chunk = data[offset:offset + stored]
+            if compressed: chunk = memoryview(zlib.decompress(chunk, bufsize=size))
+            offset += stored
+
+            table, chunkOffset = {}, 0
+            for _ in range(columns):
+                columnName, column, chunkOffset = SceneFile.__ReadColumn(chunk, chunkOffset)
+                table[columnName] = column
+
+            tables[name] = table
+
+        return tables
+
+    @staticmethod
+    def FromEntities(entities: List[Dict[str, Any]]) -> Dict[str, Table]:
+        '''The tables of a scene stored in the `.PI` (YAML) layout: a dictionary of components per entity'''
+        rows: Dict[str, Dict[str, list]] = {}
+        add = lambda table, **columns: SceneFile.AddRow(rows, table, **columns)
+
+        for row, entity in enumerate(entities):
+            add("Entity", ID=UUID(str(entity["Entity"])).bytes, Tag=entity["TagComponent"]["Tag"])
+
+            transform = entity["TransformComponent"]
+            add("TransformComponent", Entity=row,
+                Translation=transform["Translation"], Rotation=transform["Rotation"], Scale=transform["Scale"])
+
+            if mesh := entity.get("MeshComponent", False):
+                add("MeshComponent", Entity=row, Path=mesh["Path"], Submesh=mesh.get("Submesh", 0), Asset=mesh.get("Asset", ""))
+
+            if camera := entity.get("CameraComponent", False):
+                add("CameraComponent", Entity=row, ProjectionType=camera["Camera"]["ProjectionType"],
+                    IsPrimary=camera["IsPrimary"], FixedAspectRatio=camera["FixedAspectRatio"])
+
+            if light := entity.get("LightComponent", False):
+                add("LightComponent", Entity=row, LightType=light["LightType"], Intensity=light["Intensity"],
+                    Diffuse=light["Diffuse"], Specular=light["Specular"], Direction=light.get("Direction", ( 0.0, 0.0, 0.0 )),
+                    CutOff=light.get("CutOff", 0.0), OuterCutOff=light.get("OuterCutOff", 0.0))
+
+            if script := entity.get("ScriptComponent", False):
+                add("ScriptComponent", Entity=row, Namespace=script["Namespace"], Variables=script.get("Variables", {}) or {})
+
+            if collidor := entity.get("CollidorComponent", False):
+                add("CollidorComponent", Entity=row, Type=collidor["Type"], Scale=collidor["Scale"], IsTrigger=collidor.get("IsTrigger", False))
+
+            if rigidBody := entity.get("RigidBodyComponent", False):
+                add("RigidBodyComponent", Entity=row, IsStatic=rigidBody["IsStatic"], Mass=rigidBody["Mass"], Layer=rigidBody.get("Layer", 0))
+
+        rows.setdefault("Entity", { "ID": [], "Tag": [] })
+        return { name: SceneFile.Columns(table) for name, table in rows.items() }
+
+    @staticmethod
+    def AddRow(rows: Dict[str, Dict[str, list]], table: str, **columns) -> None:
+        '''Appends a row to the lists of values of `table`, they become columns with `Columns`'''
+        table = rows.setdefault(table, {})
+        for name, value in columns.items(): table.setdefault(name, []).append(value)
+
+    @staticmethod
+    def Columns(table: Dict[str, list]) -> Table:
+        '''Turns the lists of values of a table into its columns'''
+        columns = {}
+        for name, values in table.items():
+            if name == "ID": columns[name] = np.frombuffer(b"".join(values), np.uint8).reshape(len(values), 16)
+            elif name == "Entity": columns[name] = np.array(values, dtype=np.int32)
+            elif values and all(isinstance(value, str) for value in values): columns[name] = values
+            elif values and all(isinstance(value, bool) for value in values): columns[name] = np.array(values, dtype=np.bool_)
+            elif values and all(isinstance(value, int) for value in values): columns[name] = np.array(values, dtype=np.int32)
+            else:
+                try: column = np.array(values, dtype=np.float64)
+                except (TypeError, ValueError): column = None
+
+                columns[name] = column if column is not None else values
+
+        return columns
+
+    @staticmethod
+    def ToEntities(tables: Dict[str, Table]) -> List[Dict[str, Any]]:
+        '''The `.PI` (YAML) layout of the tables, see `FromEntities`'''
+        ids, tags = tables["Entity"]["ID"], tables["Entity"]["Tag"]
+        entities = [ { "Entity": str(UUID(bytes=bytes(ids[row]))), "TagComponent": { "Tag": tags[row] } } for row in range(len(tags)) ]
+
+        def rows(name: str):
+            table = tables.get(name, None)
+            if table is None: return
+            for index, row in enumerate(table["Entity"].tolist()): yield entities[row], table, index
+
+        vector = lambda column, index: pyrr.Vector3(column[index].tolist())
+
+        for entity, table, index in rows("TransformComponent"):
+            entity["TransformComponent"] = {
+                "Translation": vector(table["Translation"], index),
+                "Rotation"   : vector(table["Rotation"]   , index),
+                "Scale"      : vector(table["Scale"]      , index)
+            }
+
+        for entity, table, index in rows("MeshComponent"):
+            entity["MeshComponent"] = { "Path": table["Path"][index], "Submesh": int(table["Submesh"][index]) }
+            if table["Asset"][index]: entity["MeshComponent"]["Asset"] = table["Asset"][index]
+
+        for entity, table, index in rows("CameraComponent"):
+            entity["CameraComponent"] = {
+                "Camera"           : { "ProjectionType": int(table["ProjectionType"][index]) },
+                "IsPrimary"        : bool(table["IsPrimary"][index]),
+                "FixedAspectRatio" : bool(table["FixedAspectRatio"][index])
+            }
+
+        for entity, table, index in rows("LightComponent"):
+            lightType = int(table["LightType"][index])
+            light = {
+                "LightType" : lightType,
+                "Intensity" : float(table["Intensity"][index]),
+                "Diffuse"   : vector(table["Diffuse"] , index),
+                "Specular"  : vector(table["Specular"], index)
+            }
+
+            # Directional, point and spot lights (LightComponent.TypeEnum)
+            if lightType in ( 0, 2 ): light["Direction"] = vector(table["Direction"], index)
+            if lightType == 2:
+                light["CutOff"], light["OuterCutOff"] = float(table["CutOff"][index]), float(table["OuterCutOff"][index])
+
+            entity["LightComponent"] = light
+
+        for entity, table, index in rows("ScriptComponent"):
+            entity["ScriptComponent"] = { "Namespace": table["Namespace"][index], "Variables": table["Variables"][index] }
+
+        for entity, table, index in rows("CollidorComponent"):
+            entity["CollidorComponent"] = { "Type": int(table["Type"][index]), "Scale": vector(table["Scale"], index) }
+            if "IsTrigger" in table: entity["CollidorComponent"]["IsTrigger"] = bool(table["IsTrigger"][index])
+
+        for entity, table, index in rows("RigidBodyComponent"):
+            entity["RigidBodyComponent"] = { "IsStatic": bool(table["IsStatic"][index]), "Mass": float(table["Mass"][index]) }
+            if "Layer" in table: entity["RigidBodyComponent"]["Layer"] = int(table["Layer"][index])
+
+        return entities
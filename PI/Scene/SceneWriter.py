@@ -0,0 +1,65 @@
+from ..Logging.logger import PI_CORE_ERROR
+
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict
+import os
+
+class SceneWriter:
+    '''
+    Writes scene files on a background thread, so that saving (and autosaving) does not stall the editor.
+
+    The scene is snapshotted on the main thread (see `Scene.Snapshot`), `write(path)` only gets the immutable
+    snapshot. It writes a temporary file next to the destination, which then replaces it: a crash or a failed
+    write leaves the previous file intact. Writes are done one at a time, in submission order.
+    '''
+    __slots__ = ()
+
+    __Pool    : ThreadPoolExecutor = None
+    __Pending : Dict[str, Future] = {}
+
+    @staticmethod
+    def Submit(path: str, write: Callable[[str], None], onDone: Callable[[str], None]=None) -> Future:
+        '''Calls `write(temporaryPath)` on the writer thread, and `onDone(path)` (on the same thread) once it replaced `path`'''
+        if SceneWriter.__Pool is None:
+            SceneWriter.__Pool = ThreadPoolExecutor(1, thread_name_prefix="PI-SceneWriter")
+
+        future = SceneWriter.__Pool.submit(SceneWriter.__Write, path, write, onDone)
+        SceneWriter.__Pending[os.path.normcase(os.path.abspath(path))] = future
+        return future
+
+    @staticmethod
+    def __Write(path: str, write: Callable[[str], None], onDone: Callable[[str], None]) -> bool:
+        temporaryPath = f"{path}.tmp"
+
+        try:
+            write(temporaryPath)
+            os.replace(temporaryPath, path)
+        except Exception as e:
+            PI_CORE_ERROR("Failed to save scene: {} ({})", path, e)
+            if os.path.exists(temporaryPath): os.remove(temporaryPath)
+            return False
+
+        if onDone is not None: onDone(path)
+        return True
+
+    @staticmethod
+    def IsWriting(path: str=None) -> bool:
+        '''Whether `path` (or any file, if None) still has a write pending'''
+        SceneWriter.__Pending = { key: future for key, future in SceneWriter.__Pending.items() if not future.done() }
+        if path is None: return len(SceneWriter.__Pending) > 0
+
+        return os.path.normcase(os.path.abspath(path)) in SceneWriter.__Pending
+
+    @staticmethod
+    def Wait() -> None:
+        '''Blocks until every pending write is done, e.g. before a saved scene is opened again'''
+        for future in list(SceneWriter.__Pending.values()): future.result()
+        SceneWriter.__Pending = {}
+
+    @staticmethod
+    def Shutdown() -> None:
+        if SceneWriter.__Pool is None: return
+
+        SceneWriter.__Pool.shutdown(wait=True)
+        SceneWriter.__Pool = None
+        SceneWriter.__Pending = {}
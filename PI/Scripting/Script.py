@@ -1,6 +1,8 @@
 from ..Scene.Entity import Entity
+from ..Physics.PySics import PySics, Collider, RayHit, RayHits
 
-from typing import Type, TypeVar, List
+from typing import Type, TypeVar, List, Any
+import numpy as np
 import pyrr
 
 _C = TypeVar("_C")
@@ -23,6 +25,16 @@ class Color3(pyrr.Vector3):
     @property
     def b(self) -> float: return self.z
 
+class Collision:
+    '''A contact with another entity's body, `Normal` points from the other body towards this one'''
+    __slots__ = "Entity", "Point", "Normal", "Impulse"
+
+    def __init__(self, entity: Entity, point: pyrr.Vector3, normal: pyrr.Vector3, impulse: float) -> None:
+        self.Entity  = entity
+        self.Point   = point
+        self.Normal  = normal
+        self.Impulse = impulse
+
 # Remember Annotations will pass down the class hierarchy
 class Behaviour:
     def __init__(self, entity: Entity) -> None:
@@ -50,6 +62,38 @@ class Behaviour:
 
     def Destroy(self) -> None: self._Entity._Scene.DefferedDestroy(self._Entity)
 
+    # Physics queries, `layers` has a bit per layer to hit. A hit's `Entity` is the entity of the body it hit.
+    def RayCast(self,
+        origin: pyrr.Vector3, direction: pyrr.Vector3, distance: float=1000.0, layers: int=PySics.AllLayers
+    ) -> RayHit:
+        return self._Entity._Scene.RayCast(origin, direction, distance, layers)
+
+    # Many rays at once (e.g. `origins` and `directions` are (N, 3) arrays), see `RayHits`
+    def RayCastBatch(self,
+        origins: np.ndarray, directions: np.ndarray, distance: Any=1000.0, layers: int=PySics.AllLayers
+    ) -> RayHits:
+        return self._Entity._Scene.RayCastBatch(origins, directions, distance, layers)
+
+    def SweepTest(self,
+        collider: Collider, start: pyrr.Vector3, end: pyrr.Vector3,
+        rotation: pyrr.Vector3=pyrr.Vector3([ 0, 0, 0 ]), layers: int=PySics.AllLayers
+    ) -> RayHit:
+        return self._Entity._Scene.SweepTest(collider, start, end, rotation, layers)
+
     def OnAttach(self) -> None: ...
     def OnDetach(self) -> None: ...
     def OnUpdate(self, dt: float) -> None: ...
+
+    # Called before each physics tick. When the physics runs on its own thread (`PySics.Threaded`), every call of a
+    # frame sees the bodies as of the previous frame, otherwise the state of the tick before.
+    def OnFixedUpdate(self, dt: float) -> None: ...
+
+    # Called after the physics update, for contacts of the entity's rigid body (`Collision.Point` and `Normal` are zero on exit)
+    def OnCollisionEnter (self, collision: Collision) -> None: ...
+    def OnCollisionStay  (self, collision: Collision) -> None: ...
+    def OnCollisionExit  (self, collision: Collision) -> None: ...
+
+    # When either body's collider is a trigger, with the other entity
+    def OnTriggerEnter (self, other: Entity) -> None: ...
+    def OnTriggerStay  (self, other: Entity) -> None: ...
+    def OnTriggerExit  (self, other: Entity) -> None: ...
@@ -9,6 +9,8 @@ from ImGuiElements.ThemeEditorTab      import *
 
 from ImGuiElements.UndoManager import *
 
+import os
+
 INSTRUCTION_TEXT: str = \
 """Welcome to Theta: The PI Editor
 Current version: {0}
@@ -48,6 +50,7 @@ class EditorLayer(Layer):
     __EditorCamera: EditorCamera
 
     __Framebuffer: Framebuffer
+    __RenderGraph: RenderGraph
     __ViewportSize: ImVec2
 
     __ViewportBounds : List[ImVec2]
@@ -71,6 +74,9 @@ class EditorLayer(Layer):
 
     __ShowDebugStats: bool
 
+    __SinceAutosave     : float     # Seconds
+    __AutosavedRevision : int       # The editor scene's `Revision` when it was last autosaved
+
     __ShowProjectTab: bool
     __Temp_ProjectName: str
     __Temp_ProjectPath: str
@@ -108,9 +114,13 @@ class EditorLayer(Layer):
         )
         self.__Framebuffer: Framebuffer = Framebuffer.Create(specs)
         self.__Framebuffer.Unbind()
+        self.__RenderGraph = self.__BuildRenderGraph()
 
         self.__Framerate = 60
         self.__ShowDebugStats = False
+
+        self.__SinceAutosave = 0.0
+        self.__AutosavedRevision = self.__EditorScene.Revision
         self.__ShowProjectTab = False
 
         self.__Temp_ProjectName = ""
@@ -151,17 +161,48 @@ class EditorLayer(Layer):
         
         newScene = Scene()
         newScene.OnViewportResize(self.__ActiveScene._ViewportWidth, self.__ActiveScene._ViewportHeight)
+        self.__EditorScene.ReleaseAssets()
         self.__EditorScene = newScene
         self.__ActiveScene = self.__EditorScene
         self.__SceneHierarchyPanel.SetContext(self.__EditorScene)
+        self.__AutosavedRevision = self.__EditorScene.Revision
+        UndoManager.GetInstance().Clear()
+
+    @staticmethod
+    def __AutosavePath(scenePath: str=None) -> str:
+        '''Next to the scene with its extension (`<Name>.autosave.PI`), or `Untitled.autosave.PIB` in the temp directory for a scene that was never saved'''
+        if scenePath is None: return os.path.join(Cache.GetLocalTempDirectory(), "Untitled.autosave.PIB")
+
+        root, extension = os.path.splitext(scenePath)
+        return f"{root}.autosave{extension or '.PI'}"
+
+    def __Autosave(self, timestep: Timestep) -> None:
+        settings = self.__ProjectSettingsTab.Settings
+        if not settings["General.Autosave"] or self.__SceneState != EditorLayer.SceneStateEnum.Edit: return
+
+        self.__SinceAutosave += timestep.FixedTime
+        if self.__SinceAutosave < settings["General.AutosaveInterval"]: return
+        self.__SinceAutosave = 0.0
+
+        # Only the entities changed since the last save are gathered again here, the file is written in the background
+        scene = self.__EditorScene
+        if scene.Revision == self.__AutosavedRevision or SceneWriter.IsWriting(): return
+
+        self.__AutosavedRevision = scene.Revision
+        Scene.SerializeAsync(scene, EditorLayer.__AutosavePath(scene._Filepath))
 
     def __SaveScene(self, dialogbox: bool=False) -> None:
         self.__OnSceneStop()
+
+        # The autosave is not needed anymore once the scene is saved
+        autosavePath = EditorLayer.__AutosavePath(self.__ActiveScene._Filepath)
+        def saved(path: str) -> None:
+            if os.path.exists(autosavePath): os.remove(autosavePath)
         
         if self.__ActiveScene._Filepath != None and not dialogbox:
             fileName = self.__ActiveScene._Filepath
-            if not fileName.lower().endswith(".pi"): fileName += ".PI"
-            Scene.Serialize(self.__ActiveScene, fileName)
+            if not fileName.lower().endswith((".pi", ".pib")): fileName += ".PI"
+            Scene.SerializeAsync(self.__ActiveScene, fileName, saved)
             return
         
         elif self.__ActiveScene._Filepath == None and not dialogbox:
@@ -170,19 +211,36 @@ class EditorLayer(Layer):
             return
 
         if not dialogbox: return
-        cancelled, fileName = UILib.DrawFileSaveDialog( ( ("PI scene file (*.PI)", ".PI"), ) )
+        # Binary scenes are a lot faster to save and open, YAML ones can be diffed (see `Scene.Convert`)
+        cancelled, fileName = UILib.DrawFileSaveDialog( ( ("PI scene file (*.PI)", ".PI"), ("PI binary scene file (*.PIB)", ".PIB") ) )
         if not cancelled:
-            if not fileName.lower().endswith(".pi"): fileName += ".PI"
-            Scene.Serialize(self.__ActiveScene, fileName)
+            if not fileName.lower().endswith((".pi", ".pib")): fileName += ".PI"
+            Scene.SerializeAsync(self.__ActiveScene, fileName, saved)
 
     def __LoadScene(self, filename: str=None) -> None:
         self.__OnSceneStop()
 
         cancelled = False
-        if not filename  : cancelled, filename = UILib.DrawFileLoadDialog( ( ("PI scene file (*.PI)", ".PI"), ) )
-        if not cancelled : self.__EditorScene = Scene.Deserialize(self.__EditorScene, filename)
+        if not filename  : cancelled, filename = UILib.DrawFileLoadDialog(
+            ( ("PI scene file (*.PI)", ".PI"), ("PI binary scene file (*.PIB)", ".PIB") )
+        )
+        if not cancelled:
+            # The scene may still be being written
+            SceneWriter.Wait()
+
+            autosavePath = EditorLayer.__AutosavePath(filename)
+            if os.path.exists(autosavePath) and os.path.getmtime(autosavePath) > os.path.getmtime(filename):
+                PI_CLIENT_WARN("{} has changes that were not saved", autosavePath)
+                DebugConsole.Warn(f"{autosavePath} has changes that were not saved")
+
+            # Loaded first, so that the assets both scenes use are not released in between
+            oldScene, self.__EditorScene = self.__EditorScene, Scene.Deserialize(self.__EditorScene, filename)
+            oldScene.ReleaseAssets()
+            UndoManager.GetInstance().Clear()
+
         self.__ActiveScene = self.__EditorScene
         self.__SceneHierarchyPanel.SetContext(self.__EditorScene)
+        self.__AutosavedRevision = self.__EditorScene.Revision
     
     def __LoadProject(self, filename: str=None) -> None:
         if filename is None:
@@ -196,16 +254,16 @@ class EditorLayer(Layer):
         self.__ProjectSettingsTab.Init()
 
     def __Undo(self) -> None:
-        event = UndoManager.GetInstance().PopUndo()
-        if   type(event) == UndoEvent: return
-        elif type(event) == ComponentDeletionEvent:
-            event.Entity._AddComponentInstance(event.ComponentDeleted)
+        if UndoManager.GetInstance().Undo(): self.__DeselectDestroyed()
 
     def __Redo(self) -> None:
-        event = UndoManager.GetInstance().PopRedo()
-        if   type(event) == UndoEvent: return
-        elif type(event) == ComponentDeletionEvent:
-            event.Entity.RemoveComponent(type(event.ComponentDeleted))
+        if UndoManager.GetInstance().Redo(): self.__DeselectDestroyed()
+
+    def __DeselectDestroyed(self) -> None:
+        '''Undoing a creation (or redoing a deletion) may destroy the selected entity'''
+        selection = self.__SceneHierarchyPanel.SelectedEntity
+        if selection and not self.__ActiveScene._Registry.entity_exists(int(selection)):
+            self.__SceneHierarchyPanel.SetSelectedEntity(None)
 
     def __CheckKeys(self, event: KeyPressedEvent) -> bool:
         control = Input.IsKeyPressed(PI_KEY_LEFT_CONTROL) or Input.IsKeyPressed(PI_KEY_RIGHT_CONTROL)
@@ -265,18 +323,20 @@ class EditorLayer(Layer):
                 
                 if event.KeyCode in [PI_KEY_DELETE, PI_KEY_X]:
                     selectedEntity = self.__SceneHierarchyPanel.SelectedEntity
-                    if selectedEntity: self.__ActiveScene.DestroyEntity(selectedEntity)
+                    if selectedEntity:
+                        UndoManager.GetInstance().PushUndo(EntityDeletionEvent(selectedEntity))
+                        self.__ActiveScene.DestroyEntity(selectedEntity)
                     self.__SceneHierarchyPanel.SetSelectedEntity(None)
                     return True
                 
             else:
                 if event.KeyCode == PI_KEY_D:
                     selection = self.__SceneHierarchyPanel.SelectedEntity
-                    if selection: self.__ActiveScene.DuplicateEntity(selection)
+                    if selection: UndoManager.GetInstance().PushUndo(EntityCreationEvent(self.__ActiveScene.DuplicateEntity(selection)))
                     return True
                 
                 if event.KeyCode == PI_KEY_N:
-                    self.__ActiveScene.CreateEntity("New Entity")
+                    UndoManager.GetInstance().PushUndo(EntityCreationEvent(self.__ActiveScene.CreateEntity("New Entity")))
                     return True
 
         return False
@@ -412,21 +472,38 @@ class EditorLayer(Layer):
                 app: PI_Application = StateManager.GetCurrentApplication()
                 app.ImGuiLayer.BlockEvents(not self.__ViewportFocused and not self.__ViewportHovered)
 
+                # The framebuffer may be larger than the viewport while it is being resized
+                u, v = self.__Framebuffer.ViewportUV
                 imgui.image(
                     self.__Framebuffer.GetColorAttachment(0),
                     self.__ViewportSize.x, self.__ViewportSize.y,
-                    ( 0, 1 ), ( 1, 0 )
+                    ( 0, v ), ( u, 0 )
                 )
 
+                # The scene is usable while its models load, they show up as they finish
+                loaded, total = self.__ActiveScene.LoadingProgress
+                if loaded < total:
+                    imgui.set_cursor_pos_x(viewportMinRegion[0] + 8)
+                    imgui.set_cursor_pos_y(viewportMinRegion[1] + 8)
+                    imgui.progress_bar(loaded / total, ( 200, 0 ), f"Loading models: {loaded}/{total}")
+
                 if imgui.begin_drag_drop_target():
                     data: bytes = imgui.accept_drag_drop_payload("CONTENT_BROWSER_ITEM")
                     if data:
                         data = data.decode('UTF-8')
 
-                        if data.lower().endswith('.pi'): self.__LoadScene(data)  
-                        elif data.lower().endswith('.obj'):
-                            entity = self.__ActiveScene.CreateEntity("New Entity")
-                            entity.AddComponent(MeshComponent, data)
+                        if data.lower().endswith(('.pi', '.pib')): self.__LoadScene(data)
+                        elif data.lower().endswith(('.obj', MeshData.Extension)):
+                            # One entity per submesh, they all share the model's single import
+                            scene = self.__ActiveScene
+                            def addModel(model: Model, path: str=data) -> None:
+                                if scene is not self.__ActiveScene: return
+                                for index, mesh in enumerate(model.Meshes):
+                                    entity = scene.CreateEntity(mesh.Name)
+                                    entity.AddComponent(MeshComponent, path, index)
+                                    UndoManager.GetInstance().PushUndo(EntityCreationEvent(entity))
+
+                            AssetManager.GetInstance().LoadAsync(AssetManager.AssetType.MeshAsset, data).AddCallback(addModel)
                         else: PI_CLIENT_WARN("File: {} is not a Scene/Mesh file", data)
                     imgui.end_drag_drop_target()
 
@@ -458,6 +535,7 @@ class EditorLayer(Layer):
         self.__SceneState = EditorLayer.SceneStateEnum.Edit
         self.__ActiveScene.OnStopRuntime()
 
+        if self.__ActiveScene is not self.__EditorScene: self.__ActiveScene.ReleaseAssets()
         self.__ActiveScene = self.__EditorScene
 
         self.__SceneHierarchyPanel.SetContext(self.__EditorScene)
@@ -552,38 +630,73 @@ class EditorLayer(Layer):
         imgui.pop_style_color(3)
         imgui.pop_style_var(3)
 
+    def __BuildRenderGraph(self) -> RenderGraph:
+        '''
+        The viewport's frame: a single pass draws the scene once into the color and entity ID (for picking)
+        attachments, the shaders write the entity's ID to their second output. They stay owned by the framebuffer.
+        '''
+        graph = RenderGraph()
+        framebuffer, spec = self.__Framebuffer, self.__Framebuffer.Spec
+
+        graph.ImportTexture("Color"   , framebuffer.GetColorAttachment(0), TextureFormat.RGBA8      , spec.Width, spec.Height, spec.Samples)
+        graph.ImportTexture("EntityID", framebuffer.GetColorAttachment(1), TextureFormat.RED_INTEGER, spec.Width, spec.Height, spec.Samples)
+        graph.ImportTexture("Depth"   , framebuffer.GetDepthAttachment() , TextureFormat.DEPTH      , spec.Width, spec.Height, spec.Samples)
+
+        # NOTE: No depth pre-pass, `Scene.Draw` is the only way to draw the scene and it would be paid for twice
+        graph.AddPass("ScenePass", self.__ScenePass) \
+            .Write("Color").Write("EntityID", attachment=1).DepthStencil("Depth")
+
+        graph.SetOutput("Color", "EntityID")
+        graph.Compile(editor=True)
+        return graph
+
+    def __ImportTargets(self, graph: RenderGraph) -> None:
+        '''The framebuffer reallocates its attachments when it is resized, they are imported again every frame'''
+        framebuffer = self.__Framebuffer
+        width, height = framebuffer.Spec.Width, framebuffer.Spec.Height
+
+        graph.SetImportedTexture("Color"   , framebuffer.GetColorAttachment(0), width, height)
+        graph.SetImportedTexture("EntityID", framebuffer.GetColorAttachment(1), width, height)
+        graph.SetImportedTexture("Depth"   , framebuffer.GetDepthAttachment() , width, height)
+
+    def __ScenePass(self, graph: RenderGraph, _pass: RenderGraph.Pass) -> None:
+        RenderCommand.Clear()
+
+        # NOTE: 0 is not a valid ID in esper
+        self.__Framebuffer.ClearAttachment(1, Math.PythonInt32ToBytes(0))
+        self.__ActiveScene.Draw()
+
     def OnUpdate(self, timestep: Timestep) -> None:
         self.__Framerate = 1 / timestep.FixedTime
         self.__LastFrameTime = timestep.FixedTime
 
         if self.__ViewportFocused: self.__EditorCamera.OnUpdate(timestep.FixedTime)
+        self.__Autosave(timestep)
 
+        # The framebuffer's size is in whole pixels, imgui's can be fractional
         spec = self.__Framebuffer.Spec
-        if self.__ViewportSize.x > 0.0 \
-            and self.__ViewportSize.y > 0.0 \
-            and ( spec.Width != self.__ViewportSize[0] or spec.Height != self.__ViewportSize[1] ):
-            
-            self.__Framebuffer.Resize(*self.__ViewportSize)
-            Renderer.OnResize(*self.__ViewportSize)
-            self.__EditorCamera.SetAspectRatio(self.__ViewportSize.x / self.__ViewportSize.y)
-            self.__EditorScene.OnViewportResize(*self.__ViewportSize)
-            self.__ActiveScene.OnViewportResize(*self.__ViewportSize)
-
+        width, height = int(self.__ViewportSize.x), int(self.__ViewportSize.y)
+        if width > 0 and height > 0 and ( spec.Width != width or spec.Height != height ):
+            self.__Framebuffer.Resize(width, height)
+            Renderer.OnResize(width, height)
+            self.__EditorCamera.SetAspectRatio(width / height)
+            self.__EditorScene.OnViewportResize(width, height)
+            self.__ActiveScene.OnViewportResize(width, height)
+
+        # Binding the framebuffer applies a resize once it settled, the passes then render into its attachments
         with self.__Framebuffer:
-            RenderCommand.Clear()
-
-            # Clear the 2nd Attachment to 0
-            # NOTE: 0 is not a valid ID in esper
-            self.__Framebuffer.ClearAttachment(1, Math.PythonInt32ToBytes(0))
-
             if self.__SceneState == EditorLayer.SceneStateEnum.Edit:
                 self.__ActiveScene.OnUpdateEditor(timestep.FixedTime, self.__EditorCamera)
             elif self.__SceneState == EditorLayer.SceneStateEnum.Play:
                 self.__ActiveScene.OnUpdateRuntime(min(timestep.GameDelta, 1/10))   # This is to stop abrupt behaviour in scripts
             elif self.__SceneState == EditorLayer.SceneStateEnum.Pause:
                 self.__ActiveScene.OnUpdateEditor(timestep.Seconds, self.__EditorCamera)
-                
-            self.__ActiveScene.Draw()
+
+            self.__ImportTargets(self.__RenderGraph)
+            self.__RenderGraph.Execute()
+
+            # The passes unbind their targets, the IDs are read back from the framebuffer
+            self.__Framebuffer.Bind()
 
             mx, my = Input.GetMousePos()
             mx -= self.__ViewportBounds[0][0]
@@ -1,5 +1,6 @@
 from PI import *
 
+from collections import OrderedDict
 import pathlib
 import os
 
@@ -12,7 +13,11 @@ class ContentBrowserPanel:
     __DirectoryIcon: Texture2D = None
     __FileIcon: Texture2D = None
 
-    __AdditionalImages: Dict[str, Texture2D]
+    # Thumbnails of the images in the browsed folders, the least recently shown ones are dropped first. The ones
+    # shown in the current frame are kept, even past `MaxThumbnails` (e.g. a folder with more images than that).
+    __AdditionalImages: "OrderedDict[str, Texture2D]"
+    __Shown: Set[str]
+    MaxThumbnails: int = 128
 
     def __init__(self, project: Project) -> None:
         self.__Project = project
@@ -30,7 +35,8 @@ class ContentBrowserPanel:
             self.__DirectoryIcon = Texture2D.Create(".\\Resources\\Icons\\ContentBrowser\\DirectoryIcon.png")
             self.__FileIcon      = Texture2D.Create(".\\Resources\\Icons\\ContentBrowser\\FileIcon.png")
 
-        self.__AdditionalImages = {}
+        self.__AdditionalImages = OrderedDict()
+        self.__Shown = set()
 
     def SetProject(self, project: Project) -> None:
         self.__Project = project
@@ -41,11 +47,21 @@ class ContentBrowserPanel:
     def __GetImage(self, filename) -> Texture2D:
         image = self.__AdditionalImages.get(filename, None)
         if not image:
-            image = Texture2D.Create(filename)
+            image = Texture2D.Create(filename, TextureSpecification(asyncLoad=True))
             self.__AdditionalImages[filename] = image
 
+        self.__AdditionalImages.move_to_end(filename)
+        self.__Shown.add(filename)
         return image
 
+    def __DropThumbnails(self) -> None:
+        '''Drops the least recently shown thumbnails past `MaxThumbnails`, but none of the ones shown this frame'''
+        while len(self.__AdditionalImages) > ContentBrowserPanel.MaxThumbnails:
+            if next(iter(self.__AdditionalImages)) in self.__Shown: break
+            self.__AdditionalImages.popitem(last=False)
+
+        self.__Shown.clear()
+
     def OnImGuiRender(self) -> None:
         imgui.begin("Content Browser")
 
@@ -103,3 +119,5 @@ class ContentBrowserPanel:
 
         imgui.columns(1)
         imgui.end()
+
+        self.__DropThumbnails()
@@ -1,4 +1,4 @@
-from PI import imgui, StateManager, PI_V_SYNC
+from PI import imgui, StateManager, PI_V_SYNC, RenderTargetPool, TextureResidency, UploadQueue, AssetManager
 
 class DebugStatsPanel:
     @staticmethod
@@ -19,7 +19,40 @@ class DebugStatsPanel:
             imgui.separator()
             imgui.text("Draw Calls: {}".format(StateManager.Stats.DrawCalls))
 
+            inUse, idle, size = RenderTargetPool.GetStats()
+            imgui.text("Render Targets: {} in use, {} idle ({:.2f} MB)".format(inUse, idle, size / (1024 * 1024)))
+
+            streamed, resident = TextureResidency.GetStats()
+            imgui.text("Streamed Textures: {} ({:.2f} / {:.0f} MB)".format(
+                streamed, resident / (1024 * 1024), TextureResidency.Budget / (1024 * 1024)
+            ))
+
+            pending, pendingBytes, uploaded = UploadQueue.GetStats()
+            imgui.text("Uploads: {} pending ({:.2f} MB), {:.2f} MB last frame".format(
+                pending, pendingBytes / (1024 * 1024), uploaded / (1024 * 1024)
+            ))
+
             flags = imgui.TREE_NODE_OPEN_ON_ARROW | imgui.TREE_NODE_SPAN_AVAILABLE_WIDTH
+
+            stats = AssetManager.GetStats()
+            cpu, gpu = sum(stat[1] for stat in stats.values()), sum(stat[2] for stat in stats.values())
+            if imgui.tree_node("Assets: {:.2f} / {:.0f} MB CPU, {:.2f} / {:.0f} MB GPU###Assets".format(
+                    cpu / (1024 * 1024), AssetManager.CPUBudget / (1024 * 1024),
+                    gpu / (1024 * 1024), AssetManager.GPUBudget / (1024 * 1024)
+                ), flags=flags):
+                for name, (count, cpu, gpu) in stats.items():
+                    imgui.text("\t{} : {} ({:.2f} MB CPU, {:.2f} MB GPU)".format(
+                        name, count, cpu / (1024 * 1024), gpu / (1024 * 1024)
+                    ))
+
+                imgui.tree_pop()
+
+            if StateManager.Stats.RenderPasses and imgui.tree_node("Render Passes", flags=flags):
+                for name, time in StateManager.Stats.RenderPasses.items():
+                    imgui.text("\t{} : {:.3f} ms".format(name, time))
+
+                imgui.tree_pop()
+
             if imgui.tree_node("Shaders", flags=flags):
                 imgui.text("Binded: {}".format(StateManager.Stats.Shaders.ShadersBinded))
                 imgui.text("Uniforms:")
@@ -3,8 +3,10 @@ from PI import *
 class ProjectSettingsTab:
     class SettingSelection:
         Null, \
-        General, Time, Debugging \
-            = range(4)
+        General, Time, Rendering, Physics, Debugging \
+            = range(6)
+
+    Broadphases: List[str] = [ "Dynamic AABB Tree (DBVT)", "Sweep And Prune (SAP)" ]     # By `PySics.BroadphaseType`
 
     __Show: bool = False
     __CurrentSelection: int = SettingSelection.Null
@@ -16,18 +18,39 @@ class ProjectSettingsTab:
 
     def Init(self) -> None:
         defaultSettings = {
+            "General.Autosave": True,
+            "General.AutosaveInterval": 60,     # Seconds
+
             "Time.Scale": 1,
             "Time.GameScale": 1,
 
+            "Rendering.TextureBudget": 512,     # MB
+            "Rendering.AssetCPUBudget": 512,    # MB
+            "Rendering.AssetGPUBudget": 1024,   # MB
+
+            "Physics.Broadphase": PySics.BroadphaseType.DBVT,
+            "Physics.WorldExtent": 1000.0,
+            "Physics.SolverIterations": 10,
+            "Physics.LinearSleepThreshold": 0.8,    # Units per second
+            "Physics.AngularSleepThreshold": 1.0,   # Radians per second
+            "Physics.DeactivationTime": 2.0,        # Seconds
+
             "Debugging.EnableDebugging": False,
             "Debugging.PythonPath": "",
             "Debugging.Port": 6969,
             "Debugging.WaitOnPlay": True,
         }
 
-        self.__Settings: Dict[str, Any] = ProjectCache.GetProperty("ProjectSettings", defaultSettings)
+        # Projects saved before a setting was added get its default
+        self.__Settings: Dict[str, Any] = { **defaultSettings, **ProjectCache.GetProperty("ProjectSettings", {}) }
         self.__TempSettings = self.__Settings.copy()
 
+        TextureResidency.Budget = self.__Settings["Rendering.TextureBudget"] * 1024 * 1024
+        AssetManager.CPUBudget  = self.__Settings["Rendering.AssetCPUBudget"] * 1024 * 1024
+        AssetManager.GPUBudget  = self.__Settings["Rendering.AssetGPUBudget"] * 1024 * 1024
+
+        ProjectSettingsTab.__ApplyPhysics(self.__Settings)
+
         if self.__Settings["Debugging.EnableDebugging"]:
             self.__StartDebugAdapter()
 
@@ -38,6 +61,17 @@ class ProjectSettingsTab:
     @property
     def Settings(self) -> Dict[str, Any]: return self.__Settings
 
+    @staticmethod
+    def __ApplyPhysics(settings: Dict[str, Any]) -> None:
+        '''The worlds made from now on (i.e. the next time the scene is played) use them'''
+        PySics.Broadphase       = settings["Physics.Broadphase"]
+        PySics.WorldExtent      = settings["Physics.WorldExtent"]
+        PySics.SolverIterations = settings["Physics.SolverIterations"]
+
+        PySics.LinearSleepThreshold  = settings["Physics.LinearSleepThreshold"]
+        PySics.AngularSleepThreshold = settings["Physics.AngularSleepThreshold"]
+        PySics.DeactivationTime      = settings["Physics.DeactivationTime"]
+
     def __StartDebugAdapter(self) -> None:
         pythonPath = self.__TempSettings["Debugging.PythonPath"]
         port = self.__TempSettings["Debugging.Port"]
@@ -70,6 +104,18 @@ class ProjectSettingsTab:
         if imgui.button("Time", 135): self.__CurrentSelection = ProjectSettingsTab.SettingSelection.Time
         imgui.pop_style_color()
 
+        color = bgColor
+        if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Rendering: color = activeColor
+        imgui.push_style_color(imgui.COLOR_BUTTON, *color)
+        if imgui.button("Rendering", 135): self.__CurrentSelection = ProjectSettingsTab.SettingSelection.Rendering
+        imgui.pop_style_color()
+
+        color = bgColor
+        if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Physics: color = activeColor
+        imgui.push_style_color(imgui.COLOR_BUTTON, *color)
+        if imgui.button("Physics", 135): self.__CurrentSelection = ProjectSettingsTab.SettingSelection.Physics
+        imgui.pop_style_color()
+
         color = bgColor
         if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Debugging: color = activeColor
         imgui.push_style_color(imgui.COLOR_BUTTON, *color)
@@ -85,6 +131,18 @@ class ProjectSettingsTab:
             imgui.push_font(ImGuiLayer.GlobalHeadingFont)
             imgui.text("General Settings:")
             imgui.pop_font()
+
+            with imgui.begin_child("##UI", height=imgui.get_window_content_region_max()[1] - 90):
+                changed, autosave = UILib.DrawBoolControls(
+                    "Autosave", self.__TempSettings["General.Autosave"], columnWidth=150
+                )
+                if changed: self.__TempSettings["General.Autosave"] = autosave
+
+                changed, interval = UILib.DrawIntControls(
+                    "Autosave Interval (s)", self.__TempSettings["General.AutosaveInterval"], speed=1,
+                    minValue=5, maxValue=3600, columnWidth=150
+                )
+                if changed: self.__TempSettings["General.AutosaveInterval"] = interval
         
         if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Time:
             imgui.push_font(ImGuiLayer.GlobalHeadingFont)
@@ -104,6 +162,74 @@ class ProjectSettingsTab:
                 )
                 if timeScaleChanged: self.__TempSettings["Time.GameScale"] = newTimeScale
         
+        if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Rendering:
+            imgui.push_font(ImGuiLayer.GlobalHeadingFont)
+            imgui.text("Rendering Settings:")
+            imgui.pop_font()
+
+            with imgui.begin_child("##UI", height=imgui.get_window_content_region_max()[1] - 90):
+                changed, budget = UILib.DrawIntControls(
+                    "Texture Budget (MB)", self.__TempSettings["Rendering.TextureBudget"], speed=1,
+                    minValue=16, maxValue=16384, columnWidth=150
+                )
+                if changed: self.__TempSettings["Rendering.TextureBudget"] = budget
+
+                changed, budget = UILib.DrawIntControls(
+                    "Asset CPU Budget (MB)", self.__TempSettings["Rendering.AssetCPUBudget"], speed=1,
+                    minValue=16, maxValue=65536, columnWidth=150
+                )
+                if changed: self.__TempSettings["Rendering.AssetCPUBudget"] = budget
+
+                changed, budget = UILib.DrawIntControls(
+                    "Asset GPU Budget (MB)", self.__TempSettings["Rendering.AssetGPUBudget"], speed=1,
+                    minValue=16, maxValue=65536, columnWidth=150
+                )
+                if changed: self.__TempSettings["Rendering.AssetGPUBudget"] = budget
+
+        if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Physics:
+            imgui.push_font(ImGuiLayer.GlobalHeadingFont)
+            imgui.text("Physics Settings:")
+            imgui.pop_font()
+
+            with imgui.begin_child("##UI", height=imgui.get_window_content_region_max()[1] - 90):
+                changed, broadphase, _ = UILib.DrawDropdown(
+                    "Broadphase", self.__TempSettings["Physics.Broadphase"], ProjectSettingsTab.Broadphases, columnWidth=150
+                )
+                if changed: self.__TempSettings["Physics.Broadphase"] = broadphase
+
+                if self.__TempSettings["Physics.Broadphase"] == PySics.BroadphaseType.SAP:
+                    changed, extent = UILib.DrawFloatControls(
+                        "World Extent", self.__TempSettings["Physics.WorldExtent"], speed=1, minValue=10, maxValue=100000,
+                        columnWidth=150, tooltip="Nothing further than this from the origin collides"
+                    )
+                    if changed: self.__TempSettings["Physics.WorldExtent"] = extent
+
+                changed, iterations = UILib.DrawIntControls(
+                    "Solver Iterations", self.__TempSettings["Physics.SolverIterations"], speed=0.25,
+                    minValue=1, maxValue=100, columnWidth=150
+                )
+                if changed: self.__TempSettings["Physics.SolverIterations"] = iterations
+
+                imgui.separator()
+                changed, threshold = UILib.DrawFloatControls(
+                    "Linear Sleep Speed", self.__TempSettings["Physics.LinearSleepThreshold"], speed=0.01,
+                    minValue=0, maxValue=100, columnWidth=150, tooltip="Units per second"
+                )
+                if changed: self.__TempSettings["Physics.LinearSleepThreshold"] = threshold
+
+                changed, threshold = UILib.DrawFloatControls(
+                    "Angular Sleep Speed", self.__TempSettings["Physics.AngularSleepThreshold"], speed=0.01,
+                    minValue=0, maxValue=100, columnWidth=150, tooltip="Radians per second"
+                )
+                if changed: self.__TempSettings["Physics.AngularSleepThreshold"] = threshold
+
+                changed, seconds = UILib.DrawFloatControls(
+                    "Time To Sleep (s)", self.__TempSettings["Physics.DeactivationTime"], speed=0.01,
+                    minValue=0, maxValue=60, columnWidth=150,
+                    tooltip="How long a body has to be slower than both speeds before it sleeps"
+                )
+                if changed: self.__TempSettings["Physics.DeactivationTime"] = seconds
+
         if self.__CurrentSelection == ProjectSettingsTab.SettingSelection.Debugging:
             imgui.push_font(ImGuiLayer.GlobalHeadingFont)
             imgui.text("Debugging Settings:")
@@ -153,6 +279,14 @@ class ProjectSettingsTab:
             if self.__TempSettings["Time.GameScale"] != self.__Settings["Time.GameScale"]:
                 Timestep.GameScale = self.__TempSettings["Time.GameScale"]
 
+            # Rendering Settings
+            TextureResidency.Budget = self.__TempSettings["Rendering.TextureBudget"] * 1024 * 1024
+            AssetManager.CPUBudget  = self.__TempSettings["Rendering.AssetCPUBudget"] * 1024 * 1024
+            AssetManager.GPUBudget  = self.__TempSettings["Rendering.AssetGPUBudget"] * 1024 * 1024
+
+            # Physics Settings
+            ProjectSettingsTab.__ApplyPhysics(self.__TempSettings)
+
             # Debugger Settings
             if self.__TempSettings["Debugging.EnableDebugging"] != self.__Settings["Debugging.EnableDebugging"]:
                 if not ScriptingEngine.Debugger.Running:
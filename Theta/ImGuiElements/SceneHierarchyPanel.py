@@ -9,27 +9,43 @@ class SceneHierarchyPanel:
     __SelectionContext : Entity
     __CopiedTransform  : TransformComponent
     __CopiedComponent  : CTV
+    __ToDuplicate      : Entity
 
     def __init__(self, project: Project) -> None:
         self.__Context = Scene()
         self.__SelectionContext = None
         self.__CopiedTransform: TransformComponent = None
         self.__CopiedComponent: CTV = None
+        self.__ToDuplicate: Entity = None
 
     def OnImGuiRender(self) -> None:
         with imgui.begin("Scene Heirarchy"):
             for entity in self.__Context._Registry._entities.keys():
                 self.__DrawEntityNode(Entity(entity, self.__Context))
 
+            # Not while the entities are iterated over
+            if self.__ToDuplicate is not None:
+                UndoManager.GetInstance().PushUndo(EntityCreationEvent(self.__Context.DuplicateEntity(self.__ToDuplicate)))
+                self.__ToDuplicate = None
+
             if imgui.is_mouse_down(0) and imgui.is_window_hovered(): self.__SelectionContext = None
 
             if imgui.begin_popup_context_window(popup_flags=imgui.POPUP_NO_OPEN_OVER_ITEMS|imgui.POPUP_MOUSE_BUTTON_RIGHT):
-                if imgui.menu_item("Create Empty Entity")[0]: self.__Context.CreateEntity("Empty Entity")
+                if imgui.menu_item("Create Empty Entity")[0]:
+                    UndoManager.GetInstance().PushUndo(EntityCreationEvent(self.__Context.CreateEntity("Empty Entity")))
                 imgui.end_popup()
 
         with imgui.begin("Properties"):
             if self.__SelectionContext is not None:
-                self.__DrawComponents(self.__SelectionContext)
+                entity = self.__SelectionContext
+                components = { type(component): component for component in entity.AllComponents }
+
+                edits = UILib.Edits
+                self.__DrawComponents(entity)
+
+                # Only an edited entity is gathered again by the next save (adding or removing components marks it too)
+                if UILib.Edits != edits: self.__Context.MarkDirty(entity)
+
                 if self.__CopiedComponent and \
                     imgui.begin_popup_context_window( popup_flags=imgui.POPUP_NO_OPEN_OVER_ITEMS|imgui.POPUP_MOUSE_BUTTON_RIGHT):
                     if imgui.menu_item("Paste Component")[0]:
@@ -40,6 +56,14 @@ class SceneHierarchyPanel:
                         self.__CopiedComponent = None
                     imgui.end_popup()
 
+                # Components added, removed or replaced by anything above (e.g. changing a mesh's model) are undone as one
+                current = { type(component): component for component in entity.AllComponents }
+                event = ComponentChangeEvent(entity,
+                    added   = [ component for componentType, component in current.items()    if components.get(componentType) is not component ],
+                    removed = [ component for componentType, component in components.items() if current.get(componentType)    is not component ]
+                )
+                if not event.IsEmpty: UndoManager.GetInstance().PushUndo(event)
+
     def __DrawEntityNode(self, entity: Entity) -> None:
         tag = entity.GetComponent(TagComponent)
 
@@ -53,8 +77,9 @@ class SceneHierarchyPanel:
         if imgui.is_item_clicked(): self.__SelectionContext = entity
         
         if imgui.begin_popup_context_item():
-            if imgui.menu_item("Duplicate Entity") [0]: self.__Context.DefferedDuplicateEntity(entity)
+            if imgui.menu_item("Duplicate Entity") [0]: self.__ToDuplicate = entity
             if imgui.menu_item("Delete Entity")    [0]:
+                UndoManager.GetInstance().PushUndo(EntityDeletionEvent(entity))
                 self.__Context.DefferedDestroy(entity)
                 if self.__SelectionContext == entity: self.__SelectionContext = None
             imgui.end_popup()
@@ -85,11 +110,18 @@ class SceneHierarchyPanel:
                 if componentType is TransformComponent:
                     if imgui.menu_item("Copy Transform")[0]: self.__CopiedTransform = entity.GetComponent(TransformComponent)
                     if self.__CopiedTransform and imgui.menu_item("Paste Transform")[0]:
-                        transfrom = entity.GetComponent(TransformComponent).Copy(entity)
-                        transfrom.SetTranslation ( self.__CopiedTransform.Translation )
-                        transfrom.SetRotation    ( self.__CopiedTransform.Rotation    )
-                        transfrom.SetScale       ( self.__CopiedTransform.Scale       )
+                        transfrom = entity.GetComponent(TransformComponent)
+                        old = SceneHierarchyPanel.__TransformFields(transfrom)
+
+                        transfrom.SetTranslation ( self.__CopiedTransform.Translation .copy() )
+                        transfrom.SetRotation    ( self.__CopiedTransform.Rotation    .copy() )
+                        transfrom.SetScale       ( self.__CopiedTransform.Scale       .copy() )
                         self.__CopiedTransform = None
+
+                        UndoManager.GetInstance().PushUndo(FieldEditEvent(
+                            entity, TransformComponent, old, SceneHierarchyPanel.__TransformFields(transfrom)
+                        ))
+                        self.__Context.MarkDirty(entity)
                     
                 else:
                     if imgui.menu_item("Copy Component")[0]: self.__CopiedComponent = entity.GetComponent(componentType)
@@ -105,16 +137,23 @@ class SceneHierarchyPanel:
                 UIfunction(entity, component)
                 imgui.tree_pop()
 
-            if removeComponent:
-                UndoManager.GetInstance().PushUndo(ComponentDeletionEvent(entity.GetComponent(componentType), entity))
-                entity.RemoveComponent(componentType)
+            if removeComponent: entity.RemoveComponent(componentType)
 
     # ---------------------- Component UI Functions ----------------------
     @staticmethod
+    def __TransformFields(component: TransformComponent) -> Dict[str, pyrr.Vector3]:
+        return { "Translation": component.Translation.copy(), "Rotation": component.Rotation.copy(), "Scale": component.Scale.copy() }
+    @staticmethod
     def __TransformUIFunction(entity: Entity, component: TransformComponent) -> None:
+        old = SceneHierarchyPanel.__TransformFields(component)
+
         component.SetTranslation ( UILib.DrawVector3Controls( "Translation" , component.Translation      ) [1] )
         component.SetRotation    ( UILib.DrawVector3Controls( "Rotation"    , component.Rotation, 0, 0.5 ) [1] )
         component.SetScale       ( UILib.DrawVector3Controls( "Scale"       , component.Scale, 1         ) [1] )
+
+        # Dragging a value pushes an edit every frame, they are merged into one
+        event = FieldEditEvent(entity, TransformComponent, old, SceneHierarchyPanel.__TransformFields(component))
+        if not event.IsEmpty: UndoManager.GetInstance().PushUndo(event)
     @staticmethod
     def __MeshUIFunction(entity: Entity, component: MeshComponent) -> None:
         path = AssetManager.GetInstance().GetRelativePath(component.Path)
@@ -134,7 +173,7 @@ class SceneHierarchyPanel:
                 else: component.Path = ""
                 return
 
-            if not component.Path.endswith((".obj",)):
+            if not component.Path.endswith((".obj", MeshData.Extension)):
                 if hasattr(component, "MeshObject"): component.Path = component.MeshObject.Path
                 else: component.Path = ""
                 return
@@ -142,8 +181,27 @@ class SceneHierarchyPanel:
             entity.RemoveComponent(MeshComponent)
             if entity.HasComponent(MaterialComponent): entity.RemoveComponent(MaterialComponent)
             entity.AddComponent(MeshComponent, component.Path).Init()
+            return
+
+        if not component.Initialized or component.AssetUUID is None: return
+
+        model: Model = AssetManager.GetInstance().Get(component.AssetUUID)
+        if model is None or model.SubmeshCount < 2: return
+
+        changed, submesh = UILib.DrawIntControls("Submesh", component.Submesh, speed=0.1,
+            minValue=0, maxValue=model.SubmeshCount - 1)
+
+        if changed and submesh != component.Submesh and 0 <= submesh < model.SubmeshCount:
+            path = component.Path
+            entity.RemoveComponent(MeshComponent)
+            if entity.HasComponent(MaterialComponent): entity.RemoveComponent(MaterialComponent)
+            entity.AddComponent(MeshComponent, path, submesh).Init()
     @staticmethod
     def __MaterialUIFunction(entity: Entity, component: MaterialComponent) -> None:
+        if not component.Initialized:
+            imgui.text("Loading...")
+            return
+
         changed, component.Textured = UILib.DrawBoolControls("Textured", component.Textured)
 
         changed, color = UILib.DrawColor4Controls("Diffuse", component.MaterialObject.Diffuse)
@@ -294,19 +352,37 @@ class SceneHierarchyPanel:
                 camera.RecalculateProjection()
     @staticmethod
     def __CollidorUIFunction(entity: Entity, component: CollidorComponent) -> None:
-        shapes = ["Box", "Plane"]
+        shapes = ["Box", "Plane", "Sphere", "Capsule", "Convex Hull", "Triangle Mesh"]
         changed, index, new = UILib.DrawDropdown("Shape", component.Type, shapes)
         if changed:
+            # Mesh shapes are made of the entity's mesh
+            mesh = entity.GetComponent(MeshComponent) if entity.HasComponent(MeshComponent) else None
             entity.RemoveComponent(CollidorComponent)
-            entity.AddComponent(CollidorComponent, index)
+            entity.AddComponent(CollidorComponent, index, mesh=mesh)
+            return
 
-        if index == CollidorComponent.Shapes.Box:
+        collidor = component.Collidor
+        if index in ( CollidorComponent.Shapes.Box, CollidorComponent.Shapes.ConvexHull, CollidorComponent.Shapes.TriangleMesh ):
             changed, new = UILib.DrawVector3Controls(
-                "Scale", component.Collidor.Scale,
+                "Scale", collidor.Scale,
                 resetValue=1, columnWidth=50
             )
 
-            if changed: component.Collidor.SetScale(new)
+            if changed: collidor.SetScale(new)
+
+        elif index == CollidorComponent.Shapes.Sphere:
+            changed, new = UILib.DrawFloatControls("Radius", collidor.Radius, minValue=0.01, maxValue=1000, columnWidth=50)
+            if changed: collidor.SetScale(pyrr.Vector3([ new, new, new ]))
+
+        elif index == CollidorComponent.Shapes.Capsule:
+            changed, new = UILib.DrawFloatControls("Radius", collidor.Radius, minValue=0.01, maxValue=1000, columnWidth=50)
+            if changed: collidor.SetScale(pyrr.Vector3([ new, collidor.Height, new ]))
+
+            changed, new = UILib.DrawFloatControls("Height", collidor.Height, minValue=0.0, maxValue=1000, columnWidth=50)
+            if changed: collidor.SetScale(pyrr.Vector3([ collidor.Radius, new, collidor.Radius ]))
+
+        changed, new = UILib.DrawBoolControls("Trigger", collidor.IsTrigger, columnWidth=50)
+        if changed: collidor.IsTrigger = new
     @staticmethod
     def __RigidBodyUIFunction(entity: Entity, component: RigidBodyComponent) -> None:
         changed, new = UILib.DrawBoolControls("Static", component.RigidBody.IsStatic, columnWidth=50)
@@ -316,12 +392,17 @@ class SceneHierarchyPanel:
 
         if not component.RigidBody.IsStatic:
             _, component.RigidBody.Mass = UILib.DrawFloatControls("Mass", component.RigidBody.Mass, columnWidth=50)
+
+        _, component.RigidBody.Layer = UILib.DrawIntControls("Layer", component.RigidBody.Layer, minValue=0, maxValue=31, columnWidth=50)
     # ----------------------------------------------------------------------
 
     def __DrawComponents(self, entity: Entity) -> None:
         if entity.HasComponent(TagComponent):
             tag = entity.GetComponent(TagComponent).Tag
             changed, entity.GetComponent(TagComponent).Tag = imgui.input_text("##Tag", tag, 256)
+            if changed:
+                UndoManager.GetInstance().PushUndo(FieldEditEvent(entity, TagComponent, { "Tag": tag }, { "Tag": entity.GetComponent(TagComponent).Tag }))
+                self.__Context.MarkDirty(entity)
 
         imgui.same_line()
         imgui.push_item_width(-1)
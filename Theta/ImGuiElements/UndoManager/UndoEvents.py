@@ -1,10 +1,216 @@
 from PI import *
 
-class UndoEvent: ...
-
-class ComponentDeletionEvent(UndoEvent):
-    ComponentDeleted: CTV
-    Entity: Entity
-    def __init__(self, component: CTV, entity: Entity) -> None:
-        self.ComponentDeleted = component
-        self.Entity = entity
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+import numpy as np
+import weakref
+import time
+import sys
+
+def _SizeOf(value: Any) -> int:
+    '''Rough size of a value in bytes, only follows the containers events store their values in'''
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)): size += sum(_SizeOf(item) for item in value)
+    elif isinstance(value, dict): size += sum(_SizeOf(key) + _SizeOf(item) for key, item in value.items())
+    return size
+
+def _ComponentSize(component: CTV) -> int:
+    '''Rough size of what keeping `component` costs: its fields, and the mesh it holds if any'''
+    size = sys.getsizeof(component) + sum(_SizeOf(value) for value in getattr(component, "__dict__", {}).values())
+
+    mesh = getattr(component, "MeshObject", None)
+    if mesh is not None: size += mesh.GPUBytes
+    return size
+
+def _Keep(component: CTV) -> CTV:
+    '''
+    What an event keeps of a component that is not on its entity. Mesh and material components of a model are loaded
+    again from their path when they are added back, a copy of them does not keep the (released) model alive.
+    '''
+    if isinstance(component, (MeshComponent, MaterialComponent)) and component.Path != ".": return component.Copy(None)
+    return component
+
+def _Freeze(value: Any) -> Any:
+    '''Vectors are stored as tuples of floats, they are a fraction of the size of a numpy array'''
+    if isinstance(value, np.ndarray): return tuple(float(item) for item in value.flat)
+    return value
+
+def _Thaw(value: Any, current: Any) -> Any:
+    if isinstance(current, np.ndarray): return type(current)(list(value))
+    return value
+
+class UndoEvent:
+    '''An edit of the editor's scene, that can be undone and redone'''
+    Overhead: int = 64      # Bytes counted for every event, besides what it stores
+
+    def Undo(self) -> None: ...
+    def Redo(self) -> None: ...
+
+    @property
+    def Size(self) -> int: return UndoEvent.Overhead
+
+    def Merge(self, event) -> bool:
+        '''Folds the (newer) `event` into this one, if they can be undone as one. Returns whether it was merged.'''
+        return False
+
+class _EntityEvent(UndoEvent):
+    '''
+    Entities are found again by their UUID: undoing a deletion creates the entity again with a different handle,
+    the events recorded before it still apply to the new one.
+    '''
+    def __init__(self, entity: Entity) -> None:
+        self._Scene = weakref.ref(entity._Scene)
+        self._UUID: UUID = entity.GetComponent(IDComponent).ID
+
+    @property
+    def Target(self) -> Entity:
+        '''None once the entity (or its scene) is gone'''
+        scene: Scene = self._Scene()
+        return scene.GetEntityByUUID(self._UUID) if scene is not None else None
+
+    @staticmethod
+    def _Reattach(entity: Entity, components: List[CTV]) -> None:
+        '''Adds removed components back, mesh and material components gave up their asset when they were removed'''
+        # The material goes first, otherwise the mesh component adds a new one
+        for component in sorted(components, key=lambda component: not isinstance(component, MaterialComponent)):
+            if entity.HasComponent(type(component)): continue
+
+            if isinstance(component, (MeshComponent, MaterialComponent)) and component.Path != ".": component.Initialized = False
+            if isinstance(component, ScriptComponent):
+                component.Entity = entity
+                component.Reload()
+
+            entity._AddComponentInstance(component)
+
+class FieldEditEvent(_EntityEvent):
+    '''Fields of a component changed, only the ones that did are stored (e.g. `{ "Translation": (old, new) }`)'''
+    MergeWindow: float = 0.5        # Seconds, edits closer than this (e.g. dragging a value) are undone as one
+
+    __ComponentType : type
+    __Changes       : Dict[str, Tuple[Any, Any]]
+    __Time          : float
+
+    def __init__(self, entity: Entity, componentType: type, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        super().__init__(entity)
+        self.__ComponentType = componentType
+        self.__Time = time.perf_counter()
+
+        self.__Changes = {}
+        for field, value in new.items():
+            before, after = _Freeze(old[field]), _Freeze(value)
+            if before != after: self.__Changes[field] = (before, after)
+
+    @property
+    def IsEmpty(self) -> bool: return len(self.__Changes) == 0
+
+    @property
+    def Size(self) -> int: return UndoEvent.Overhead + _SizeOf(self.__Changes)
+
+    def __Apply(self, index: int) -> None:
+        entity = self.Target
+        if entity is None or not entity.HasComponent(self.__ComponentType): return
+
+        component = entity.GetComponent(self.__ComponentType)
+        for field, values in self.__Changes.items():
+            value = _Thaw(values[index], getattr(component, field))
+
+            # Components with a setter (e.g. `TransformComponent.SetTranslation`) update what depends on the field
+            setter = getattr(component, f"Set{field}", None)
+            if setter is not None: setter(value)
+            else: setattr(component, field, value)
+
+        entity._Scene.MarkDirty(entity)
+
+    def Undo(self) -> None: self.__Apply(0)
+    def Redo(self) -> None: self.__Apply(1)
+
+    def Merge(self, event) -> bool:
+        if (not isinstance(event, FieldEditEvent) or event._UUID != self._UUID or event._Scene() is not self._Scene()
+            or event.__ComponentType is not self.__ComponentType or event.__Changes.keys() != self.__Changes.keys()
+            or event.__Time - self.__Time > FieldEditEvent.MergeWindow): return False
+
+        self.__Changes = { field: (before, event.__Changes[field][1]) for field, (before, _) in self.__Changes.items() }
+        self.__Time = event.__Time
+        return True
+
+class ComponentChangeEvent(_EntityEvent):
+    '''Components were added to or removed from an entity, or replaced (e.g. a mesh component by one of another model)'''
+    __Added   : List[CTV]
+    __Removed : List[CTV]
+
+    def __init__(self, entity: Entity, added: List[CTV], removed: List[CTV]) -> None:
+        super().__init__(entity)
+        self.__Added, self.__Removed = list(added), [ _Keep(component) for component in removed ]
+
+    @property
+    def IsEmpty(self) -> bool: return len(self.__Added) == 0 and len(self.__Removed) == 0
+
+    @property
+    def Size(self) -> int:
+        return UndoEvent.Overhead + sum(_ComponentSize(component) for component in self.__Added + self.__Removed)
+
+    def __Swap(self, remove: List[CTV], add: List[CTV]) -> List[CTV]:
+        '''Returns what is kept of the removed components'''
+        entity = self.Target
+        if entity is None: return remove
+
+        for component in remove:
+            if entity.HasComponent(type(component)): entity.RemoveComponent(type(component))
+        _EntityEvent._Reattach(entity, add)
+
+        return [ _Keep(component) for component in remove ]
+
+    def Undo(self) -> None: self.__Added = self.__Swap(self.__Added, self.__Removed)
+    def Redo(self) -> None: self.__Removed = self.__Swap(self.__Removed, self.__Added)
+
+class EntityCreationEvent(_EntityEvent):
+    '''An entity was created. Undoing it keeps what is needed to create it again: its tag, transform and components.'''
+    __State: Tuple[str, Dict[str, Any], List[CTV]]
+
+    def __init__(self, entity: Entity) -> None:
+        super().__init__(entity)
+        self.__State = None
+
+    @property
+    def Size(self) -> int:
+        if self.__State is None: return UndoEvent.Overhead
+        tag, transform, components = self.__State
+        return UndoEvent.Overhead + _SizeOf(tag) + _SizeOf(transform) + sum(_ComponentSize(component) for component in components)
+
+    def _Capture(self, entity: Entity) -> None:
+        transform = entity.GetComponent(TransformComponent)
+        self.__State = (
+            entity.GetComponent(TagComponent).Tag,
+            { field: _Freeze(getattr(transform, field)) for field in ( "Translation", "Rotation", "Scale" ) },
+            [ _Keep(component) for component in entity.AllComponents if not isinstance(component, (IDComponent, TagComponent, TransformComponent)) ]
+        )
+
+    def Undo(self) -> None:
+        entity = self.Target
+        if entity is None: return
+
+        self._Capture(entity)
+        entity._Scene.DestroyEntity(entity)
+
+    def Redo(self) -> None:
+        scene: Scene = self._Scene()
+        if scene is None or self.__State is None or self.Target is not None: return
+
+        tag, transform, components = self.__State
+        entity = scene.CreateEntityWithUUID(self._UUID, tag)
+
+        tc = entity.GetComponent(TransformComponent)
+        tc.SetTranslation ( pyrr.Vector3(list(transform["Translation"])) )
+        tc.SetRotation    ( pyrr.Vector3(list(transform["Rotation"   ])) )
+        tc.SetScale       ( pyrr.Vector3(list(transform["Scale"      ])) )
+
+        _EntityEvent._Reattach(entity, components)
+
+class EntityDeletionEvent(EntityCreationEvent):
+    '''Has to be pushed before the entity is destroyed'''
+    def __init__(self, entity: Entity) -> None:
+        super().__init__(entity)
+        self._Capture(entity)
+
+    def Undo(self) -> None: super().Redo()
+    def Redo(self) -> None: super().Undo()
@@ -1,33 +1,90 @@
-from .FixedQueue import *
 from .UndoEvents import *
 
+from collections import deque
+
 class UndoManager:
+    '''
+    Journal of the editor's edits. The events only keep what changed (e.g. the old and new values of the edited fields),
+    so the history is bounded by its size in bytes rather than by a number of events: the oldest events are dropped
+    once it grows past `Budget`.
+    '''
     _Instance=None
 
-    __UndoEvents: FixedQueue
-    __RedoEvents: FixedQueue
+    Budget: int = 4 * 1024 * 1024       # Bytes
+
+    __UndoEvents : deque
+    __RedoEvents : deque
+    __Bytes      : int
+    __CanMerge   : bool
 
     def __init__(self) -> None:
         UndoManager._Instance = self
 
-        self.__UndoEvents = FixedQueue(15, UndoEvent())
-        self.__RedoEvents = FixedQueue(15, UndoEvent())
+        self.__UndoEvents = deque()
+        self.__RedoEvents = deque()
+        self.__Bytes = 0
+        self.__CanMerge = False
 
     @staticmethod
     def GetInstance(): return UndoManager._Instance
 
+    @property
+    def Bytes(self) -> int: return self.__Bytes
+    @property
+    def UndoCount(self) -> int: return len(self.__UndoEvents)
+    @property
+    def RedoCount(self) -> int: return len(self.__RedoEvents)
+
     def PushUndo(self, event: UndoEvent) -> None:
-        self.__UndoEvents.Push(event)
-        self.__RedoEvents.Clear()
-
-    def PopUndo(self) -> UndoEvent:
-        event = self.__UndoEvents.Pop()
-        self.__UndoEvents.PushLeft(UndoEvent())
-        self.__RedoEvents.Push(event)
-        return event
-    
-    def PopRedo(self) -> UndoEvent:
-        event = self.__RedoEvents.Pop()
-        self.__RedoEvents.PushLeft(UndoEvent())
-        self.__UndoEvents.Push(event)
-        return event
+        for redoEvent in self.__RedoEvents: self.__Bytes -= redoEvent.Size
+        self.__RedoEvents.clear()
+
+        # e.g. every frame of a drag becomes part of a single edit
+        if self.__CanMerge and self.__UndoEvents:
+            last = self.__UndoEvents[-1]
+            size = last.Size
+
+            if last.Merge(event):
+                self.__Bytes += last.Size - size
+                return
+
+        self.__UndoEvents.append(event)
+        self.__Bytes += event.Size
+        self.__CanMerge = True
+
+        while self.__Bytes > UndoManager.Budget and len(self.__UndoEvents) > 1:
+            self.__Bytes -= self.__UndoEvents.popleft().Size
+
+    def Undo(self) -> bool:
+        '''Returns False if there is nothing to undo'''
+        if not self.__UndoEvents: return False
+
+        event = self.__UndoEvents.pop()
+        self.__Bytes -= event.Size
+        event.Undo()
+
+        # Undoing may change what the event keeps (e.g. a deleted entity's components)
+        self.__RedoEvents.append(event)
+        self.__Bytes += event.Size
+        self.__CanMerge = False
+        return True
+
+    def Redo(self) -> bool:
+        '''Returns False if there is nothing to redo'''
+        if not self.__RedoEvents: return False
+
+        event = self.__RedoEvents.pop()
+        self.__Bytes -= event.Size
+        event.Redo()
+
+        self.__UndoEvents.append(event)
+        self.__Bytes += event.Size
+        self.__CanMerge = False
+        return True
+
+    def Clear(self) -> None:
+        '''The events refer to the scene they were recorded in, they are cleared when another scene is opened'''
+        self.__UndoEvents.clear()
+        self.__RedoEvents.clear()
+        self.__Bytes = 0
+        self.__CanMerge = False